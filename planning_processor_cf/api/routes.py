@@ -2,8 +2,9 @@
 import logging
 import uuid
 from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from models.api_models import ChatRequest, ChatResponse, HealthResponse
+from models.api_models import ChatRequest, ChatResponse, HealthResponse, JobStatusResponse
 from core.agent import SupplyChainAgent
 from .dependencies import get_agent
 
@@ -38,10 +39,31 @@ async def health_check(agent: SupplyChainAgent = Depends(get_agent)):
     return HealthResponse(
         status="healthy",
         timestamp=datetime.now().isoformat(),
-        sessions_active=agent.session_manager.get_active_session_count()
+        sessions_active=agent.session_manager.get_active_session_count(),
+        odoo_cache=agent.odoo_service.cache_stats()
     )
 
 
+@router.get("/jobs", response_model=List[JobStatusResponse])
+async def list_jobs(session_id: Optional[str] = None, limit: int = 20, agent: SupplyChainAgent = Depends(get_agent)):
+    return [JobStatusResponse(**job) for job in agent.job_queue.list_jobs(session_id=session_id, limit=limit)]
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, include_results: bool = False, agent: SupplyChainAgent = Depends(get_agent)):
+    job = agent.job_queue.get(job_id, include_results=include_results)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatusResponse(**job)
+
+
+@router.post("/jobs/{job_id}/retry", response_model=JobStatusResponse)
+async def retry_job(job_id: str, agent: SupplyChainAgent = Depends(get_agent)):
+    if not agent.job_queue.retry(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} not found or still in progress")
+    return JobStatusResponse(**agent.job_queue.get(job_id))
+
+
 @router.post("/sessions/{session_id}/cleanup")
 async def cleanup_session(session_id: str, agent: SupplyChainAgent = Depends(get_agent)):
     try:
@@ -13,11 +13,28 @@ class Settings(BaseSettings):
     odoo_db: str
     odoo_username: str
     odoo_password: str
+    odoo_pool_size: int = 8  # keep-alive XML-RPC connections shared by all sessions
+    odoo_timeout: float = 30.0  # seconds per RPC, also the wait for a free pooled connection
+    odoo_health_check_interval: float = 60.0  # idle seconds after which a connection is pinged before reuse
+    odoo_batch_size: int = 100  # records per multi-record create/confirm call
+    odoo_page_size: int = 500  # records per paginated search_read
+    odoo_query_max_records: int = 1000  # cap on orders returned by an Odoo order query, 0 = no cap
+    odoo_reference_cache_size: int = 50000  # cached product/partner/BOM/UoM id lookups
+    odoo_reference_cache_ttl: float = 900.0  # seconds, 0 disables the cache
+    odoo_reference_negative_ttl: float = 60.0  # seconds a "not found" lookup is remembered
+    odoo_reference_cache_warmup: bool = False  # preload product codes and partner names at startup
+    odoo_order_cache_size: int = 5000  # cached planned_order_id -> Odoo order lookups
+    odoo_order_cache_ttl: float = 30.0  # seconds, 0 disables the order cache
+    odoo_order_cache_scope: str = "shared"  # "shared" across the sessions of one process or per "session"
+    odoo_order_cache_multiprocess_ttl: float = 5.0  # order cache TTL cap when web_concurrency > 1
+    plan_execution_concurrency: int = 4  # plan batches sent to Odoo in parallel
+    plan_execution_timeout: float = 30.0  # seconds allowed per action; a batch of n actions times out after n times this, 0 = no limit
 
     # Application Settings
     debug: bool = False
     log_level: str = "INFO"
     session_timeout: int = 3600  # 1 hour
+    web_concurrency: int = 1  # API worker processes (WEB_CONCURRENCY); in-memory caches are per process
 
     # MongoDB Settings  ✅ add these two
     mongodb_uri: str
@@ -29,6 +46,21 @@ class Settings(BaseSettings):
     data_dir: str = os.path.join(project_root, "data")
     orders_file: str = "planned_orders.csv"
     suppliers_file: str = "suppliers.csv"
+    # "columnar" keeps a memory-mapped snapshot next to the CSV; "csv" re-parses the CSV on every load
+    # and keeps due date changes in memory only (export_csv is the only writer of the CSV)
+    orders_store_backend: str = "columnar"
+    orders_snapshot_dir: str = os.path.join(data_dir, "planned_orders_snapshot")
+    orders_journal_compact_threshold: int = 5000  # journaled row changes before a full snapshot rewrite
+    supplier_rankings_path: str = os.path.join(os.path.dirname(project_root), "new_supplier_rankings.csv")
+    data_reload_interval: float = 5.0  # seconds between file change polls, 0 disables hot reload
+
+    # Background Job Settings
+    jobs_db_path: str = os.path.join(data_dir, "jobs.sqlite3")
+    job_workers: int = 1  # plans executed at the same time in the background
+    job_async_threshold: int = 50  # plans with more actions than this run as background jobs, 0 = always
+    job_progress_chunk_size: int = 100  # actions executed between progress updates
+    plan_checkpoints_db_path: str = os.path.join(data_dir, "plan_checkpoints.sqlite3")
+    plan_checkpoint_retention_days: int = 30  # completed-action records kept for resuming plans, 0 = forever
 
     # Pandas Display Settings
     max_display_rows: Optional[int] = None
@@ -5,6 +5,8 @@ from .ai_chat_manager import AIChatManager
 from services.data_service import DataService
 from services.odoo_service import OdooService
 from services.planning_service import PlanningService
+from services.file_watcher import FileWatcher
+from services.job_queue import JobQueue
 from tools.query_tool import QueryTool
 from tools.odoo_query_tool import OdooQueryTool
 from tools.verification_tool import VerificationTool
@@ -14,6 +16,7 @@ from tools.rescheduling_tool import ReschedulingTool
 from tools.supplier_tool import CreateSupplierAndRetryTool
 from utils.response_formatter import ResponseFormatter
 from utils.exceptions import AgentError
+from config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +30,11 @@ class SupplyChainAgent:
         self.odoo_service = OdooService()
         self.planning_service = PlanningService(self.data_service, self.odoo_service)
         self.response_formatter = ResponseFormatter()
+        self.file_watcher = FileWatcher(settings.data_reload_interval)
+        self.job_queue = JobQueue(settings.jobs_db_path, workers=settings.job_workers)
+        self.job_queue.register_handler('execute_plan', self.planning_service.run_plan_job)
+        self.job_queue.register_handler('execute_reschedule', self.planning_service.run_reschedule_job)
+        self.data_service.register_watches(self.file_watcher)
         self._initialize_tools()
 
     def _initialize_tools(self):
@@ -34,7 +42,7 @@ class SupplyChainAgent:
         odoo_query_tool = OdooQueryTool(self.odoo_service, self.session_manager)
         verification_tool = VerificationTool(self.odoo_service, self.session_manager)
         planning_tool = PlanningTool(self.planning_service, self.session_manager)
-        execution_tool = ExecutionTool(self.planning_service, self.session_manager)
+        execution_tool = ExecutionTool(self.planning_service, self.session_manager, self.job_queue)
         rescheduling_tool = ReschedulingTool(
             self.data_service, 
             self.planning_service, 
@@ -48,6 +56,7 @@ class SupplyChainAgent:
             verification_tool.check_order_status_in_odoo,
             planning_tool.create_execution_plan,
             execution_tool.execute_plan,
+            execution_tool.get_execution_job_status,
             supplier_tool.create_supplier_and_retry,
             rescheduling_tool.analyze_rescheduling_eligibility,
             rescheduling_tool.create_rescheduling_plan,
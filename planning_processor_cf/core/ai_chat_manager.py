@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 class AIChatManager:
     def __init__(self):
         self._chat_sessions: Dict[str, Any] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
         self._tools: List = []
         self._system_instruction = self._get_system_instruction()
         self._initialize_genai()
@@ -134,8 +135,8 @@ class AIChatManager:
             if plan:
                 plan_summary = ""
                 # Case 1: It's the standard plan object from planning_tool
-                if hasattr(plan, 'actions') and plan.actions:
-                    plan_summary = f"An execution plan for {len(plan.actions)} order(s) is pending confirmation."
+                if hasattr(plan, 'actions') and plan.action_count:
+                    plan_summary = f"An execution plan for {plan.action_count} order(s) is pending confirmation."
                 # Case 2: It's the rescheduling plan dictionary from rescheduling_tool
                 elif isinstance(plan, dict) and plan.get('valid_orders'):
                     plan_summary = f"A rescheduling plan for {len(plan['valid_orders'])} order(s) is pending confirmation."
@@ -155,8 +156,18 @@ class AIChatManager:
         # Combine context with user message
         contextual_message = " | ".join(contextual_parts) + f" | User command: \"{message}\""
 
+        # One turn at a time per session: a ChatSession's history is not thread-safe
+        async with self._session_locks.setdefault(session_id, asyncio.Lock()):
+            return await self._send_turn(session_id, chat_session, message, contextual_message)
+
+    async def _send_turn(self, session_id: str, chat_session, message: str, contextual_message: str) -> str:
         try:
-            response = chat_session.send_message(contextual_message)
+            # The SDK call blocks, and tool calls (Odoo RPCs included) run inside
+            # it, so keep it off the event loop to not stall other sessions. This
+            # is the only place the request path reaches Odoo: the tools are
+            # synchronous SDK callbacks, so they use the pooled, thread-safe
+            # OdooService and its run_concurrently for independent reads.
+            response = await asyncio.to_thread(chat_session.send_message, contextual_message)
 
             # --- CHANGE 2: Add robust checking before accessing .text ---
             # Instead of blindly calling response.text, we check if the response
@@ -192,6 +203,7 @@ class AIChatManager:
                 f"An unexpected error occurred while processing AI me")
 
     def remove_session(self, session_id: str):
+        self._session_locks.pop(session_id, None)
         if session_id in self._chat_sessions:
             del self._chat_sessions[session_id]
             logger.info(f"Removed AI chat session for {session_id}")
@@ -217,6 +229,7 @@ class AIChatManager:
     9. execute_rescheduling_plan - To execute approved rescheduling plans.
     10. get_rescheduling_options - To show available rescheduling options.
     11. validate_rescheduling_request - To validate rescheduling requests before planning.
+    12. get_execution_job_status - To report progress of a plan that was queued as a background job.
 
     **CRITICAL WORKFLOW RULES**
         **1. PLAN CREATION AND CONFIRMATION WORKFLOW:**
@@ -230,6 +243,7 @@ class AIChatManager:
     - You MUST parse the result to provide a clear, user-friendly summary.
     - **For a successful Purchase Order:** If the result contains a `supplier_name`, your response MUST follow this template: "Execution complete. A purchase order was successfully created for supplier '[supplier_name]' with Odoo ID [PO number]."
     - **For other successful actions:** Your response should be: "Execution complete. Successfully processed [X/Y] action(s)."
+    - **For a queued plan:** If the result has `"status": "queued"`, the plan is running in the background. Tell the user it was queued with its job ID, and call `get_execution_job_status` when they ask about progress, reporting it like "Queued, 120/400 done."
 
     **3. SUPPLIER CREATION AND RETRY WORKFLOW:**
     - **Step 1 (Ask):** If `execute_plan` fails with a `requires_user_action` status because a supplier was not found, you MUST ask the user for confirmation using this exact template: "The order failed because supplier '[supplier_name]' does not exist in Odoo. Would you like me to create this supplier and try again?"
@@ -0,0 +1,483 @@
+# devtools/odoo_stub_server.py
+"""
+Local stand-in for the Odoo XML-RPC API, for load tests and offline
+benchmarks. It implements the models and methods the agent (and demo.py)
+use, keeps all records in memory, and can add a fixed latency per call.
+
+Run it next to the app and point ODOO_URL at it:
+
+    python -m devtools.odoo_stub_server --port 8069 --latency 0.05 \
+        --products 2000 --partners 200 --existing-orders 5000 \
+        --planned-orders data/planned_orders.csv
+
+or start it in-process from a benchmark with start_stub_server(). Any
+database, login and password are accepted.
+"""
+import argparse
+import csv
+import logging
+import random
+import re
+import threading
+import time
+import xmlrpc.client
+from collections import Counter
+from datetime import datetime, timedelta
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Many2one fields per model and the model they point to
+MANY2ONE = {
+    'product.product': {'product_tmpl_id': 'product.template', 'uom_id': 'uom.uom'},
+    'product.template': {'uom_id': 'uom.uom'},
+    'mrp.bom': {'product_tmpl_id': 'product.template', 'product_id': 'product.product'},
+    'mrp.bom.line': {'bom_id': 'mrp.bom', 'product_id': 'product.product'},
+    'mrp.production': {'product_id': 'product.product', 'bom_id': 'mrp.bom', 'product_uom_id': 'uom.uom'},
+    'purchase.order': {'partner_id': 'res.partner'},
+    'purchase.order.line': {'order_id': 'purchase.order', 'product_id': 'product.product'},
+    'sale.order': {'partner_id': 'res.partner'},
+    'sale.order.line': {'order_id': 'sale.order', 'product_id': 'product.product'},
+    'product.supplierinfo': {'partner_id': 'res.partner', 'product_tmpl_id': 'product.template'},
+    'res.partner': {},
+    'uom.uom': {},
+}
+
+# One2many fields: (comodel, inverse field on the comodel, field of this record it matches)
+ONE2MANY = {
+    'purchase.order': {'order_line': ('purchase.order.line', 'order_id', 'id')},
+    'sale.order': {'order_line': ('sale.order.line', 'order_id', 'id')},
+    'mrp.bom': {'bom_line_ids': ('mrp.bom.line', 'bom_id', 'id')},
+    'product.product': {'seller_ids': ('product.supplierinfo', 'product_tmpl_id', 'product_tmpl_id')},
+    'product.template': {'seller_ids': ('product.supplierinfo', 'product_tmpl_id', 'id')},
+}
+
+# Record name sequences and the state each confirm method moves a record to
+SEQUENCES = {'purchase.order': 'P{:05d}', 'mrp.production': 'WH/MO/{:05d}', 'sale.order': 'S{:05d}'}
+CONFIRM_STATES = {
+    ('purchase.order', 'button_confirm'): 'purchase',
+    ('mrp.production', 'action_confirm'): 'confirmed',
+    ('sale.order', 'action_confirm'): 'sale',
+}
+DEFAULT_STATES = {'purchase.order': 'draft', 'mrp.production': 'draft', 'sale.order': 'draft'}
+
+ITEM_PATTERN = re.compile(r'\[([^\]]+)\]\s*(.*)')
+
+
+def _sort_key(value: Any) -> Tuple[int, int, Any]:
+    """Orders empty values (None/False) last and numbers before text, so mixed columns still sort."""
+    if value is None or value is False:
+        return (1, 0, 0)
+    if isinstance(value, (int, float)):
+        return (0, 0, value)
+    return (0, 1, str(value))
+
+
+class OdooStubStore:
+    """In-memory records for the supported models, safe to use from many request threads."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[int, Dict[str, Any]]] = {model: {} for model in MANY2ONE}
+        self.calls: Counter = Counter()
+        self._next_id = 1
+        self._sequences: Counter = Counter()
+        self._lock = threading.RLock()
+
+    # ----- Records -----
+
+    def _table(self, model: str) -> Dict[int, Dict[str, Any]]:
+        if model not in self.models:
+            raise xmlrpc.client.Fault(2, f"Object {model} doesn't exist")
+        return self.models[model]
+
+    def _display_name(self, model: str, record_id: int) -> str:
+        record = self.models.get(model, {}).get(record_id)
+        if record is None:
+            return f"{model},{record_id}"
+        name = record.get('name') or f"{model},{record_id}"
+        if model == 'product.product' and record.get('default_code'):
+            return f"[{record['default_code']}] {name}"
+        return name
+
+    def _value(self, model: str, record: Dict[str, Any], field: str) -> Any:
+        """Raw stored value of a field; many2ones are ids, one2manys lists of ids."""
+        if field == 'id':
+            return record['id']
+        if field == 'display_name':
+            return self._display_name(model, record['id'])
+        one2many = ONE2MANY.get(model, {}).get(field)
+        if one2many:
+            comodel, inverse, own_key = one2many
+            key = record.get(own_key)
+            return [child_id for child_id, child in self.models[comodel].items() if key and child.get(inverse) == key]
+        return record.get(field)
+
+    def _render(self, model: str, record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        if not fields:
+            fields = [field for field in record if field != 'id'] + ['display_name'] + list(ONE2MANY.get(model, {}))
+        rendered = {'id': record['id']}
+        for field in fields:
+            value = self._value(model, record, field)
+            comodel = MANY2ONE.get(model, {}).get(field)
+            if comodel:
+                rendered[field] = [value, self._display_name(comodel, value)] if value else False
+            else:
+                rendered[field] = False if value is None else value
+        return rendered
+
+    def insert(self, model: str, vals: Dict[str, Any]) -> int:
+        """Creates one record, applying one2many (0, 0, vals) commands and model defaults."""
+        with self._lock:
+            table = self._table(model)
+            record_id = self._next_id
+            self._next_id += 1
+            record = {'id': record_id}
+            children = []
+            for field, value in vals.items():
+                if field in ONE2MANY.get(model, {}):
+                    children.append((field, value or []))
+                elif field in MANY2ONE.get(model, {}) and isinstance(value, (list, tuple)):
+                    record[field] = value[0] if value else None
+                else:
+                    record[field] = value
+            if model in SEQUENCES and not record.get('name'):
+                self._sequences[model] += 1
+                record['name'] = SEQUENCES[model].format(self._sequences[model])
+            if model in DEFAULT_STATES:
+                record.setdefault('state', DEFAULT_STATES[model])
+            table[record_id] = record
+
+            for field, commands in children:
+                comodel, inverse, own_key = ONE2MANY[model][field]
+                for command in commands:
+                    if command and command[0] == 0:
+                        self.insert(comodel, dict(command[2], **{inverse: record.get(own_key)}))
+            return record_id
+
+    # ----- Domains -----
+
+    def _leaf_matches(self, model: str, record: Dict[str, Any], leaf: List[Any]) -> bool:
+        field, operator, value = leaf
+        actual = self._value(model, record, field)
+        if field in MANY2ONE.get(model, {}) and isinstance(value, (list, tuple)) and operator in ('=', '!='):
+            value = value[0] if value else False
+        if actual is None:
+            actual = False
+
+        if operator == '=':
+            return actual == value
+        if operator == '!=':
+            return actual != value
+        if operator == 'in':
+            return actual in value or (isinstance(actual, list) and any(item in value for item in actual))
+        if operator == 'not in':
+            return actual not in value
+        if operator in ('like', 'ilike', 'not like', 'not ilike'):
+            haystack, needle = str(actual or ''), str(value)
+            if 'ilike' in operator:
+                haystack, needle = haystack.lower(), needle.lower()
+            found = needle in haystack
+            return not found if operator.startswith('not') else found
+        if operator in ('<', '<=', '>', '>='):
+            if actual is False or value is False:
+                return False
+            if operator == '<':
+                return actual < value
+            if operator == '<=':
+                return actual <= value
+            if operator == '>':
+                return actual > value
+            return actual >= value
+        raise xmlrpc.client.Fault(1, f"Invalid operator {operator!r} in domain")
+
+    def _domain_matches(self, model: str, record: Dict[str, Any], domain: List[Any]) -> bool:
+        """Evaluates an Odoo domain, including '&', '|' and '!' prefix operators."""
+        def evaluate(position: int) -> Tuple[bool, int]:
+            token = domain[position]
+            if token == '!':
+                result, position = evaluate(position + 1)
+                return not result, position
+            if token in ('&', '|'):
+                left, position = evaluate(position + 1)
+                right, position = evaluate(position)
+                return (left and right) if token == '&' else (left or right), position
+            return self._leaf_matches(model, record, token), position + 1
+
+        position = 0
+        while position < len(domain):
+            result, position = evaluate(position)
+            if not result:
+                return False
+        return True
+
+    def _search(self, model: str, domain: List[Any], offset: int = 0, limit: Optional[int] = None,
+                order: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = [record for record in self._table(model).values() if self._domain_matches(model, record, domain or [])]
+        for term in reversed([term.strip() for term in (order or 'id').split(',') if term.strip()]):
+            field, _, direction = term.partition(' ')
+            records.sort(key=lambda record: _sort_key(self._value(model, record, field)),
+                         reverse=direction.strip().lower() == 'desc')
+        records = records[offset or 0:]
+        return records[:limit] if limit else records
+
+    # ----- XML-RPC methods -----
+
+    def execute_kw(self, db: str, uid: int, password: str, model: str, method: str,
+                   args: Optional[List[Any]] = None, kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        args = list(args or [])
+        kwargs = dict(kwargs or {})
+        self.calls[(model, method)] += 1
+
+        if method == 'search':
+            domain = args[0] if args else kwargs.pop('domain', [])
+            if kwargs.get('count'):
+                return len(self._search(model, domain))
+            return [record['id'] for record in self._search(model, domain, kwargs.get('offset', 0),
+                                                             kwargs.get('limit'), kwargs.get('order'))]
+        if method == 'search_count':
+            return len(self._search(model, args[0] if args else kwargs.get('domain', [])))
+        if method == 'search_read':
+            domain = args[0] if args else kwargs.get('domain', [])
+            fields = args[1] if len(args) > 1 else kwargs.get('fields')
+            records = self._search(model, domain, kwargs.get('offset', 0), kwargs.get('limit'), kwargs.get('order'))
+            with self._lock:
+                return [self._render(model, record, fields) for record in records]
+        if method == 'read':
+            ids = args[0] if isinstance(args[0], list) else [args[0]]
+            fields = args[1] if len(args) > 1 else kwargs.get('fields')
+            with self._lock:
+                table = self._table(model)
+                return [self._render(model, table[record_id], fields) for record_id in ids if record_id in table]
+        if method == 'create':
+            vals = args[0]
+            if isinstance(vals, list):
+                return [self.insert(model, record_vals) for record_vals in vals]
+            return self.insert(model, vals)
+        if method == 'write':
+            ids, vals = args[0], args[1]
+            with self._lock:
+                table = self._table(model)
+                for record_id in ids:
+                    if record_id not in table:
+                        raise xmlrpc.client.Fault(2, f"Record {model}({record_id}) does not exist")
+                    for field, value in vals.items():
+                        if field in MANY2ONE.get(model, {}) and isinstance(value, (list, tuple)):
+                            value = value[0] if value else None
+                        table[record_id][field] = value
+            return True
+        if method == 'unlink':
+            with self._lock:
+                table = self._table(model)
+                for record_id in args[0]:
+                    record = table.get(record_id)
+                    if record is None:
+                        raise xmlrpc.client.Fault(2, f"Record {model}({record_id}) does not exist")
+                    if record.get('state', 'draft') not in ('draft', 'cancel'):
+                        raise xmlrpc.client.Fault(1, f"Cannot delete {model}({record_id}) in state {record['state']}")
+                for record_id in args[0]:
+                    del table[record_id]
+            return True
+        if (model, method) in CONFIRM_STATES:
+            with self._lock:
+                table = self._table(model)
+                for record_id in args[0]:
+                    table[record_id]['state'] = CONFIRM_STATES[(model, method)]
+            return True
+        raise xmlrpc.client.Fault(1, f"The method '{method}' does not exist on the model '{model}'")
+
+    # ----- Synthetic data -----
+
+    def seed(self, random_seed: int = 42, products: int = 200, partners: int = 50, sale_orders: int = 100,
+             existing_orders: int = 0, planned_orders_csv: Optional[str] = None) -> None:
+        """
+        Fills the store with reproducible synthetic data: a Units UoM,
+        suppliers, finished goods with BOMs, components with supplier
+        info, confirmed sales orders over the next 30 days and, optionally,
+        MOs/POs already linked to planned order ids. Items, suppliers and
+        planned ids from a planned orders CSV are added on top.
+        """
+        rng = random.Random(random_seed)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        units = self.insert('uom.uom', {'name': 'Units'})
+        self.insert('uom.uom', {'name': 'Dozens'})
+        partner_ids = [self.insert('res.partner', {'name': f"Supplier {i:04d}", 'is_company': True})
+                       for i in range(1, partners + 1)]
+
+        def add_product(code: str, name: str) -> int:
+            template_id = self.insert('product.template', {'name': name, 'uom_id': units})
+            return self.insert('product.product', {
+                'name': name, 'default_code': code, 'product_tmpl_id': template_id, 'uom_id': units,
+                'qty_available': rng.randint(0, 200), 'x_studio_manufacturing_lead_time': rng.randint(1, 15),
+            })
+
+        finished = [add_product(f"FG{i:04d}", f"Finished Good {i}") for i in range(1, products // 4 + 1)]
+        components = [add_product(f"COMP{i:04d}", f"Component {i}") for i in range(1, products - len(finished) + 1)]
+
+        for product_id in components:
+            template_id = self.models['product.product'][product_id]['product_tmpl_id']
+            for partner_id in rng.sample(partner_ids, k=min(len(partner_ids), rng.randint(1, 2))):
+                self.insert('product.supplierinfo', {'partner_id': partner_id, 'product_tmpl_id': template_id,
+                                                     'delay': rng.randint(3, 30)})
+        for product_id in finished:
+            self._add_bom(product_id, rng.sample(components, k=min(len(components), rng.randint(2, 5))), rng)
+
+        for _ in range(sale_orders if finished else 0):
+            commitment = today + timedelta(days=rng.randint(0, 30), hours=rng.randint(8, 17))
+            self.insert('sale.order', {
+                'partner_id': rng.choice(partner_ids) if partner_ids else None,
+                'state': 'sale',
+                'commitment_date': commitment.strftime(DATETIME_FORMAT),
+                'order_line': [(0, 0, {'product_id': product_id, 'product_uom_qty': rng.randint(1, 50)})
+                               for product_id in rng.sample(finished, k=min(len(finished), rng.randint(1, 3)))],
+            })
+
+        planned = self._seed_from_planned_orders(planned_orders_csv, units, rng) if planned_orders_csv else []
+        for i in range(existing_orders):
+            if i < len(planned):
+                planned_order_id, item_type, product_id = planned[i]
+            else:
+                item_type = rng.choice(['Manufacture', 'Purchase'])
+                prefix = 'MO' if item_type == 'Manufacture' else 'PO'
+                planned_order_id = f"PLN-{prefix}-{100000 + i}"
+                product_id = rng.choice(finished if item_type == 'Manufacture' else components) if products else None
+            scheduled = (today + timedelta(days=rng.randint(-60, 90), hours=rng.randint(0, 23))).strftime(DATETIME_FORMAT)
+            if item_type == 'Manufacture':
+                self.insert('mrp.production', {'product_id': product_id, 'product_qty': rng.randint(1, 100),
+                                               'date_start': scheduled, 'product_uom_id': units,
+                                               'x_studio_planned_order_id': planned_order_id,
+                                               'state': rng.choice(['draft', 'confirmed', 'progress'])})
+            else:
+                self.insert('purchase.order', {'partner_id': rng.choice(partner_ids) if partner_ids else None,
+                                               'date_planned': scheduled,
+                                               'x_studio_planned_order_id': planned_order_id,
+                                               'order_line': [(0, 0, {'product_id': product_id,
+                                                                      'product_qty': rng.randint(1, 500),
+                                                                      'date_planned': scheduled})],
+                                               'state': rng.choice(['draft', 'purchase'])})
+        logger.info("Seeded Odoo stub: " + ", ".join(f"{model}={len(records)}" for model, records in self.models.items()))
+
+    def _add_bom(self, product_id: int, component_ids: List[int], rng: random.Random) -> None:
+        template_id = self.models['product.product'][product_id]['product_tmpl_id']
+        self.insert('mrp.bom', {
+            'product_tmpl_id': template_id, 'product_qty': 1,
+            'bom_line_ids': [(0, 0, {'product_id': component_id, 'product_qty': rng.randint(1, 8)})
+                             for component_id in component_ids],
+        })
+
+    def _seed_from_planned_orders(self, path: str, units: int, rng: random.Random) -> List[Tuple[str, str, int]]:
+        """Adds the CSV's items and suppliers; returns (planned id, item type, product id) per row."""
+        products_by_code = {record['default_code']: record_id
+                            for record_id, record in self.models['product.product'].items()}
+        partner_names = {record['name'] for record in self.models['res.partner'].values()}
+        planned = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                match = ITEM_PATTERN.match((row.get('Item') or '').strip())
+                if not match:
+                    continue
+                code, name = match.group(1).strip(), match.group(2).strip()
+                item_type = (row.get('Item Type') or 'Purchase').strip()
+                if code not in products_by_code:
+                    template_id = self.insert('product.template', {'name': name, 'uom_id': units})
+                    products_by_code[code] = self.insert('product.product', {
+                        'name': name, 'default_code': code, 'product_tmpl_id': template_id, 'uom_id': units,
+                        'qty_available': rng.randint(0, 200),
+                    })
+                    if item_type == 'Manufacture':
+                        self._add_bom(products_by_code[code], [], rng)
+                supplier = (row.get('Supplier') or '').strip()
+                if supplier and supplier not in partner_names:
+                    self.insert('res.partner', {'name': supplier, 'is_company': True})
+                    partner_names.add(supplier)
+                planned_order_id = (row.get('Planned ID') or '').strip()
+                if planned_order_id:
+                    planned.append((planned_order_id, item_type, products_by_code[code]))
+        return planned
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ('/xmlrpc/2/common', '/xmlrpc/2/object')
+    # Keep connections alive like a real Odoo behind a proxy
+    protocol_version = 'HTTP/1.1'
+
+
+class _ThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _with_latency(function: Callable, latency: float, jitter: float) -> Callable:
+    if latency <= 0 and jitter <= 0:
+        return function
+
+    def delayed(*args):
+        time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+        return function(*args)
+    return delayed
+
+
+def create_stub_server(store: OdooStubStore, host: str = '127.0.0.1', port: int = 8069,
+                       latency: float = 0.0, jitter: float = 0.0) -> SimpleXMLRPCServer:
+    """Builds (without starting) an XML-RPC server serving `store` on the Odoo endpoints."""
+    server = _ThreadingXMLRPCServer((host, port), requestHandler=_RequestHandler, logRequests=False, allow_none=True)
+    server.register_function(lambda: {'server_version': '17.0-stub', 'server_version_info': [17, 0, 0, 'final', 0, '']},
+                             'version')
+    server.register_function(lambda db, login, password, user_agent_env=None: 2, 'authenticate')
+    server.register_function(lambda db, login, password: 2, 'login')
+    server.register_function(_with_latency(store.execute_kw, latency, jitter), 'execute_kw')
+    return server
+
+
+def start_stub_server(store: Optional[OdooStubStore] = None, host: str = '127.0.0.1', port: int = 0,
+                      latency: float = 0.0, jitter: float = 0.0) -> Tuple[SimpleXMLRPCServer, str]:
+    """
+    Serves `store` (a freshly seeded one by default) on a daemon thread and
+    returns the server and its base URL. Port 0 picks a free port. Call
+    server.shutdown() when done.
+    """
+    if store is None:
+        store = OdooStubStore()
+        store.seed()
+    server = create_stub_server(store, host, port, latency, jitter)
+    threading.Thread(target=server.serve_forever, name="odoo-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Odoo XML-RPC stand-in for load tests and benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8069)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every execute_kw call")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random +/- seconds around the latency")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--products', type=int, default=200)
+    parser.add_argument('--partners', type=int, default=50)
+    parser.add_argument('--sale-orders', type=int, default=100)
+    parser.add_argument('--existing-orders', type=int, default=0,
+                        help="MOs/POs already in Odoo, linked to planned order ids")
+    parser.add_argument('--planned-orders', default=None, help="planned orders CSV whose items, suppliers and ids to seed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    store = OdooStubStore()
+    store.seed(random_seed=args.seed, products=args.products, partners=args.partners, sale_orders=args.sale_orders,
+               existing_orders=args.existing_orders, planned_orders_csv=args.planned_orders)
+    server = create_stub_server(store, args.host, args.port, args.latency, args.jitter)
+    logger.info(f"Odoo stub listening on http://{args.host}:{server.server_address[1]} (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Calls served: {sum(store.calls.values())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,19 @@ async def lifespan(app: FastAPI):
         logger.error(f"FATAL ERROR: Could not connect to Odoo during startup. Error: {e}")
         raise
 
+    if settings.odoo_reference_cache_warmup:
+        try:
+            agent.odoo_service.warm_reference_cache()
+        except Exception as e:
+            # Lookups still work, they just start cold
+            logger.warning(f"Could not warm the Odoo reference cache: {e}")
+
+    # Pick up new planned orders / supplier rankings without a restart
+    agent.file_watcher.start()
+
+    # Large plans are executed by background job workers
+    agent.job_queue.start()
+
     # Store the single agent instance in the application's state.
     # This is the recommended way to share resources.
     app.state.agent = agent
@@ -32,6 +45,10 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("--- Shutting down Supply Chain Agent ---")
+    agent.file_watcher.stop()
+    agent.job_queue.stop()
+    agent.planning_service.executor.close()
+    agent.odoo_service.close()
     app.state.agent = None # Clean up
 
 # Initialize the FastAPI application
@@ -1,6 +1,6 @@
 # models/api_models.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class ChatRequest(BaseModel):
     message: str
@@ -13,4 +13,20 @@ class ChatResponse(BaseModel):
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
-    sessions_active: int
\ No newline at end of file
+    sessions_active: int
+    odoo_cache: Optional[Dict[str, Any]] = None
+
+class JobStatusResponse(BaseModel):
+    id: str
+    session_id: Optional[str] = None
+    kind: str
+    status: str
+    total: int
+    done: int
+    succeeded: int
+    failed: int
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    results: Optional[List[Dict[str, Any]]] = None
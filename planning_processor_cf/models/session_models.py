@@ -1,12 +1,85 @@
 # models/session_models.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+import uuid
+
+# Order fields plan execution reads; the other columns stay in the order snapshot
+PLAN_ORDER_FIELDS = ('item', 'item_id', 'item_type', 'quantity', 'supplier_name_for_odoo',
+                     'suggested_due_date', 'user_defined_reschedule_days')
 
 class ActionPlan(BaseModel):
-    actions: List[Dict[str, Any]]
+    """
+    A pending plan in columnar form: the planned_order_id of every action and,
+    for each execution field, a list of values aligned with those ids. The
+    `actions` property expands it into the {"action_type", "order_data"}
+    dicts the executors take; ActionPlan(actions=[...]) still works too.
+    """
+    action_type: str = "create"
+    planned_order_ids: List[str] = Field(default_factory=list)
+    columns: Dict[str, List[Any]] = Field(default_factory=dict)
+    # Version of the order snapshot the rows were taken from (see source_rows)
+    snapshot_etag: Optional[str] = None
+    # Identifies the plan in the checkpoint log, so re-running it skips completed actions
+    plan_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     created_at: datetime = Field(default_factory=datetime.now)
 
+    @model_validator(mode='before')
+    @classmethod
+    def _from_actions(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or 'actions' not in data:
+            return data
+        data = dict(data)
+        actions = data.pop('actions') or []
+        action_types = {action.get('action_type') for action in actions}
+        if len(action_types) > 1:
+            raise ValueError(f"An ActionPlan holds actions of one type, got {sorted(map(str, action_types))}")
+        if actions:
+            data['action_type'] = action_types.pop()
+        orders = [action.get('order_data', {}) for action in actions]
+        data['planned_order_ids'] = [order_data.get('planned_order_id') for order_data in orders]
+        data['columns'] = {
+            field: [order_data.get(field) for order_data in orders]
+            for field in PLAN_ORDER_FIELDS if any(field in order_data for order_data in orders)
+        }
+        return data
+
+    @classmethod
+    def from_frame(cls, action_type: str, orders: Any, snapshot_etag: Optional[str] = None) -> "ActionPlan":
+        """
+        Builds a plan from a DataFrame of planned orders, keeping only the
+        execution fields. Skips validation for speed, so values are converted
+        here to what validation would accept: ids as strings, missing values
+        as None, numpy scalars as Python ones.
+        """
+        def values(column: Any) -> List[Any]:
+            column = column.astype(object)
+            return column.where(column.notna(), None).tolist()
+
+        return cls.model_construct(
+            action_type=action_type,
+            planned_order_ids=orders['planned_order_id'].astype(str).tolist(),
+            columns={field: values(orders[field]) for field in PLAN_ORDER_FIELDS if field in orders.columns},
+            snapshot_etag=snapshot_etag,
+        )
+
+    @property
+    def action_count(self) -> int:
+        return len(self.planned_order_ids)
+
+    @property
+    def actions(self) -> List[Dict[str, Any]]:
+        fields = list(self.columns)
+        return [
+            {"action_type": self.action_type,
+             "order_data": dict(zip(fields, values), planned_order_id=planned_order_id)}
+            for planned_order_id, *values in zip(self.planned_order_ids, *self.columns.values())
+        ]
+
+    def source_rows(self, snapshot: Any) -> Any:
+        """Full planned-order rows of this plan's actions, looked up in an order snapshot."""
+        return snapshot.select_ids(self.planned_order_ids)
+
 class SessionData(BaseModel):
     session_id: str
     created_at: datetime
@@ -16,4 +89,4 @@ class SessionData(BaseModel):
     context: Dict[str, Any] = {}
 
     class Config:
-        arbitrary_types_allowed = True
\ No newline at end of file
+        arbitrary_types_allowed = True
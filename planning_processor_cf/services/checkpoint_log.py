@@ -0,0 +1,85 @@
+# services/checkpoint_log.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+import logging
+
+from utils.json_utils import json_default
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointLog:
+    """
+    Durable record of the plan actions that completed, keyed by plan id,
+    planned order id and action type. Executors consult it before calling
+    Odoo so that re-running a plan (after a crash, a timeout or a partial
+    failure) only processes the actions that have not succeeded yet.
+    """
+
+    def __init__(self, db_path: str, retention_days: int = 30):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._local = threading.local()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _init_db(self) -> None:
+        connection = self._connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS plan_checkpoints (
+                plan_id TEXT NOT NULL,
+                planned_order_id TEXT NOT NULL,
+                action_type TEXT NOT NULL,
+                result TEXT NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (plan_id, planned_order_id, action_type)
+            );
+            CREATE INDEX IF NOT EXISTS plan_checkpoints_completed ON plan_checkpoints (completed_at);
+        """)
+        if self.retention_days > 0:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+            removed = connection.execute("DELETE FROM plan_checkpoints WHERE completed_at < ?", (cutoff,)).rowcount
+            if removed:
+                logger.info(f"Pruned {removed} plan checkpoint(s) older than {self.retention_days} days")
+
+    def completed(self, plan_id: str, action_type: str, planned_order_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns the recorded result for each of `planned_order_ids` that already completed."""
+        planned_order_ids = list(dict.fromkeys(str(planned_order_id) for planned_order_id in planned_order_ids))
+        done: Dict[str, Dict[str, Any]] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(planned_order_ids), 500):
+            chunk = planned_order_ids[start:start + 500]
+            rows = self._connection().execute(
+                f"SELECT planned_order_id, result FROM plan_checkpoints WHERE plan_id = ? AND action_type = ? "
+                f"AND planned_order_id IN ({', '.join('?' * len(chunk))})",
+                (plan_id, action_type, *chunk))
+            for planned_order_id, result in rows:
+                done[planned_order_id] = json.loads(result)
+        return done
+
+    def record(self, plan_id: str, action_type: str, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Records (planned_order_id, result) pairs of completed actions in one transaction."""
+        if not entries:
+            return
+        completed_at = datetime.now().isoformat()
+        connection = self._connection()
+        with connection:
+            connection.execute('BEGIN')
+            connection.executemany(
+                "INSERT OR REPLACE INTO plan_checkpoints (plan_id, planned_order_id, action_type, result, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(plan_id, str(planned_order_id), action_type, json.dumps(result, default=json_default), completed_at)
+                 for planned_order_id, result in entries])
@@ -1,21 +1,31 @@
 # services/data_service.py
-from datetime import date
-import datetime
-import re
+from datetime import date, datetime
+import numpy as np
 import pandas as pd
 import os
+import threading
+import time
 from typing import Any, List, Optional,Dict
-from functools import lru_cache
 
 from config.settings import settings
+from services.file_watcher import FileWatcher
+from services.order_snapshot import OrderSnapshot, private_copy
+from services.order_store import OrderStore, create_order_store, file_signature, to_csv_frame
 from utils.exceptions import DataLoadError
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DataService:
-    def __init__(self):
-        self._df_cache: Optional[pd.DataFrame] = None
+    def __init__(self, store: Optional[OrderStore] = None):
+        self._snapshot: Optional[OrderSnapshot] = None
+        self._rankings: Optional[pd.DataFrame] = None
+        self._generation = time.time_ns()
+        self._lock = threading.RLock()
+        self.data_path = os.path.join(settings.data_dir, settings.orders_file)
+        self._store = store or create_order_store(
+            settings.orders_store_backend, self.data_path, settings.orders_snapshot_dir
+        )
 
     def _clean_column_headers(self, df: pd.DataFrame) -> pd.DataFrame:
         """Standardizes column headers to lowercase_with_underscores."""
@@ -24,77 +34,147 @@ class DataService:
         df.columns = new_cols
         return df
 
-    def _extract_item_id(self, item_string: str) -> Optional[str]:
-        """Extracts an item ID like '[COMP0004]' from a string."""
-        if not isinstance(item_string, str):
-            return None
-        match = re.search(r'\[(.*?)\]', item_string)
-        return match.group(1) if match else None
+    @property
+    def version(self) -> int:
+        """Version number of the currently published planned orders."""
+        return self.snapshot().version
+
+    @property
+    def etag(self) -> str:
+        """Token callers can keep to detect that the planned orders changed."""
+        return self.snapshot().etag
+
+    def snapshot(self, force_reload: bool = False) -> OrderSnapshot:
+        """
+        Returns the currently published, read-only snapshot of the planned
+        orders, loading it on first use.
+        """
+        current = self._snapshot
+        if current is not None and not force_reload:
+            return current
+        with self._lock:
+            if self._snapshot is None or force_reload:
+                self._publish(self._read_snapshot(force_reload))
+            return self._snapshot
 
-    @lru_cache(maxsize=None)
     def load_data(self, force_reload: bool = False) -> pd.DataFrame:
         """
-        Loads and robustly cleans the planned orders data from the CSV file.
+        Returns a zero-copy view of the current planned orders. Changes made
+        to the returned frame stay local to the caller.
         """
-        if self._df_cache is not None and not force_reload:
-            return self._df_cache.copy()
-        try:
-            orders_path = os.path.join(settings.data_dir, settings.orders_file)
-            if not os.path.exists(orders_path):
-                raise DataLoadError(f"Orders file not found: {orders_path}")
-
-            df = pd.read_csv(orders_path)
-
-            # Step 1: Standardize column headers
-            df = self._clean_column_headers(df)
-            logger.info(f"Cleaned column headers: {list(df.columns)}")
-
-            # --- THIS IS THE FIX ---
-            # Step 2: Specifically look for 'planned_id' and rename it to the application's standard 'planned_order_id'
-            if 'planned_id' in df.columns:
-                df.rename(columns={'planned_id': 'planned_order_id'}, inplace=True)
-            # --- END OF FIX ---
-
-            # Step 3: Ensure all required columns exist, adding them if they don't
-            required_cols = {
-                'planned_order_id': None, 'item': None, 'item_id': None,
-                'quantity': 0, 'suggested_due_date': None, 'item_type': None,
-                'supplier': None, 'reschedule_out_days': 0
-            }
-            for col, default in required_cols.items():
-                if col not in df.columns:
-                    df[col] = default
-                    logger.warning(f"Column '{col}' was missing. Added it with default values.")
+        return self.snapshot(force_reload).view()
 
-            # Step 4: Extract item_id from the 'item' column
-            df['item_id'] = df['item'].apply(self._extract_item_id)
-            
-            # Step 5: Process the date column
-            if 'suggested_due_date' not in df.columns:
-                raise DataLoadError("Fatal: Column 'suggested_due_date' not found after cleaning.")
-            df['suggested_due_date'] = pd.to_datetime(df['suggested_due_date'], dayfirst=True)
+    def _read_snapshot(self, force_reload: bool = False) -> OrderSnapshot:
+        """
+        Reads the planned orders, preferring the store's typed snapshot and
+        falling back to importing the CSV when the snapshot is missing or stale.
+        """
+        try:
+            signature = file_signature(self.data_path)
+            df = None if force_reload else self._store.load(source_signature=signature)
+            imported = df is None
+            if imported:
+                df = self.import_csv(self.data_path)
 
-            # Step 6: Rename supplier column for Odoo service compatibility
-            if 'supplier' in df.columns:
-                df.rename(columns={'supplier': 'supplier_name_for_odoo'}, inplace=True)
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            snapshot = OrderSnapshot(df, version, self._generation, source_signature=signature)
+            # Journaled changes belong to the CSV they were made on; a changed CSV replaces them
+            if self._store.journal is not None and (not imported or self._store.source_signature() == signature):
+                changes = self._store.journal.read()
+                if changes:
+                    snapshot = self._with_due_date_changes(snapshot, changes)
+                    logger.info(f"Replayed {len(changes)} journaled change(s) onto the planned orders")
+            if imported:
+                # The saved snapshot includes the replayed changes, so resetting the journal loses nothing
+                self._store.save(snapshot.frame, source_signature=signature)
+            return snapshot
 
-            self._df_cache = df
-            logger.info(f"Successfully loaded and cleaned {len(self._df_cache)} records from planning data.")
-            return self._df_cache.copy()
-            
+        except DataLoadError:
+            raise
         except Exception as e:
             logger.error(f"Failed to load data: {e}", exc_info=True)
             raise DataLoadError(f"Failed to load data: {str(e)}")
+
+    def _publish(self, snapshot: OrderSnapshot) -> None:
+        """Makes `snapshot` the version every subsequent reader sees."""
+        self._snapshot = snapshot
+        logger.info(f"Published planned orders version {snapshot.etag} ({len(snapshot.frame)} records)")
+
+    def import_csv(self, orders_path: str) -> pd.DataFrame:
+        """
+        Parses and robustly cleans a planned orders CSV file.
+        """
+        if not os.path.exists(orders_path):
+            raise DataLoadError(f"Orders file not found: {orders_path}")
+
+        df = pd.read_csv(orders_path)
+
+        # Step 1: Standardize column headers
+        df = self._clean_column_headers(df)
+        logger.info(f"Cleaned column headers: {list(df.columns)}")
+
+        # Step 2: Specifically look for 'planned_id' and rename it to the application's standard 'planned_order_id'
+        if 'planned_id' in df.columns:
+            df.rename(columns={'planned_id': 'planned_order_id'}, inplace=True)
+
+        # Step 3: Ensure all required columns exist, adding them if they don't
+        required_cols = {
+            'planned_order_id': None, 'item': None, 'item_id': None,
+            'quantity': 0, 'suggested_due_date': None, 'item_type': None,
+            'supplier': None, 'reschedule_out_days': 0
+        }
+        if 'supplier_name_for_odoo' in df.columns:
+            # Files written by export_csv already use the renamed supplier column
+            df.rename(columns={'supplier_name_for_odoo': 'supplier'}, inplace=True)
+        for col, default in required_cols.items():
+            if col not in df.columns:
+                df[col] = default
+                logger.warning(f"Column '{col}' was missing. Added it with default values.")
+
+        # Step 4: Extract item_id from the 'item' column
+        item_ids = df['item'].astype('string').str.extract(r'\[(.*?)\]', expand=False)
+        df['item_id'] = item_ids.astype(object).where(item_ids.notna(), None)
+
+        # Step 5: Process the date column
+        df['suggested_due_date'] = pd.to_datetime(df['suggested_due_date'], dayfirst=True)
+
+        # Step 6: Rename supplier column for Odoo service compatibility
+        df.rename(columns={'supplier': 'supplier_name_for_odoo'}, inplace=True)
+
+        logger.info(f"Successfully imported and cleaned {len(df)} records from {orders_path}.")
+        return df
+
+    def export_csv(self, path: Optional[str] = None) -> str:
+        """
+        Writes the current planned orders back out in the planning CSV layout.
+
+        Args:
+            path: Destination file, defaults to the configured orders file
+
+        Returns:
+            Path of the written file
+        """
+        path = path or self.data_path
+        to_csv_frame(self.snapshot().frame).to_csv(path, index=False)
+        logger.info(f"Exported planned orders to {path}")
+        return path
     
-    @lru_cache(maxsize=None)
     def load_supplier_rankings(self) -> pd.DataFrame:
         """
-        Loads and caches the supplier ranking data from the CSV file.
+        Returns the cached supplier ranking data, reading the CSV file on first use.
+        Returns an empty DataFrame if the file is not found or invalid.
+        """
+        if self._rankings is None:
+            self._rankings = self._read_supplier_rankings()
+        return self._rankings
+
+    def _read_supplier_rankings(self, path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Loads the supplier ranking data from the CSV file.
         Returns an empty DataFrame if the file is not found or invalid.
         """
         try:
-            # Path is relative to the project root as specified in the prompt
-            ranking_file_path = os.path.join('..', 'new_supplier_rankings.csv')
+            ranking_file_path = path or settings.supplier_rankings_path
             
             if not os.path.exists(ranking_file_path):
                 logger.warning(f"Supplier ranking file not found at '{ranking_file_path}'.")
@@ -118,10 +198,63 @@ class DataService:
             logger.error(f"Failed to load supplier rankings: {e}", exc_info=True)
             # Return an empty dataframe on any error to ensure graceful fallback
             return pd.DataFrame()
-        
+
+    def reload_orders(self, path: Optional[str] = None) -> bool:
+        """
+        Re-imports the planning CSV and publishes it as a new snapshot. The
+        file is parsed before taking the writer lock, and readers keep seeing
+        the previous version until the parse has fully succeeded.
+
+        Args:
+            path: File to import, defaults to the configured orders file
+
+        Returns:
+            Boolean indicating whether a new version was published
+        """
+        path = path or self.data_path
+        signature = file_signature(path)
+        try:
+            df = self.import_csv(path)
+        except Exception as e:
+            logger.warning(f"Could not reload planned orders, keeping version {self._snapshot.etag if self._snapshot else 'none'}: {e}")
+            return False
+        if file_signature(path) != signature:
+            logger.info("Planned orders file changed while it was being read; waiting for the next poll.")
+            return False
+
+        with self._lock:
+            # The new CSV replaces the snapshot and any journaled changes
+            self._store.save(df, source_signature=signature)
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            self._publish(OrderSnapshot(df, version, self._generation, source_signature=signature))
+        return True
+
+    def reload_supplier_rankings(self, path: Optional[str] = None) -> bool:
+        """
+        Re-reads the supplier rankings and swaps them in if they are usable.
+
+        Args:
+            path: Rankings file to read, defaults to the configured rankings file
+
+        Returns:
+            Boolean indicating whether the rankings were replaced
+        """
+        df_rankings = self._read_supplier_rankings(path)
+        if df_rankings.empty and self._rankings is not None and not self._rankings.empty:
+            logger.warning("Refreshed supplier rankings are empty or invalid; keeping the previous rankings.")
+            return False
+        self._rankings = df_rankings
+        return True
+
+    def register_watches(self, watcher: FileWatcher) -> None:
+        """Hot-reloads the planned orders and supplier rankings when their files change."""
+        watcher.watch(self.data_path, self.reload_orders)
+        watcher.watch(settings.supplier_rankings_path, self.reload_supplier_rankings)
+
     def save_data(self, df: pd.DataFrame) -> bool:
         """
-        Save DataFrame back to the data source (CSV file)
+        Save DataFrame back to the configured order store and publish it as
+        the next version
     
         Args:
             df: DataFrame to save
@@ -130,9 +263,12 @@ class DataService:
             Boolean indicating success
         """
         try:
-            # Assuming you're using CSV - adjust path as needed
-            df.to_csv(self.data_path, index=False)
-            logger.info(f"Successfully saved data to {self.data_path}")
+            with self._lock:
+                signature = file_signature(self.data_path)
+                self._store.save(df, source_signature=signature)
+                version = self._snapshot.version + 1 if self._snapshot else 1
+                self._publish(OrderSnapshot(private_copy(df), version, self._generation, source_signature=signature))
+            logger.info(f"Successfully saved {len(df)} planned orders")
             return True
         
         except Exception as e:
@@ -150,41 +286,22 @@ class DataService:
         Returns:
             Boolean indicating success
         """
-        try:
-            df = self.load_data()
-            
-            # Find the order
-            mask = df['planned_order_id'] == planned_order_id
-            
-            if not mask.any():
-                logger.warning(f"Order {planned_order_id} not found in data")
-                return False
-            
-            # Update the due date
-            df.loc[mask, 'suggested_due_date'] = new_due_date
-            
-            # Recalculate reschedule_out_days if that column exists
-            if 'reschedule_out_days' in df.columns:
-                current_date = date.today()
-                new_date = datetime.strptime(new_due_date, '%Y-%m-%d').date()
-                reschedule_days = max(0, (current_date - new_date).days)
-                df.loc[mask, 'reschedule_out_days'] = reschedule_days
-            
-            # Save the updated data
-            success = self.save_data(df)
-            
-            if success:
-                logger.info(f"Updated due date for order {planned_order_id} to {new_due_date}")
-            
-            return success
-            
-        except Exception as e:
-            logger.error(f"Failed to update order due date: {str(e)}")
-            return False
+        result = self.bulk_update_due_dates([
+            {'planned_order_id': planned_order_id, 'new_due_date': new_due_date}
+        ])
+        if result.get('successful'):
+            logger.info(f"Updated due date for order {planned_order_id} to {new_due_date}")
+            return True
+
+        failure = (result.get('failed_updates') or [{}])[0].get('error', result.get('error'))
+        logger.warning(f"Could not update due date for order {planned_order_id}: {failure}")
+        return False
 
     def bulk_update_due_dates(self, updates: List[Dict[str, str]]) -> Dict[str, Any]:
         """
-        Update multiple orders' due dates in bulk
+        Update multiple orders' due dates in bulk. Changes are appended to the
+        store's journal and patched into the cached frame, so the cost is
+        proportional to the number of changed rows rather than the file size.
         
         Args:
             updates: List of dictionaries with 'planned_order_id' and 'new_due_date'
@@ -193,56 +310,51 @@ class DataService:
             Dictionary with success/failure counts and details
         """
         try:
-            df = self.load_data()
-            
-            successful_updates = []
-            failed_updates = []
-            
-            current_date = date.today()
-            
-            for update in updates:
-                planned_order_id = update['planned_order_id']
-                new_due_date = update['new_due_date']
-                
-                try:
-                    # Find the order
-                    mask = df['planned_order_id'] == planned_order_id
-                    
-                    if not mask.any():
+            with self._lock:
+                positions = self.snapshot().positions
+
+                changes = []
+                successful_updates = []
+                failed_updates = []
+                current_date = date.today()
+
+                for update in updates:
+                    planned_order_id = update['planned_order_id']
+                    new_due_date = update['new_due_date']
+
+                    if planned_order_id not in positions:
                         failed_updates.append({
                             'planned_order_id': planned_order_id,
                             'error': 'Order not found'
                         })
                         continue
-                    
-                    # Update the due date
-                    df.loc[mask, 'suggested_due_date'] = new_due_date
-                    
-                    # Recalculate reschedule_out_days if that column exists
-                    if 'reschedule_out_days' in df.columns:
+                    try:
                         new_date = datetime.strptime(new_due_date, '%Y-%m-%d').date()
-                        reschedule_days = max(0, (current_date - new_date).days)
-                        df.loc[mask, 'reschedule_out_days'] = reschedule_days
-                    
-                    successful_updates.append({
+                    except (TypeError, ValueError) as e:
+                        failed_updates.append({
+                            'planned_order_id': planned_order_id,
+                            'error': str(e)
+                        })
+                        continue
+
+                    changes.append({
                         'planned_order_id': planned_order_id,
-                        'new_due_date': new_due_date
+                        'suggested_due_date': new_due_date,
+                        'reschedule_out_days': max(0, (current_date - new_date).days)
                     })
-                    
-                except Exception as e:
-                    failed_updates.append({
+                    successful_updates.append({
                         'planned_order_id': planned_order_id,
-                        'error': str(e)
+                        'new_due_date': new_due_date
                     })
-            
-            # Save all updates at once
-            if successful_updates:
-                save_success = self.save_data(df)
-                if not save_success:
-                    # If save fails, mark all as failed
-                    failed_updates.extend(successful_updates)
+
+                if changes and not self._persist_changes(changes):
+                    # If persisting fails, mark all as failed
+                    failed_updates.extend(
+                        {'planned_order_id': u['planned_order_id'], 'error': 'Failed to save changes'}
+                        for u in successful_updates
+                    )
                     successful_updates = []
-            
+
             result = {
                 'total_requested': len(updates),
                 'successful': len(successful_updates),
@@ -264,6 +376,76 @@ class DataService:
                 'error': str(e)
             }
 
+    def _with_due_date_changes(self, snapshot: OrderSnapshot, changes: List[Dict[str, Any]]) -> OrderSnapshot:
+        """Derives the next snapshot version with due-date changes applied."""
+        positions = snapshot.positions
+        known = [c for c in changes if c['planned_order_id'] in positions]
+        if not known:
+            return snapshot
+        # Every row of a duplicated id gets the change, as with the old mask-based update
+        counts = [len(positions[c['planned_order_id']]) for c in known]
+        rows = np.concatenate([positions[c['planned_order_id']] for c in known])
+
+        # Only the touched columns are copied and replaced; the old version stays intact
+        df = snapshot.frame.copy(deep=False)
+        due_dates = df['suggested_due_date'].copy()
+        due_dates.iloc[rows] = pd.to_datetime(np.repeat([c['suggested_due_date'] for c in known], counts))
+        df['suggested_due_date'] = due_dates
+        if 'reschedule_out_days' in df.columns:
+            out_days = df['reschedule_out_days'].copy()
+            out_days.iloc[rows] = np.repeat([c['reschedule_out_days'] for c in known], counts)
+            df['reschedule_out_days'] = out_days
+        return snapshot.derive(df)
+
+    def _persist_changes(self, changes: List[Dict[str, Any]]) -> bool:
+        """Durably records row-level changes, then publishes them as a new version."""
+        updated = self._with_due_date_changes(self.snapshot(), changes)
+        journal = self._store.journal
+        if journal is None:
+            # Backends without a journal can only persist by rewriting everything
+            return self.save_data(updated.frame)
+
+        try:
+            journal.append(changes)
+        except Exception as e:
+            logger.error(f"Failed to append to change journal: {str(e)}")
+            return False
+        self._publish(updated)
+
+        if len(journal) >= settings.orders_journal_compact_threshold:
+            self.compact()
+        return True
+
+    def compact(self) -> bool:
+        """
+        Folds the change journal into a fresh snapshot.
+
+        Returns:
+            Boolean indicating success
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return False
+            try:
+                self._store.save(self._snapshot.frame, source_signature=file_signature(self.data_path))
+                logger.info("Compacted planned orders journal into a new snapshot")
+                return True
+            except Exception as e:
+                logger.warning(f"Journal compaction failed, keeping the journal: {str(e)}")
+                return False
+
+    def get_orders_by_ids(self, planned_order_ids: List[str]) -> pd.DataFrame:
+        """
+        Get orders by planned_order_id through the id index
+        
+        Args:
+            planned_order_ids: Order IDs to look up; unknown IDs are skipped
+            
+        Returns:
+            DataFrame with the matching orders in file order
+        """
+        return self.snapshot().select_ids(planned_order_ids)
+
     def get_orders_by_date_range(self, start_date: str, end_date: str, 
                             date_column: str = 'suggested_due_date') -> pd.DataFrame:
         """
@@ -278,15 +460,19 @@ class DataService:
             Filtered DataFrame
         """
         try:
+            start_dt = pd.to_datetime(start_date)
+            end_dt = pd.to_datetime(end_date)
+
+            if date_column == 'suggested_due_date':
+                # Served from the sorted due date index
+                return self.snapshot().select_date_range(start_dt.date(), end_dt.date())
+
             df = self.load_data()
-            
             if date_column not in df.columns:
                 raise ValueError(f"Date column '{date_column}' not found")
             
             # Convert to datetime for comparison
             df[date_column] = pd.to_datetime(df[date_column])
-            start_dt = pd.to_datetime(start_date)
-            end_dt = pd.to_datetime(end_date)
             
             # Filter by date range
             filtered_df = df[
@@ -311,42 +497,43 @@ class DataService:
             DataFrame with rescheduling eligibility info
         """
         try:
-            df = self.load_data()
-            
-            if 'suggested_due_date' not in df.columns:
-                raise ValueError("suggested_due_date column not found")
-            
-            current_date = date.today()
-            df['suggested_due_date'] = pd.to_datetime(df['suggested_due_date'])
-            
-            # Calculate days from today
-            df['days_from_today'] = (df['suggested_due_date'].dt.date - current_date).dt.days
-            
-            # Add eligibility flags
-            df['can_prepone'] = df['days_from_today'] > min_days_ahead
-            df['can_postpone'] = True  # Can always postpone
-            df['max_prepone_days'] = df.apply(
-                lambda x: max(0, x['days_from_today'] - 1) if x['can_prepone'] else 0, 
-                axis=1
-            )
-            
-            # Add status
-            def get_status(days):
-                if days <= 0:
-                    return 'overdue_or_today'
-                elif days == 1:
-                    return 'tomorrow'
-                else:
-                    return 'future'
-            
-            df['reschedule_status'] = df['days_from_today'].apply(get_status)
-            
-            return df
+            return self.add_rescheduling_eligibility(self.load_data(), min_days_ahead)
             
         except Exception as e:
             logger.error(f"Failed to get reschedulable orders: {str(e)}")
             return pd.DataFrame()
 
+    def add_rescheduling_eligibility(self, df: pd.DataFrame, min_days_ahead: int = 1) -> pd.DataFrame:
+        """
+        Adds days_from_today, can_prepone, can_postpone, max_prepone_days and
+        reschedule_status in one vectorized pass over the due date column
+        
+        Args:
+            df: Planned orders with a datetime suggested_due_date column
+            min_days_ahead: Minimum days ahead to be eligible for preponing
+            
+        Returns:
+            New DataFrame with the eligibility columns added
+        """
+        if 'suggested_due_date' not in df.columns:
+            raise ValueError("suggested_due_date column not found")
+
+        today = np.datetime64(date.today(), 'D')
+        due = df['suggested_due_date'].to_numpy(dtype='datetime64[D]')
+        # Orders without a usable date fall back to 0 days
+        days = np.where(np.isnat(due), 0, (due - today).astype(np.int64))
+        can_prepone = days > min_days_ahead
+
+        out = df.copy(deep=False)
+        out['days_from_today'] = days
+        out['can_prepone'] = can_prepone
+        out['can_postpone'] = True  # Can always postpone
+        out['max_prepone_days'] = np.where(can_prepone, days - 1, 0)
+        out['reschedule_status'] = np.select(
+            [days <= 0, days == 1], ['overdue_or_today', 'tomorrow'], default='future'
+        )
+        return out
+
     def backup_data(self, backup_suffix: str = None) -> str:
         """
         Create a backup of the current data
@@ -358,13 +545,10 @@ class DataService:
             Path to backup file
         """
         try:
-            df = self.load_data()
-            
             if backup_suffix is None:
                 backup_suffix = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            backup_path = f"{self.data_path}.backup_{backup_suffix}"
-            df.to_csv(backup_path, index=False)
+            backup_path = self.export_csv(f"{self.data_path}.backup_{backup_suffix}")
             
             logger.info(f"Data backed up to {backup_path}")
             return backup_path
@@ -0,0 +1,74 @@
+# services/file_watcher.py
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+from services.order_store import file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """
+    Polls watched files for mtime/size changes on a background thread and
+    runs their reload callbacks there, off the request path. A change is only
+    reported once the file has stopped changing for one full interval, so a
+    writer that is still streaming the file out is never picked up halfway.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._watches: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, path: str, callback: Callable[[str], None]) -> None:
+        """Calls `callback(path)` whenever the file at `path` settles on new contents."""
+        with self._lock:
+            signature = file_signature(path)
+            self._watches[path] = {'callback': callback, 'seen': signature, 'pending': None}
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"File watcher started for {len(self._watches)} file(s), polling every {self.interval}s")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        logger.info("File watcher stopped")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.poll_once()
+
+    def poll_once(self) -> List[str]:
+        """Checks every watched file once and returns the paths whose callbacks ran."""
+        with self._lock:
+            watches = list(self._watches.items())
+
+        reloaded = []
+        for path, watch in watches:
+            signature = file_signature(path)
+            if signature is None or signature == watch['seen']:
+                watch['pending'] = None
+                continue
+            if signature != watch['pending']:
+                # Changed since the last poll; wait until it holds still
+                watch['pending'] = signature
+                continue
+
+            watch['seen'] = signature
+            watch['pending'] = None
+            try:
+                watch['callback'](path)
+                reloaded.append(path)
+            except Exception as e:
+                logger.error(f"Reload callback for {path} failed: {e}", exc_info=True)
+        return reloaded
@@ -0,0 +1,202 @@
+# services/job_queue.py
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from utils.json_utils import json_default
+
+logger = logging.getLogger(__name__)
+
+# A handler runs one job: handler(payload, progress) -> results, where
+# progress(done, succeeded, failed) records how far it has got
+JobHandler = Callable[[Dict[str, Any], Callable[[int, int, int], None]], List[Dict[str, Any]]]
+
+JOB_COLUMNS = ('id', 'session_id', 'kind', 'status', 'total', 'done', 'succeeded', 'failed',
+               'error', 'created_at', 'started_at', 'finished_at')
+
+
+class JobQueue:
+    """
+    Durable queue of long-running jobs (plan executions) kept in a SQLite
+    file and processed by background worker threads. Jobs are picked up in
+    submission order; their status and progress counts can be read from any
+    thread while they run. Jobs that were running when the process stopped
+    are queued again on start; plan handlers consult the checkpoint log, so a
+    re-run only processes what had not completed.
+    """
+
+    def __init__(self, db_path: str, workers: int = 1, poll_interval: float = 1.0):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._local = threading.local()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite serializes the writers."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _init_db(self) -> None:
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                session_id TEXT,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                done INTEGER NOT NULL DEFAULT 0,
+                succeeded INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL,
+                results TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+            CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session_id, created_at);
+        """)
+
+    def register_handler(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    # ----- Lifecycle -----
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        interrupted = self._connection().execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'").rowcount
+        if interrupted:
+            logger.warning(f"Re-queued {interrupted} job(s) interrupted by a restart")
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job queue started with {self.workers} worker(s) on {self.db_path}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stops taking new jobs; a job already running finishes in the background."""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    # ----- Jobs -----
+
+    def submit(self, kind: str, payload: Dict[str, Any], total: int, session_id: Optional[str] = None) -> str:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job_id = uuid.uuid4().hex
+        self._connection().execute(
+            "INSERT INTO jobs (id, session_id, kind, status, total, payload, created_at) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, session_id, kind, total, json.dumps(payload, default=json_default), datetime.now().isoformat()))
+        with self._wakeup:
+            self._wakeup.notify()
+        logger.info(f"Queued {kind} job {job_id} with {total} item(s)")
+        return job_id
+
+    def get(self, job_id: str, include_results: bool = False) -> Optional[Dict[str, Any]]:
+        columns = JOB_COLUMNS + (('results',) if include_results else ())
+        row = self._connection().execute(f"SELECT {', '.join(columns)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if include_results:
+            job['results'] = json.loads(job['results']) if job['results'] else []
+        return job
+
+    def retry(self, job_id: str) -> bool:
+        """
+        Queues a finished job again, e.g. after some of its actions failed.
+        Returns False if the job does not exist or is still queued or running.
+        """
+        retried = self._connection().execute(
+            "UPDATE jobs SET status = 'queued', done = 0, succeeded = 0, failed = 0, results = NULL, error = NULL, "
+            "started_at = NULL, finished_at = NULL WHERE id = ? AND status IN ('completed', 'failed')", (job_id,)).rowcount
+        if retried:
+            with self._wakeup:
+                self._wakeup.notify()
+            logger.info(f"Re-queued job {job_id}")
+        return bool(retried)
+
+    def list_jobs(self, session_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+        params: tuple = ()
+        if session_id:
+            query += " WHERE session_id = ?"
+            params = (session_id,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        return [dict(row) for row in self._connection().execute(query, params + (limit,))]
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row is not None:
+                connection.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                                   (datetime.now().isoformat(), row['id']))
+            connection.execute('COMMIT')
+            return row
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error(f"Could not claim a job: {e}")
+                job = None
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            self._run(job)
+
+    def _run(self, job: sqlite3.Row) -> None:
+        job_id = job['id']
+        connection = self._connection()
+
+        def progress(done: int, succeeded: int, failed: int) -> None:
+            connection.execute("UPDATE jobs SET done = ?, succeeded = ?, failed = ? WHERE id = ?",
+                               (done, succeeded, failed, job_id))
+
+        try:
+            logger.info(f"Running {job['kind']} job {job_id}")
+            results = self._handlers[job['kind']](json.loads(job['payload']), progress)
+            succeeded = sum(1 for result in results if result.get('status') == 'success')
+            connection.execute(
+                "UPDATE jobs SET status = 'completed', done = ?, succeeded = ?, failed = ?, results = ?, finished_at = ? "
+                "WHERE id = ?",
+                (len(results), succeeded, len(results) - succeeded, json.dumps(results, default=json_default),
+                 datetime.now().isoformat(), job_id))
+            logger.info(f"Job {job_id} completed: {succeeded}/{len(results)} succeeded")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            connection.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                               (str(e), datetime.now().isoformat(), job_id))
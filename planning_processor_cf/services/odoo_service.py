@@ -1,54 +1,367 @@
 # services/odoo_service.py
+import threading
 import xmlrpc.client
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import List, Dict, Any, Callable, Iterator, Optional, Union
 from config.settings import settings
+from services.odoo_transport import OdooConnectionPool
+from services.reference_cache import ReferenceCache, MISSING
 from utils.exceptions import OdooConnectionError, OdooOperationError
 import logging
 
 logger = logging.getLogger(__name__)
 
+def searchable_values(values: List[Any]) -> List[Any]:
+    """Distinct values that can go in an 'in' domain: XML-RPC cannot marshal None and NaN matches nothing."""
+    return [value for value in dict.fromkeys(values)
+            if value is not None and value is not False and value != '' and not pd.isna(value)]
+
 class OdooService:
+    # (model, field) lookups that go through the reference cache
+    CACHED_LOOKUPS = {
+        ('product.product', 'default_code'),
+        ('res.partner', 'name'),
+        ('uom.uom', 'name'),
+        ('mrp.bom', 'product_tmpl_id'),
+    }
+
+    # Order type label and schedule date field of each order model
+    ORDER_MODELS = {
+        'mrp.production': ('Manufacture', 'date_start'),
+        'purchase.order': ('Buy', 'date_planned'),
+    }
+
+    # Methods after which cached order lookups for the model may be stale
+    ORDER_WRITE_METHODS = {'create', 'write', 'unlink', 'button_confirm', 'action_confirm', 'button_cancel', 'action_cancel'}
+
     def __init__(self):
-        self._common = None
         self._uid = None
-        self._models = None
+        self._pool: Optional[OdooConnectionPool] = None
         self._connected = False
+        self._connect_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.reference_cache = ReferenceCache(max_entries=settings.odoo_reference_cache_size,
+                                              ttl=settings.odoo_reference_cache_ttl,
+                                              negative_ttl=settings.odoo_reference_negative_ttl)
+        # planned_order_id -> order records; short-lived because other clients write to Odoo too
+        order_cache_ttl = self.order_cache_ttl()
+        self.order_cache = ReferenceCache(max_entries=settings.odoo_order_cache_size,
+                                          ttl=order_cache_ttl,
+                                          negative_ttl=order_cache_ttl)
+        self._order_writes = 0
+        # Guards _order_writes; RPCs run on several threads at once
+        self._order_writes_lock = threading.Lock()
+
+    @staticmethod
+    def order_cache_ttl() -> float:
+        """
+        The order cache lives in this process only and write invalidation
+        only reaches this process's copy. With several API workers another
+        worker's writes stay invisible until entries expire, so the TTL is
+        capped at odoo_order_cache_multiprocess_ttl.
+        """
+        ttl = settings.odoo_order_cache_ttl
+        if settings.web_concurrency > 1 and ttl > 0:
+            ttl = min(ttl, settings.odoo_order_cache_multiprocess_ttl)
+        return ttl
 
     def connect(self):
         if self._connected:
             return
+        with self._connect_lock:
+            if self._connected:
+                return
+            pool = OdooConnectionPool(settings.odoo_url, size=settings.odoo_pool_size,
+                                      timeout=settings.odoo_timeout,
+                                      health_check_interval=settings.odoo_health_check_interval)
+            try:
+                with pool.proxy('common') as common:
+                    common.version()
+                    self._uid = common.authenticate(settings.odoo_db, settings.odoo_username, settings.odoo_password, {})
+                if not self._uid:
+                    raise OdooConnectionError("Odoo authentication failed")
+                self._pool = pool
+                self._connected = True
+                logger.info(f"Odoo connection established successfully (pool size {pool.size})")
+            except Exception as e:
+                pool.close()
+                raise OdooConnectionError(f"Failed to connect to Odoo: {str(e)}")
+
+    def close(self):
+        """Closes pooled connections; the next call reconnects."""
+        with self._connect_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            if self._pool:
+                self._pool.close()
+            self._pool = None
+            self._connected = False
+
+    def run_concurrently(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """
+        Runs independent Odoo calls (typically reads on different models) on a
+        bounded thread pool and returns their results in call order. The first
+        failing call's exception is raised.
+        """
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        if self._executor is None:
+            with self._connect_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=settings.odoo_pool_size,
+                                                        thread_name_prefix="odoo-read")
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def health_check(self) -> bool:
+        """Round-trips `version` over a pooled connection."""
         try:
-            self._common = xmlrpc.client.ServerProxy(f'{settings.odoo_url}/xmlrpc/2/common')
-            self._common.version()
-            self._uid = self._common.authenticate(settings.odoo_db, settings.odoo_username, settings.odoo_password, {})
-            if not self._uid:
-                raise OdooConnectionError("Odoo authentication failed")
-            self._models = xmlrpc.client.ServerProxy(f'{settings.odoo_url}/xmlrpc/2/object')
-            self._connected = True
-            logger.info("Odoo connection established successfully")
+            if not self._connected:
+                self.connect()
+            with self._pool.proxy('common') as common:
+                common.version()
+            return True
         except Exception as e:
-            raise OdooConnectionError(f"Failed to connect to Odoo: {str(e)}")
+            logger.warning(f"Odoo health check failed: {e}")
+            return False
 
     def execute_method(self, model_name: str, method_name: str, *args, **kwargs) -> Any:
+        """Runs execute_kw on a pooled connection; safe to call from several threads at once."""
         if not self._connected:
             self.connect()
         try:
-            return self._models.execute_kw(
-                settings.odoo_db, self._uid, settings.odoo_password,
-                model_name, method_name, list(args), kwargs
-            )
+            with self._pool.proxy('object') as models:
+                return models.execute_kw(
+                    settings.odoo_db, self._uid, settings.odoo_password,
+                    model_name, method_name, list(args), kwargs
+                )
         except xmlrpc.client.Fault as e:
             raise OdooOperationError(f"Odoo API error for {model_name}.{method_name}: {e.faultString}")
+        finally:
+            # Even a failed call may have been applied (e.g. a timeout), so always invalidate
+            if model_name in self.ORDER_MODELS and method_name in self.ORDER_WRITE_METHODS:
+                self._invalidate_order_cache(model_name, method_name, args)
+
+    def _invalidate_order_cache(self, model_name: str, method_name: str, args: tuple) -> None:
+        with self._order_writes_lock:
+            self._order_writes += 1
+        if not args:
+            return
+        if method_name == 'create':
+            vals_list = args[0] if isinstance(args[0], list) else [args[0]]
+            planned_order_ids = {vals.get('x_studio_planned_order_id') for vals in vals_list if isinstance(vals, dict)}
+            self.order_cache.invalidate_where(
+                lambda key, _: key[1] == model_name and key[2] in planned_order_ids)
+        else:
+            record_ids = set(args[0]) if isinstance(args[0], list) else {args[0]}
+            self.order_cache.invalidate_where(
+                lambda key, orders: key[1] == model_name and any(order.get('id') in record_ids for order in orders))
+
+    def find_orders_by_planned_order_id(self, model_name: str, planned_order_id: str,
+                                        scope: Optional[str] = None) -> List[Dict]:
+        """
+        Read-through cached lookup of the MOs or POs for one planned order,
+        shaped like iter_orders. Entries expire after order_cache_ttl() and
+        are dropped whenever this process creates or writes orders of the
+        model; writes made by other worker processes are only seen once the
+        entry expires. With odoo_order_cache_scope set to "session", entries
+        are kept per `scope` (the session id) instead of being shared within
+        the process.
+        """
+        if settings.odoo_order_cache_scope != 'session':
+            scope = None
+        key = (scope, model_name, planned_order_id)
+        orders = self.order_cache.get(key)
+        if orders is MISSING:
+            writes_before = self._order_writes
+            orders = list(self.iter_orders(model_name, [['x_studio_planned_order_id', '=', planned_order_id]]))
+            # A write that overlapped the read may not be reflected in it. Checking
+            # and storing under the lock means any later write invalidates after the store
+            with self._order_writes_lock:
+                if self._order_writes == writes_before:
+                    self.order_cache.set(key, orders)
+        # Callers may annotate the records, so never hand out the cached dicts
+        return [dict(order) for order in orders]
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {'reference': self.reference_cache.stats(), 'orders': self.order_cache.stats()}
 
     def find_record_id(self, model_name: str, field_name: str, value: Any) -> Optional[int]:
+        cached = (model_name, field_name) in self.CACHED_LOOKUPS
+        if cached:
+            record_id = self.reference_cache.get((model_name, field_name, value))
+            if record_id is not MISSING:
+                return record_id
         ids = self.execute_method(model_name, 'search', [[field_name, '=', value]], limit=1)
-        return ids[0] if ids else None
+        record_id = ids[0] if ids else None
+        if cached:
+            self.reference_cache.set((model_name, field_name, value), record_id)
+        return record_id
 
     def search_and_read(self, model_name: str, domain: List, fields: List[str]) -> List[Dict]:
         logger.info(f"Searching '{model_name}' with domain {domain}")
         return self.execute_method(model_name, 'search_read', domain, fields=fields)
 
+    def iter_search_read(self, model_name: str, domain: List, fields: List[str],
+                         page_size: Optional[int] = None, order: str = 'id', limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yields search_read results one page at a time using server-side
+        limit/offset, so callers can stop early without pulling the whole
+        result set. Pages are ordered by `order` to keep offsets stable.
+        With `limit`, at most that many records are requested in total.
+        """
+        page_size = page_size or settings.odoo_page_size
+        logger.info(f"Searching '{model_name}' with domain {domain} in pages of {page_size}")
+        offset = 0
+        while limit is None or offset < limit:
+            size = page_size if limit is None else min(page_size, limit - offset)
+            page = self.execute_method(model_name, 'search_read', domain, fields=fields,
+                                       limit=size, offset=offset, order=order)
+            yield from page
+            if len(page) < size:
+                return
+            offset += size
+
+    @staticmethod
+    def date_window_domain(date_field: str, first_day: Optional[date], last_day: Optional[date]) -> List:
+        """Domain terms keeping records whose datetime field falls on first_day..last_day."""
+        domain = []
+        if first_day is not None:
+            domain.append([date_field, '>=', first_day.strftime('%Y-%m-%d 00:00:00')])
+        if last_day is not None:
+            domain.append([date_field, '<', (last_day + timedelta(days=1)).strftime('%Y-%m-%d 00:00:00')])
+        return domain
+
+    def iter_orders(self, model_name: str, domain: List, first_day: Optional[date] = None,
+                    last_day: Optional[date] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streams MOs or POs shaped like get_production_orders/get_purchase_orders,
+        with an optional schedule date window applied by Odoo and at most
+        `limit` records.
+        """
+        order_type, date_field = self.ORDER_MODELS[model_name]
+        domain = list(domain) + self.date_window_domain(date_field, first_day, last_day)
+        fields = ['display_name', 'x_studio_planned_order_id', date_field, 'state']
+        for order in self.iter_search_read(model_name, domain, fields, limit=limit):
+            order['type'] = order_type
+            order['schedule_date'] = order.get(date_field)
+            yield order
+
+    def find_record_ids(self, model_name: str, field_name: str, values: List[Any]) -> Dict[Any, int]:
+        """
+        Bulk find_record_id: maps each value that exists to its record id with
+        one search_read. Like find_record_id, the first record in the model's
+        default order wins when a value is not unique. Empty values (None,
+        False, NaN, '') are left out of the search and never found, so the
+        callers report them per order.
+        """
+        values = searchable_values(values)
+        found: Dict[Any, int] = {}
+        cached = (model_name, field_name) in self.CACHED_LOOKUPS
+        if cached:
+            misses = []
+            for value in values:
+                record_id = self.reference_cache.get((model_name, field_name, value))
+                if record_id is MISSING:
+                    misses.append(value)
+                elif record_id is not None:
+                    found[value] = record_id
+            values = misses
+        if not values:
+            return found
+
+        records = self.execute_method(model_name, 'search_read', [[field_name, 'in', values]], fields=[field_name])
+        fetched: Dict[Any, int] = {}
+        for record in records:
+            key = record[field_name]
+            if isinstance(key, list):
+                # Many2one fields read back as [id, display_name]
+                key = key[0]
+            fetched.setdefault(key, record['id'])
+        if cached:
+            self.reference_cache.set_many(((model_name, field_name, value), fetched.get(value)) for value in values)
+        found.update(fetched)
+        return found
+
+    def warm_reference_cache(self) -> Dict[str, int]:
+        """Preloads every product code and partner name with one search_read each."""
+        loaded = {}
+        for model_name, field_name in (('product.product', 'default_code'), ('res.partner', 'name')):
+            records = self.execute_method(model_name, 'search_read', [[field_name, '!=', False]], fields=[field_name])
+            entries: Dict[Any, int] = {}
+            for record in records:
+                entries.setdefault(record[field_name], record['id'])
+            self.reference_cache.set_many(((model_name, field_name, value), record_id)
+                                          for value, record_id in entries.items())
+            loaded[model_name] = len(entries)
+        logger.info(f"Warmed Odoo reference cache: {loaded}")
+        return loaded
+
+    def _create_and_confirm(self, model_name: str, vals_list: List[Dict], confirm_method: str) -> List[Union[int, Exception]]:
+        """
+        Creates records with one multi-record `create` and confirms them with
+        one call on the id list. If Odoo rejects a batch call (an
+        OdooOperationError, i.e. a Fault, so nothing was applied), that batch
+        is retried record by record so one bad order does not fail the others.
+        Any other error (connection lost, timeout) may have been applied
+        server-side, so it is not retried and fails the whole batch. A record
+        that was created but cannot be confirmed is unlinked; if that fails
+        too, its draft id is kept in the error. Returns the new id, or the
+        error, for each entry of `vals_list`.
+        """
+        outcomes: List[Union[int, Exception]] = []
+        batch_size = max(1, settings.odoo_batch_size)
+        for start in range(0, len(vals_list), batch_size):
+            batch = vals_list[start:start + batch_size]
+            try:
+                created: List[Union[int, Exception]] = list(self.execute_method(model_name, 'create', batch))
+            except OdooOperationError as e:
+                logger.warning(f"Batch create on {model_name} failed ({e}); creating records one by one")
+                created = []
+                for vals in batch:
+                    try:
+                        created.append(self.execute_method(model_name, 'create', vals))
+                    except Exception as record_error:
+                        created.append(record_error)
+            except Exception as e:
+                logger.error(f"Batch create on {model_name} failed ({e}); not retrying, it may have been applied")
+                outcomes.extend([e] * len(batch))
+                continue
+
+            record_ids = [record_id for record_id in created if not isinstance(record_id, Exception)]
+            try:
+                if record_ids:
+                    self.execute_method(model_name, confirm_method, record_ids)
+            except OdooOperationError as e:
+                logger.warning(f"Batch {confirm_method} on {model_name} failed ({e}); confirming one by one")
+                for i, record_id in enumerate(created):
+                    if isinstance(record_id, Exception):
+                        continue
+                    try:
+                        self.execute_method(model_name, confirm_method, [record_id])
+                    except Exception as record_error:
+                        created[i] = self._discard_draft(model_name, record_id, record_error)
+            except Exception as e:
+                logger.error(f"Batch {confirm_method} on {model_name} failed ({e}); state of {record_ids} unknown")
+                created = [record_id if isinstance(record_id, Exception) else OdooOperationError(
+                               f"{e} (record {model_name} {record_id} was created, confirmation state unknown)")
+                           for record_id in created]
+            outcomes.extend(created)
+        return outcomes
+
+    def _discard_draft(self, model_name: str, record_id: int, error: Exception) -> OdooOperationError:
+        """Unlinks a record left in draft by a failed confirm, so a retry creates it cleanly."""
+        try:
+            self.execute_method(model_name, 'unlink', [record_id])
+            logger.info(f"Removed draft {model_name} {record_id} after failed confirmation")
+            return OdooOperationError(f"{error} (draft {model_name} {record_id} removed)")
+        except Exception as unlink_error:
+            logger.error(f"Could not remove draft {model_name} {record_id}: {unlink_error}")
+            return OdooOperationError(f"{error} (draft {model_name} {record_id} left unconfirmed)")
+
     def get_production_orders(self, domain: List) -> List[Dict]:
         fields = ['display_name', 'x_studio_planned_order_id', 'date_start', 'state']
         orders = self.search_and_read('mrp.production', domain, fields)
@@ -95,6 +408,68 @@ class OdooService:
         except Exception as e:
             raise OdooOperationError(f"Failed to create PO: {str(e)}")
 
+    def create_purchase_orders(self, orders: List[Dict]) -> List[Union[Dict, OdooOperationError]]:
+        """
+        Bulk create_purchase_order. Products and suppliers are resolved with
+        one search_read each and POs are created and confirmed in batches.
+        Returns one entry per order, in order: the dict create_purchase_order
+        would have returned, or the OdooOperationError it would have raised.
+        """
+        results: List[Union[Dict, OdooOperationError, None]] = [None] * len(orders)
+        pending = []
+        for i, order_data in enumerate(orders):
+            supplier_name = order_data.get('supplier_name_for_odoo')
+            if not supplier_name or pd.isna(supplier_name):
+                results[i] = {"status": "failed", "message": f"Supplier name not found for {order_data.get('item_id')}"}
+            else:
+                pending.append(i)
+
+        try:
+            product_ids = self.find_record_ids('product.product', 'default_code', [orders[i].get('item_id') for i in pending])
+            supplier_ids = self.find_record_ids('res.partner', 'name', [orders[i]['supplier_name_for_odoo'] for i in pending])
+        except Exception as e:
+            error = OdooOperationError(f"Failed to create PO: {str(e)}")
+            for i in pending:
+                results[i] = error
+            return results
+
+        to_create = []
+        vals_list = []
+        for i in pending:
+            order_data = orders[i]
+            item_id = order_data.get('item_id')
+            supplier_name = order_data['supplier_name_for_odoo']
+            product_id = product_ids.get(item_id)
+            if not product_id:
+                results[i] = {"status": "failed", "message": f"Product '{item_id}' not found"}
+                continue
+            supplier_id = supplier_ids.get(supplier_name)
+            if not supplier_id:
+                results[i] = OdooOperationError(f"Failed to create PO: Supplier '{supplier_name}' not found")
+                continue
+            try:
+                vals_list.append({
+                    'partner_id': supplier_id,
+                    'date_planned': order_data.get('suggested_due_date'),
+                    'x_studio_planned_order_id': order_data['planned_order_id'],
+                    'order_line': [(0, 0, {
+                        'product_id': product_id,
+                        'product_qty': order_data.get('quantity'),
+                        'date_planned': order_data.get('suggested_due_date')
+                    })]
+                })
+                to_create.append(i)
+            except Exception as e:
+                results[i] = OdooOperationError(f"Failed to create PO: {str(e)}")
+
+        for i, po_id in zip(to_create, self._create_and_confirm('purchase.order', vals_list, 'button_confirm')):
+            if isinstance(po_id, Exception):
+                results[i] = OdooOperationError(f"Failed to create PO: {str(po_id)}")
+            else:
+                results[i] = {"status": "success", "odoo_id": po_id, "message": f"PO {po_id} created",
+                              "supplier_name": orders[i]['supplier_name_for_odoo']}
+        return results
+
     def create_manufacturing_order(self, order_data: Dict) -> Dict:
         try:
             item_id = order_data.get('item_id')
@@ -103,8 +478,8 @@ class OdooService:
 
             product_info = self.execute_method('product.product', 'read', [product_id], ['product_tmpl_id'])
             product_tmpl_id = product_info[0]['product_tmpl_id'][0]
-            bom_ids = self.execute_method('mrp.bom', 'search', [['product_tmpl_id', '=', product_tmpl_id]], limit=1)
-            if not bom_ids: return {"status": "failed", "message": f"BOM not found for {item_id}"}
+            bom_id = self.find_record_id('mrp.bom', 'product_tmpl_id', product_tmpl_id)
+            if not bom_id: return {"status": "failed", "message": f"BOM not found for {item_id}"}
 
             uom_id = self.find_record_id('uom.uom', 'name', 'Units')
             if not uom_id: return {"status": "failed", "message": "UoM 'Units' not found"}
@@ -113,7 +488,7 @@ class OdooService:
                 'product_id': product_id,
                 'product_qty': order_data.get('quantity'),
                 'date_start': order_data.get('suggested_due_date'),
-                'bom_id': bom_ids[0],
+                'bom_id': bom_id,
                 'product_uom_id': uom_id,
                 'x_studio_planned_order_id': order_data['planned_order_id']
             }
@@ -123,13 +498,82 @@ class OdooService:
         except Exception as e:
             raise OdooOperationError(f"Failed to create MO: {str(e)}")
     
+    def create_manufacturing_orders(self, orders: List[Dict]) -> List[Union[Dict, OdooOperationError]]:
+        """
+        Bulk create_manufacturing_order. Products (with their templates) and
+        BOMs are resolved with one search_read each, the 'Units' UoM once for
+        the whole batch, and MOs are created and confirmed in batches.
+        Returns one entry per order, in order: the dict
+        create_manufacturing_order would have returned, or the
+        OdooOperationError it would have raised.
+        """
+        results: List[Union[Dict, OdooOperationError, None]] = [None] * len(orders)
+        if not orders:
+            return results
+        try:
+            item_ids = searchable_values([order_data.get('item_id') for order_data in orders])
+            products: Dict[Any, Dict] = {}
+            records = self.execute_method('product.product', 'search_read', [['default_code', 'in', item_ids]],
+                                          fields=['default_code', 'product_tmpl_id']) if item_ids else []
+            for record in records:
+                products.setdefault(record['default_code'], record)
+            self.reference_cache.set_many(
+                (('product.product', 'default_code', item_id), products[item_id]['id'] if item_id in products else None)
+                for item_id in item_ids
+            )
+
+            template_ids = list({record['product_tmpl_id'][0] for record in products.values()})
+            bom_ids = self.find_record_ids('mrp.bom', 'product_tmpl_id', template_ids)
+
+            uom_id = self.find_record_id('uom.uom', 'name', 'Units')
+        except Exception as e:
+            error = OdooOperationError(f"Failed to create MO: {str(e)}")
+            return [error] * len(orders)
+
+        to_create = []
+        vals_list = []
+        for i, order_data in enumerate(orders):
+            item_id = order_data.get('item_id')
+            product = products.get(item_id)
+            if not product:
+                results[i] = {"status": "failed", "message": f"Product '{item_id}' not found"}
+                continue
+            bom_id = bom_ids.get(product['product_tmpl_id'][0])
+            if not bom_id:
+                results[i] = {"status": "failed", "message": f"BOM not found for {item_id}"}
+                continue
+            if not uom_id:
+                results[i] = {"status": "failed", "message": "UoM 'Units' not found"}
+                continue
+            try:
+                vals_list.append({
+                    'product_id': product['id'],
+                    'product_qty': order_data.get('quantity'),
+                    'date_start': order_data.get('suggested_due_date'),
+                    'bom_id': bom_id,
+                    'product_uom_id': uom_id,
+                    'x_studio_planned_order_id': order_data['planned_order_id']
+                })
+                to_create.append(i)
+            except Exception as e:
+                results[i] = OdooOperationError(f"Failed to create MO: {str(e)}")
+
+        for i, mo_id in zip(to_create, self._create_and_confirm('mrp.production', vals_list, 'action_confirm')):
+            if isinstance(mo_id, Exception):
+                results[i] = OdooOperationError(f"Failed to create MO: {str(mo_id)}")
+            else:
+                results[i] = {"status": "success", "odoo_id": mo_id, "message": f"MO {mo_id} created"}
+        return results
+
     def create_supplier(self, supplier_name: str) -> Dict[str, Any]:
         """
         Creates a new supplier (vendor) in Odoo.
         """
         try:
             logger.info(f"Attempting to create new supplier in Odoo: '{supplier_name}'")
-            # Check if supplier already exists to prevent duplicates
+            # Check if supplier already exists to prevent duplicates; a cached
+            # "not found" may be stale, so always ask Odoo here
+            self.reference_cache.invalidate(('res.partner', 'name', supplier_name))
             existing_id = self.find_record_id('res.partner', 'name', supplier_name)
             if existing_id:
                 logger.warning(f"Supplier '{supplier_name}' already exists with ID {existing_id}. Skipping creation.")
@@ -141,6 +585,7 @@ class OdooService:
                 [{'name': supplier_name, 'is_company': True}]
             )
             if partner_id:
+                self.reference_cache.invalidate(('res.partner', 'name', supplier_name))
                 logger.info(f"Successfully created supplier '{supplier_name}' with ID {partner_id}.")
                 return {"status": "success", "supplier_id": partner_id, "supplier_name": supplier_name}
             else:
@@ -149,26 +594,28 @@ class OdooService:
             logger.error(f"Failed to create supplier '{supplier_name}' in Odoo: {e}", exc_info=True)
             raise OdooOperationError(f"Failed to create supplier '{supplier_name}': {str(e)}")
         
-    def update_production_order(self, order_id: int, values: dict) -> bool:
+    def update_production_order(self, order_id: Union[int, List[int]], values: dict) -> bool:
         """
-        Updates an existing manufacturing order in Odoo.
+        Updates an existing manufacturing order (or a list of them) in Odoo.
         """
         try:
             logger.info(f"Updating Manufacturing Order ID {order_id} with values: {values}")
             # The 'write' method is used for updates. It takes a list of IDs and a dictionary of values.
-            return self.execute_method('mrp.production', 'write', [order_id], values)
+            order_ids = order_id if isinstance(order_id, list) else [order_id]
+            return self.execute_method('mrp.production', 'write', order_ids, values)
         except Exception as e:
             logger.error(f"Failed to update Manufacturing Order ID {order_id}: {e}")
             raise OdooOperationError(f"Failed to update Manufacturing Order: {str(e)}")
 
-    def update_purchase_order(self, order_id: int, values: dict) -> bool:
+    def update_purchase_order(self, order_id: Union[int, List[int]], values: dict) -> bool:
         """
-        Updates an existing purchase order in Odoo.
+        Updates an existing purchase order (or a list of them) in Odoo.
         """
         try:
             logger.info(f"Updating Purchase Order ID {order_id} with values: {values}")
             # The 'write' method is used for updates.
-            return self.execute_method('purchase.order', 'write', [order_id], values)
+            order_ids = order_id if isinstance(order_id, list) else [order_id]
+            return self.execute_method('purchase.order', 'write', order_ids, values)
         except Exception as e:
             logger.error(f"Failed to update Purchase Order ID {order_id}: {e}")
             raise OdooOperationError(f"Failed to update Purchase Order: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,133 @@
+# services/odoo_transport.py
+import queue
+import threading
+import time
+import xmlrpc.client
+import logging
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from utils.exceptions import OdooConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """
+    xmlrpc Transport that applies a socket timeout. The stdlib transport
+    already keeps its HTTP/1.1 connection open between requests; it is just
+    not safe to share between threads, which is what the pool is for.
+    """
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class SafeKeepAliveTransport(xmlrpc.client.SafeTransport):
+    """HTTPS variant of KeepAliveTransport; the TLS session is reused across calls."""
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class OdooConnectionPool:
+    """
+    Fixed-size pool of keep-alive transports to one Odoo server. Each
+    transport is used by one thread at a time, so execute_kw calls can run in
+    parallel from worker threads without re-opening a connection per call.
+    Transports that sat idle longer than `health_check_interval` are pinged
+    before reuse, and any transport that hit a connection error is dropped.
+    """
+
+    def __init__(self, base_url: str, size: int = 8, timeout: float = 30.0,
+                 health_check_interval: float = 60.0):
+        self.base_url = base_url.rstrip('/')
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._secure = self.base_url.lower().startswith('https://')
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: "queue.LifoQueue[Tuple[float, xmlrpc.client.Transport]]" = queue.LifoQueue()
+        self._closed = False
+
+    def _new_transport(self) -> xmlrpc.client.Transport:
+        if self._secure:
+            return SafeKeepAliveTransport(self.timeout)
+        return KeepAliveTransport(self.timeout)
+
+    def _server_proxy(self, endpoint: str, transport: xmlrpc.client.Transport) -> xmlrpc.client.ServerProxy:
+        return xmlrpc.client.ServerProxy(f'{self.base_url}/xmlrpc/2/{endpoint}', transport=transport)
+
+    def _is_healthy(self, transport: xmlrpc.client.Transport) -> bool:
+        try:
+            self._server_proxy('common', transport).version()
+            return True
+        except Exception as e:
+            logger.info(f"Dropping stale Odoo connection: {e}")
+            return False
+
+    def _checkout(self) -> xmlrpc.client.Transport:
+        while True:
+            try:
+                last_used, transport = self._idle.get_nowait()
+            except queue.Empty:
+                return self._new_transport()
+            if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(transport):
+                return transport
+            transport.close()
+
+    @contextmanager
+    def proxy(self, endpoint: str = 'object') -> Iterator[xmlrpc.client.ServerProxy]:
+        """
+        Borrows a connection for the duration of the block and yields a
+        ServerProxy for `/xmlrpc/2/<endpoint>` bound to it.
+        """
+        if self._closed:
+            raise OdooConnectionError("Odoo connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OdooConnectionError(f"Timed out waiting for one of {self.size} Odoo connections")
+
+        transport = None
+        reusable = False
+        try:
+            transport = self._checkout()
+            yield self._server_proxy(endpoint, transport)
+            reusable = True
+        except xmlrpc.client.Fault:
+            # An application error; the connection itself is fine
+            reusable = True
+            raise
+        finally:
+            if transport is not None:
+                if reusable and not self._closed:
+                    self._idle.put((time.monotonic(), transport))
+                else:
+                    transport.close()
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {'size': self.size, 'idle': self._idle.qsize()}
+
+    def close(self) -> None:
+        """Closes idle connections; connections in use are closed when returned."""
+        self._closed = True
+        transports: List[xmlrpc.client.Transport] = []
+        while True:
+            try:
+                transports.append(self._idle.get_nowait()[1])
+            except queue.Empty:
+                break
+        for transport in transports:
+            transport.close()
@@ -0,0 +1,142 @@
+# services/order_snapshot.py
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def copy_on_write_enabled() -> bool:
+    """True when pandas copies shared column data on write (always from pandas 3)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def private_copy(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    A copy of `frame` whose changes cannot reach the original: zero-copy when
+    copy-on-write is on, a deep copy otherwise.
+    """
+    return frame.copy(deep=not copy_on_write_enabled())
+
+
+class DateIndex:
+    """Due dates sorted once so that date windows become two binary searches."""
+
+    def __init__(self, dates: np.ndarray):
+        self.order = np.argsort(dates, kind='stable')
+        self.sorted_dates = dates[self.order]
+        # NaT sorts last; windows never include it
+        self.valid_count = int(len(dates) - np.isnat(dates).sum())
+
+    def positions_between(self, start: Optional[date], end: Optional[date]) -> np.ndarray:
+        """Row positions with start <= due date <= end (either bound may be None), in date order."""
+        lo = 0
+        hi = self.valid_count
+        if start is not None:
+            lo = int(np.searchsorted(self.sorted_dates, np.datetime64(start, 'ns'), side='left'))
+        if end is not None:
+            hi = min(hi, int(np.searchsorted(self.sorted_dates, np.datetime64(end + timedelta(days=1), 'ns'), side='left')))
+        return self.order[lo:max(lo, hi)]
+
+
+class ItemTypeIndex:
+    """Case-insensitive categorical codes for item_type."""
+
+    def __init__(self, item_types: pd.Series):
+        codes, categories = pd.factorize(item_types.astype('string').str.lower())
+        self.codes = codes
+        self.lookup = {category: code for code, category in enumerate(categories)}
+
+    def mask(self, item_type: str) -> np.ndarray:
+        code = self.lookup.get(item_type.lower())
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+
+class OrderSnapshot:
+    """
+    One published version of the planned orders. The frame is shared by every
+    reader and must never be modified in place; writers derive a new frame and
+    publish it as the next version instead.
+    """
+
+    def __init__(self, frame: pd.DataFrame, version: int, generation: int,
+                 source_signature: Optional[List[float]] = None,
+                 positions: Optional[Dict[str, np.ndarray]] = None,
+                 item_type_index: Optional[ItemTypeIndex] = None):
+        self.frame = frame
+        self.version = version
+        self.generation = generation
+        self.source_signature = source_signature
+        self.created_at = time.time()
+        # Indexes are built on first use and reused by later versions when still valid
+        self._positions = positions
+        self._item_type_index = item_type_index
+        self._date_index: Optional[DateIndex] = None
+
+    @property
+    def etag(self) -> str:
+        """Cheap token that changes whenever the published orders change."""
+        return f"{self.generation:x}-{self.version}"
+
+    @property
+    def positions(self) -> Dict[str, np.ndarray]:
+        """Maps planned_order_id to the row positions holding it; a duplicated id maps to all of them."""
+        if self._positions is None:
+            self._positions = self.frame.groupby('planned_order_id', sort=False).indices
+        return self._positions
+
+    @property
+    def date_index(self) -> DateIndex:
+        if self._date_index is None:
+            self._date_index = DateIndex(self.frame['suggested_due_date'].to_numpy(dtype='datetime64[ns]'))
+        return self._date_index
+
+    @property
+    def item_type_index(self) -> ItemTypeIndex:
+        if self._item_type_index is None:
+            self._item_type_index = ItemTypeIndex(self.frame['item_type'])
+        return self._item_type_index
+
+    def positions_for_ids(self, planned_order_ids: Iterable[str]) -> np.ndarray:
+        """Row positions of the given ids that exist, in frame order."""
+        positions = self.positions
+        found = [positions[order_id] for order_id in set(planned_order_ids) if order_id in positions]
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def select_ids(self, planned_order_ids: Iterable[str]) -> pd.DataFrame:
+        """Orders with the given ids, looked up through the id index."""
+        return self.frame.take(self.positions_for_ids(planned_order_ids))
+
+    def select_date_range(self, start: Optional[date], end: Optional[date]) -> pd.DataFrame:
+        """Orders due between start and end inclusive, in file order."""
+        return self.frame.take(np.sort(self.date_index.positions_between(start, end)))
+
+    def filter_item_type(self, df: pd.DataFrame, item_type: str) -> pd.DataFrame:
+        """
+        Keeps the rows of `df` whose item_type matches case-insensitively.
+        `df` must be derived from this snapshot, since its index labels are
+        used as row positions into the item type codes.
+        """
+        mask = self.item_type_index.mask(item_type)
+        return df[mask[df.index.to_numpy()]]
+
+    def view(self) -> pd.DataFrame:
+        """
+        Returns a frame over the snapshot's columns that callers may modify
+        freely. It is zero-copy under pandas' copy-on-write and a deep copy
+        on older pandas without it.
+        """
+        return private_copy(self.frame)
+
+    def derive(self, frame: pd.DataFrame) -> "OrderSnapshot":
+        """
+        Builds the next version from a frame with the same rows in the same
+        order. Only due dates may differ, so the id and item type indexes carry over.
+        """
+        return OrderSnapshot(frame, self.version + 1, self.generation,
+                             self.source_signature, self._positions, self._item_type_index)
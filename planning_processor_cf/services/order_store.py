@@ -0,0 +1,261 @@
+# services/order_store.py
+import json
+import os
+import shutil
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.exceptions import DataLoadError
+
+logger = logging.getLogger(__name__)
+
+# String columns with at most this share of distinct values are dictionary-encoded on disk.
+CATEGORY_RATIO = 0.5
+
+
+def file_signature(path: str) -> Optional[List[float]]:
+    """Returns [mtime, size] for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime, stat.st_size]
+
+
+def to_csv_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the cleaned in-memory frame back to the planning CSV layout."""
+    out = df.drop(columns=['item_id'], errors='ignore')
+    out = out.rename(columns={'supplier_name_for_odoo': 'supplier'})
+    if 'suggested_due_date' in out.columns:
+        out['suggested_due_date'] = pd.to_datetime(out['suggested_due_date']).dt.strftime('%d-%m-%Y')
+    return out
+
+
+class ChangeJournal:
+    """
+    Append-only JSON-lines log of row-level changes made since the last
+    snapshot was written. Replaying it on top of the snapshot reproduces the
+    current state, so an update costs one appended line per changed row.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._count: Optional[int] = None
+
+    def append(self, changes: List[Dict[str, Any]]) -> None:
+        if not changes:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(change) + '\n' for change in changes))
+            f.flush()
+            os.fsync(f.fileno())
+        self._count = len(self) + len(changes)
+
+    def read(self) -> List[Dict[str, Any]]:
+        changes = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        changes.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A crash mid-append can leave a torn last line
+                        logger.warning(f"Skipping unreadable journal entry in {self.path}")
+        except FileNotFoundError:
+            pass
+        self._count = len(changes)
+        return changes
+
+    def reset(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._count = 0
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self.read()
+        return self._count
+
+
+class OrderStore(ABC):
+    """Persistence backend for the cleaned planned-orders frame."""
+
+    # Backends that support row-level writes expose a change journal
+    journal: Optional[ChangeJournal] = None
+
+    @abstractmethod
+    def load(self, source_signature: Optional[List[float]] = None) -> Optional[pd.DataFrame]:
+        """
+        Returns the stored frame, or None when there is nothing usable and the
+        caller has to import from CSV. A snapshot imported from a CSV whose
+        signature differs from `source_signature` counts as unusable.
+        """
+
+    @abstractmethod
+    def save(self, df: pd.DataFrame, source_signature: Optional[List[float]] = None) -> None:
+        """Persists the frame, recording the signature of the CSV it came from."""
+
+    def source_signature(self) -> Optional[List[float]]:
+        """Signature of the CSV the stored frame (and its journal) was imported from, if known."""
+        return None
+
+
+class CsvOrderStore(OrderStore):
+    """
+    Legacy backend: no snapshot, every load re-imports the CSV. The CSV is
+    the user's source file, so saving never rewrites it; changes stay in
+    memory until DataService.export_csv writes them out.
+    """
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+
+    def load(self, source_signature: Optional[List[float]] = None) -> Optional[pd.DataFrame]:
+        return None
+
+    def save(self, df: pd.DataFrame, source_signature: Optional[List[float]] = None) -> None:
+        pass
+
+
+class ColumnarOrderStore(OrderStore):
+    """
+    Stores the cleaned frame as one .npy file per column plus a schema.json,
+    and maps the files back in with numpy's mmap_mode so a cold load costs
+    no parsing. Each save goes to a fresh version directory and is published
+    by atomically replacing the CURRENT pointer file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.journal = ChangeJournal(os.path.join(directory, 'journal.jsonl'))
+
+    def _current_version_dir(self) -> Optional[str]:
+        pointer = os.path.join(self.directory, 'CURRENT')
+        try:
+            with open(pointer, 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        version_dir = os.path.join(self.directory, name)
+        return version_dir if os.path.isdir(version_dir) else None
+
+    def load(self, source_signature: Optional[List[float]] = None) -> Optional[pd.DataFrame]:
+        version_dir = self._current_version_dir()
+        if version_dir is None:
+            return None
+        try:
+            with open(os.path.join(version_dir, 'schema.json'), 'r', encoding='utf-8') as f:
+                schema = json.load(f)
+            if source_signature is not None and schema.get('source_signature') != source_signature:
+                logger.info("Columnar snapshot is older than the planning CSV; re-importing.")
+                return None
+
+            columns: Dict[str, Any] = {}
+            for spec in schema['columns']:
+                columns[spec['name']] = self._read_column(version_dir, spec)
+            df = pd.DataFrame(columns, index=pd.RangeIndex(schema['rows']))
+            logger.info(f"Loaded {len(df)} planned orders from columnar snapshot {version_dir}")
+            return df
+        except Exception as e:
+            logger.warning(f"Could not read columnar snapshot at {version_dir}: {e}")
+            return None
+
+    def source_signature(self) -> Optional[List[float]]:
+        version_dir = self._current_version_dir()
+        if version_dir is None:
+            return None
+        try:
+            with open(os.path.join(version_dir, 'schema.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('source_signature')
+        except Exception:
+            return None
+
+    def _read_column(self, version_dir: str, spec: Dict[str, Any]) -> Any:
+        values = np.load(os.path.join(version_dir, spec['file']), mmap_mode='r')
+        kind = spec['kind']
+        if kind == 'category':
+            categories = np.array(spec['categories'] + [None], dtype=object)
+            # Code -1 marks a null and picks the trailing None.
+            return categories[np.asarray(values)]
+        if kind == 'string':
+            decoded = np.asarray(values).astype(object)
+            if spec.get('null_file'):
+                decoded[np.load(os.path.join(version_dir, spec['null_file']))] = None
+            return decoded
+        return values
+
+    def save(self, df: pd.DataFrame, source_signature: Optional[List[float]] = None) -> None:
+        """Writes a full snapshot; this is also how the journal gets compacted."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"v{time.time_ns()}"
+        version_dir = os.path.join(self.directory, name)
+        os.makedirs(version_dir)
+        try:
+            specs = [self._write_column(version_dir, i, col, df[col]) for i, col in enumerate(df.columns)]
+            schema = {'rows': len(df), 'columns': specs, 'source_signature': source_signature}
+            with open(os.path.join(version_dir, 'schema.json'), 'w', encoding='utf-8') as f:
+                json.dump(schema, f)
+
+            tmp_pointer = os.path.join(self.directory, f'CURRENT.{name}.tmp')
+            with open(tmp_pointer, 'w', encoding='utf-8') as f:
+                f.write(name)
+            os.replace(tmp_pointer, os.path.join(self.directory, 'CURRENT'))
+        except Exception as e:
+            shutil.rmtree(version_dir, ignore_errors=True)
+            raise DataLoadError(f"Failed to write columnar snapshot: {str(e)}")
+
+        # The new snapshot already contains every journaled change
+        self.journal.reset()
+
+        self._remove_old_versions(keep=name)
+        logger.info(f"Wrote columnar snapshot of {len(df)} planned orders to {version_dir}")
+
+    def _write_column(self, version_dir: str, position: int, name: str, series: pd.Series) -> Dict[str, Any]:
+        file_name = f"c{position}.npy"
+        path = os.path.join(version_dir, file_name)
+
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            np.save(path, series.to_numpy(dtype='datetime64[ns]'))
+            return {'name': name, 'kind': 'datetime', 'file': file_name}
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            np.save(path, series.to_numpy())
+            return {'name': name, 'kind': 'numeric', 'file': file_name}
+
+        # Everything else is treated as text.
+        nulls = series.isna().to_numpy()
+        text = series.astype(object).where(~nulls, '').astype(str)
+        if len(series) and text[~nulls].nunique() <= CATEGORY_RATIO * len(series):
+            codes, categories = pd.factorize(series.astype(object).where(~nulls, None), use_na_sentinel=True)
+            np.save(path, codes.astype(np.int32))
+            return {'name': name, 'kind': 'category', 'file': file_name,
+                    'categories': [str(c) for c in categories]}
+
+        np.save(path, text.to_numpy(dtype=str))
+        spec = {'name': name, 'kind': 'string', 'file': file_name, 'null_file': None}
+        if nulls.any():
+            spec['null_file'] = f"c{position}.nulls.npy"
+            np.save(os.path.join(version_dir, spec['null_file']), nulls)
+        return spec
+
+    def _remove_old_versions(self, keep: str) -> None:
+        for entry in os.listdir(self.directory):
+            if entry.startswith('v') and entry != keep:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+
+def create_order_store(backend: str, csv_path: str, snapshot_dir: str) -> OrderStore:
+    """Builds the order store configured by `orders_store_backend`."""
+    backend = (backend or 'columnar').lower()
+    if backend == 'csv':
+        return CsvOrderStore(csv_path)
+    if backend == 'columnar':
+        return ColumnarOrderStore(snapshot_dir)
+    raise DataLoadError(f"Unknown orders store backend: '{backend}'")
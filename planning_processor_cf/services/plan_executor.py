@@ -0,0 +1,83 @@
+# services/plan_executor.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError, wait
+from typing import Any, Callable, Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PlanExecutor:
+    """
+    Runs independent units of plan work (typically a batch of orders for one
+    Odoo model) on a bounded worker pool. Results come back in submission
+    order; a unit that raises yields its exception. `timeout` is a budget in
+    seconds per action: a unit of n actions that runs longer than n times
+    the budget yields a TimeoutError while the others carry on. A timed-out
+    unit cannot be interrupted, so its Odoo calls may still complete after
+    it has been reported.
+    """
+
+    # How often the waiting thread re-checks running units against the timeout
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, max_workers: int = 4, timeout: float = 120.0):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan-exec")
+        return self._pool
+
+    def run(self, units: List[Callable[[], Any]], sizes: Optional[List[int]] = None) -> List[Union[Any, Exception]]:
+        """Runs `units`, where sizes[i] is the number of actions in unit i (1 each by default)."""
+        if not units:
+            return []
+        sizes = sizes or [1] * len(units)
+        if len(units) == 1 and self.timeout <= 0:
+            try:
+                return [units[0]()]
+            except Exception as e:
+                return [e]
+
+        started: Dict[int, float] = {}
+
+        def timed(position: int, unit: Callable[[], Any]) -> Any:
+            started[position] = time.monotonic()
+            return unit()
+
+        executor = self._executor()
+        futures: Dict[Future, int] = {executor.submit(timed, i, unit): i for i, unit in enumerate(units)}
+        results: List[Union[Any, Exception, None]] = [None] * len(units)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self.POLL_INTERVAL if self.timeout > 0 else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+            if self.timeout <= 0:
+                continue
+            now = time.monotonic()
+            for future in list(pending):
+                position = futures[future]
+                limit = self.timeout * max(1, sizes[position])
+                if position in started and now - started[position] > limit:
+                    logger.warning(f"Plan unit {position + 1}/{len(units)} exceeded {limit:g}s; reporting it as timed out")
+                    results[position] = TimeoutError(f"No response within {limit:g}s")
+                    pending.discard(future)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
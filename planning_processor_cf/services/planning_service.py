@@ -1,10 +1,14 @@
 # services/planning_service.py
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
+from concurrent.futures import TimeoutError
 import pandas as pd
 from datetime import datetime, date
 from services.data_service import DataService
 from services.odoo_service import OdooService
-from utils.time_parser import TimeParser
+from services.plan_executor import PlanExecutor
+from services.checkpoint_log import CheckpointLog
+from config.settings import settings
+from utils.time_parser import get_time_parser
 from models.session_models import ActionPlan
 from utils.exceptions import PlanningError, OdooOperationError
 import logging
@@ -16,33 +20,38 @@ class PlanningService:
     def __init__(self, data_service: DataService, odoo_service: OdooService):
         self.data_service = data_service
         self.odoo_service = odoo_service
-        self.time_parser = TimeParser()
+        self.time_parser = get_time_parser()
+        self.executor = PlanExecutor(max_workers=settings.plan_execution_concurrency,
+                                     timeout=settings.plan_execution_timeout)
+        self.checkpoints = CheckpointLog(settings.plan_checkpoints_db_path,
+                                         retention_days=settings.plan_checkpoint_retention_days)
 
     ODOO_CUSTOM_FIELD_NAME = 'x_studio_planned_order_id'
 
     def create_plan(self, scenario: str, last_queried_ids: Optional[List[str]], **kwargs) -> ActionPlan:
         try:
-            df_enriched = self.data_service.load_data()
+            snapshot = self.data_service.snapshot()
             orders_to_action = pd.DataFrame()
 
             # --- THIS IS THE FIX ---
             # The service now correctly handles a list of IDs.
             if kwargs.get('planned_order_id_filter'):
                 id_filter = kwargs['planned_order_id_filter']
-                # Use .isin() for filtering with a list
-                orders_to_action = df_enriched[df_enriched['planned_order_id'].isin(id_filter)]
+                # Look the list up through the id index
+                orders_to_action = snapshot.select_ids(id_filter)
                 if orders_to_action.empty:
                     raise PlanningError(f"IDs '{id_filter}' not found in local file")
             # --- END OF FIX ---
             elif kwargs.get('use_last_query'):
                 if not last_queried_ids:
                     raise PlanningError("Cannot use last query because no orders are in memory.")
-                orders_to_action = df_enriched[df_enriched['planned_order_id'].isin(last_queried_ids)]
+                orders_to_action = snapshot.select_ids(last_queried_ids)
                 orders_to_action['planned_order_id'] = pd.Categorical(orders_to_action['planned_order_id'], categories=last_queried_ids, ordered=True)
                 orders_to_action = orders_to_action.sort_values('planned_order_id')
             elif scenario == "firm_release" and kwargs.get('time_description'):
                 orders_to_action = self.time_parser.filter_dataframe_by_time(
-                    df_enriched, kwargs['time_description'], date_column='suggested_due_date'
+                    snapshot.view(), kwargs['time_description'], date_column='suggested_due_date',
+                    date_index=snapshot.date_index
                 )
             else:
                 raise PlanningError("To create a plan, you must provide a time description, specific order IDs, or use the last query.")
@@ -50,7 +59,7 @@ class PlanningService:
             if kwargs.get('item_type_filter'):
                 item_type = kwargs['item_type_filter'].lower()
                 if item_type in ['purchase', 'manufacture']:
-                     orders_to_action = orders_to_action[orders_to_action['item_type'].str.lower() == item_type]
+                     orders_to_action = snapshot.filter_item_type(orders_to_action, item_type)
 
             if orders_to_action.empty:
                 return ActionPlan(actions=[])
@@ -65,70 +74,172 @@ class PlanningService:
                     logger.warning(f"Invalid limit value received: '{limit}'. Ignoring limit.")
 
             orders_to_action = self._overwrite_supplier_from_rankings(orders_to_action)
-            actionable_orders = []
-            for _, row in orders_to_action.iterrows():
-                row_dict = row.to_dict()
-                row_dict['suggested_due_date'] = row['suggested_due_date'].strftime('%Y-%m-%d')
-                action_type = "reschedule" if scenario == "reschedule" else "create"
-                if action_type == "reschedule" and kwargs.get('reschedule_duration'):
-                    row_dict['user_defined_reschedule_days'] = self.time_parser.parse_duration_to_days(kwargs['reschedule_duration'])
-                actionable_orders.append({"action_type": action_type, "order_data": row_dict})
-            
-            return ActionPlan(actions=actionable_orders)
+            return self._build_plan(orders_to_action, scenario, kwargs.get('reschedule_duration'), snapshot.etag)
         except Exception as e:
             logger.error(f"Failed to create plan: {e}")
             raise PlanningError(f"Failed to create plan: {str(e)}")
 
-    def execute_plan(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        results = []
-        for action in actions:
-                order_data = action.get("order_data", {})
-                planned_order_id = order_data.get('planned_order_id', 'N/A')
-                try:
-                    action_type = action.get("action_type")
-                    if action_type == "create":
-                        if order_data.get("item_type") == "Manufacture":
-                            result = self.odoo_service.create_manufacturing_order(order_data)
-                        else: # Assumes anything else is a Purchase
-                            result = self.odoo_service.create_purchase_order(order_data)
-                    else:
-                        result = {"status": "skipped", "message": "Unknown action type"}
-                    results.append(result)
-                
-                except OdooOperationError as e:
-                    error_message = str(e)
-                    logger.warning(f"Odoo operation failed for {planned_order_id}: {error_message}")
-                    
-                    # Check for the specific "Supplier not found" error
-                    if "Supplier" in error_message and "not found" in error_message:
-                        # Use regex to safely extract the supplier name
-                        match = re.search(r"Supplier '(.*?)' not found", error_message)
-                        if match:
-                            supplier_name = match.group(1)
-                            # Return a structured response for the AI to handle
-                            results.append({
-                                "status": "requires_user_action",
-                                "action_type": "create_supplier_and_retry",
-                                "message": f"Supplier '{supplier_name}' not found. Proposing creation.",
-                                "data": {
-                                    "supplier_to_create": supplier_name,
-                                    "original_action": action
-                                }
-                            })
-                        else:
-                            # Fallback for unexpected error format
-                            results.append({"status": "error", "message": f"Failed for {planned_order_id}: {error_message}"})
-                    else:
-                        # Handle all other Odoo errors
-                        results.append({"status": "error", "message": f"Failed for {planned_order_id}: {error_message}"})
+    def _build_plan(self, orders: pd.DataFrame, scenario: str, reschedule_duration: Optional[str],
+                    snapshot_etag: Optional[str] = None) -> ActionPlan:
+        """
+        Turns the selected rows into a columnar plan with column operations:
+        due dates are formatted for the whole column and the reschedule
+        offset is parsed once per plan.
+        """
+        action_type = "reschedule" if scenario == "reschedule" else "create"
+        orders = orders.assign(suggested_due_date=orders['suggested_due_date'].dt.strftime('%Y-%m-%d'))
+        if action_type == "reschedule" and reschedule_duration:
+            orders = orders.assign(user_defined_reschedule_days=self.time_parser.parse_duration_to_days(reschedule_duration))
+        return ActionPlan.from_frame(action_type, orders, snapshot_etag=snapshot_etag)
 
-                except Exception as e:
-                    logger.error(f"Generic error executing action for {planned_order_id}: {e}", exc_info=True)
-                    results.append({
-                        "status": "error",
-                        "message": f"An unexpected error occurred for {planned_order_id}: {str(e)}"
-                    })
+    def execute_plan(self, actions: List[Dict[str, Any]], plan_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Executes plan actions in Odoo and returns one result per action, in
+        order. With a plan_id, actions that completed in an earlier run of the
+        same plan are not sent to Odoo again; their recorded result is
+        returned with "resumed": True.
+        """
+        results: List[Dict[str, Any]] = [{"status": "skipped", "message": "Unknown action type"} for _ in actions]
+        completed = self._completed_actions(plan_id, 'create', [
+            action.get("order_data", {}).get('planned_order_id') for action in actions if action.get("action_type") == "create"
+        ])
+
+        # Create actions are executed in bulk, one batch per Odoo model
+        manufacture_positions, purchase_positions = [], []
+        for i, action in enumerate(actions):
+            if action.get("action_type") == "create":
+                planned_order_id = action.get("order_data", {}).get('planned_order_id')
+                if planned_order_id is not None and str(planned_order_id) in completed:
+                    results[i] = dict(completed[str(planned_order_id)], resumed=True)
+                    continue
+                if action.get("order_data", {}).get("item_type") == "Manufacture":
+                    manufacture_positions.append(i)
+                else: # Assumes anything else is a Purchase
+                    purchase_positions.append(i)
+
+        # Batches are independent, so they run in parallel on the plan executor
+        chunks, units = [], []
+        for positions, create_orders in ((manufacture_positions, self.odoo_service.create_manufacturing_orders),
+                                         (purchase_positions, self.odoo_service.create_purchase_orders)):
+            for chunk in self._execution_chunks(positions):
+                orders = [actions[i].get("order_data", {}) for i in chunk]
+                chunks.append(chunk)
+                units.append(self._checkpointed_unit(create_orders, orders, plan_id))
+
+        for chunk, outcomes in zip(chunks, self.executor.run(units, [len(chunk) for chunk in chunks])):
+            if isinstance(outcomes, TimeoutError):
+                outcomes = [OdooOperationError(f"Timed out waiting for Odoo ({outcomes}); "
+                                               "check Odoo before retrying, the order may have been created")] * len(chunk)
+            elif isinstance(outcomes, Exception):
+                outcomes = [outcomes] * len(chunk)
+            for i, outcome in zip(chunk, outcomes):
+                if isinstance(outcome, Exception):
+                    results[i] = self._action_error_result(actions[i], outcome)
+                else:
+                    results[i] = outcome
         return results
+
+    def _checkpointed_unit(self, create_orders: Callable[[List[Dict]], List[Any]], orders: List[Dict],
+                           plan_id: Optional[str]) -> Callable[[], List[Any]]:
+        """
+        Wraps one create batch so its successes are recorded in the checkpoint
+        log as soon as the batch returns, even if the rest of the plan fails.
+        """
+        def unit() -> List[Any]:
+            outcomes = create_orders(orders)
+            self._record_completed(plan_id, 'create', [
+                (order_data.get('planned_order_id'), outcome) for order_data, outcome in zip(orders, outcomes)
+            ])
+            return outcomes
+        return unit
+
+    def _completed_actions(self, plan_id: Optional[str], action_type: str, planned_order_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+        if not plan_id:
+            return {}
+        try:
+            return self.checkpoints.completed(plan_id, action_type,
+                                              [pid for pid in planned_order_ids if pid is not None])
+        except Exception as e:
+            logger.warning(f"Could not read checkpoints for plan {plan_id}; executing every action: {e}")
+            return {}
+
+    def _record_completed(self, plan_id: Optional[str], action_type: str, outcomes: List[tuple]) -> None:
+        """Records the (planned_order_id, result) pairs whose result is a success."""
+        if not plan_id:
+            return
+        entries = [(planned_order_id, result) for planned_order_id, result in outcomes
+                   if planned_order_id is not None and isinstance(result, dict) and result.get('status') == 'success']
+        try:
+            self.checkpoints.record(plan_id, action_type, entries)
+        except Exception as e:
+            # The actions did succeed; only a re-run of this plan could repeat them
+            logger.error(f"Could not checkpoint {len(entries)} completed action(s) of plan {plan_id}: {e}")
+
+    def run_plan_job(self, payload: Dict[str, Any], progress: Callable[[int, int, int], None]) -> List[Dict[str, Any]]:
+        """Job queue handler for execute_plan; reports progress after every chunk of actions."""
+        plan_id = payload.get('plan_id')
+        actions = ActionPlan.model_validate(payload['plan']).actions if 'plan' in payload else payload.get('actions', [])
+        return self._run_in_chunks(actions, lambda chunk: self.execute_plan(chunk, plan_id=plan_id), progress)
+
+    def run_reschedule_job(self, payload: Dict[str, Any], progress: Callable[[int, int, int], None]) -> List[Dict[str, Any]]:
+        """Job queue handler for execute_reschedule_actions."""
+        plan_id = payload.get('plan_id')
+        return self._run_in_chunks(payload.get('valid_orders', []),
+                                   lambda actions: self.execute_reschedule_actions(actions, plan_id=plan_id), progress)
+
+    def _run_in_chunks(self, items: List[Dict[str, Any]], execute: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                       progress: Callable[[int, int, int], None]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        succeeded = 0
+        chunk_size = max(1, settings.job_progress_chunk_size)
+        for start in range(0, len(items), chunk_size):
+            chunk_results = execute(items[start:start + chunk_size])
+            results.extend(chunk_results)
+            succeeded += sum(1 for result in chunk_results if result.get('status') == 'success')
+            progress(len(results), succeeded, len(results) - succeeded)
+        return results
+
+    def _execution_chunks(self, positions: List[int]) -> List[List[int]]:
+        """
+        Splits one model's positions into batches small enough to spread over
+        the executor's workers, but no larger than an Odoo create batch.
+        """
+        if not positions:
+            return []
+        size = min(max(1, settings.odoo_batch_size), -(-len(positions) // self.executor.max_workers))
+        return [positions[start:start + size] for start in range(0, len(positions), size)]
+
+    def _action_error_result(self, action: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Turns an exception raised while executing `action` into its result entry."""
+        planned_order_id = action.get("order_data", {}).get('planned_order_id', 'N/A')
+        if isinstance(error, OdooOperationError):
+            error_message = str(error)
+            logger.warning(f"Odoo operation failed for {planned_order_id}: {error_message}")
+            
+            # Check for the specific "Supplier not found" error
+            if "Supplier" in error_message and "not found" in error_message:
+                # Use regex to safely extract the supplier name
+                match = re.search(r"Supplier '(.*?)' not found", error_message)
+                if match:
+                    supplier_name = match.group(1)
+                    # Return a structured response for the AI to handle
+                    return {
+                        "status": "requires_user_action",
+                        "action_type": "create_supplier_and_retry",
+                        "message": f"Supplier '{supplier_name}' not found. Proposing creation.",
+                        "data": {
+                            "supplier_to_create": supplier_name,
+                            "original_action": action
+                        }
+                    }
+            # Handle all other Odoo errors
+            return {"status": "error", "message": f"Failed for {planned_order_id}: {error_message}"}
+
+        logger.error(f"Generic error executing action for {planned_order_id}: {error}", exc_info=error)
+        return {
+            "status": "error",
+            "message": f"An unexpected error occurred for {planned_order_id}: {str(error)}"
+        }
     
     def create_supplier_and_retry_action(self, supplier_name: str, original_action: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -264,114 +375,167 @@ class PlanningService:
         Check if an order already exists in Odoo for the given planned order ID
         """
         try:
-            domain = [[self.ODOO_CUSTOM_FIELD_NAME, '=', planned_order_id]]
-            # Check production orders
-            production_orders = self.odoo_service.get_production_orders(domain=domain)
-            if production_orders:
-                production_orders[0]['item_type'] = 'Manufacture'
-                return production_orders[0]
-            
-            purchase_orders = self.odoo_service.get_purchase_orders(domain=domain)
-            if purchase_orders:
-                purchase_orders[0]['item_type'] = 'Purchase'
-                return purchase_orders[0]
-            
+            return self._find_existing_orders_in_odoo([planned_order_id]).get(planned_order_id)
+        except OdooOperationError as e:
+            logger.warning(str(e))
             return None
+
+    def _find_existing_orders_in_odoo(self, planned_order_ids: List[str]) -> Dict[str, dict]:
+        """
+        Looks up the Odoo orders for many planned order IDs with one search_read
+        per model, run in parallel. Manufacturing orders take precedence over
+        purchase orders, as in the per-ID check. Raises OdooOperationError if
+        the lookup fails, since an empty result would read as "not in Odoo".
+        """
+        existing: Dict[str, dict] = {}
+        planned_order_ids = list(dict.fromkeys(planned_order_ids))
+        if not planned_order_ids:
+            return existing
+        domain = [[self.ODOO_CUSTOM_FIELD_NAME, 'in', planned_order_ids]]
+        try:
+            # Both models are searched concurrently
+            production_orders, purchase_orders = self.odoo_service.run_concurrently([
+                lambda: self.odoo_service.get_production_orders(domain=domain),
+                lambda: self.odoo_service.get_purchase_orders(domain=domain),
+            ])
+            for orders, item_type in ((production_orders, 'Manufacture'), (purchase_orders, 'Purchase')):
+                for order in orders:
+                    planned_order_id = order.get(self.ODOO_CUSTOM_FIELD_NAME)
+                    if planned_order_id not in existing:
+                        order['item_type'] = item_type
+                        existing[planned_order_id] = order
+            return existing
         except Exception as e:
-            logger.warning(f"Could not check existing order in Odoo: {str(e)}")
-            return None
+            raise OdooOperationError(f"Could not check existing orders in Odoo: {str(e)}")
 
-    def execute_reschedule_actions(self, reschedule_actions: List[dict]) -> List[dict]:
+    def execute_reschedule_actions(self, reschedule_actions: List[dict], plan_id: Optional[str] = None) -> List[dict]:
         """
-        Execute reschedule actions in Odoo
+        Execute reschedule actions in Odoo. Existing orders are resolved with one
+        query per model and updated with one write per (model, new date) group.
         
         Args:
             reschedule_actions: List of reschedule action dictionaries
+            plan_id: Rescheduling plan id; actions it already completed are skipped
         
         Returns:
             List of execution results
         """
         try:
-            results = []
+            results: List[Optional[dict]] = [None] * len(reschedule_actions)
+            valid = []
+            completed = self._completed_actions(plan_id, 'reschedule',
+                                                [action.get('planned_order_id') for action in reschedule_actions])
             
-            for action in reschedule_actions:
+            for i, action in enumerate(reschedule_actions):
                 planned_order_id = action.get('planned_order_id')
                 new_due_date = action.get('new_due_date')
+                if planned_order_id is not None and str(planned_order_id) in completed:
+                    results[i] = dict(completed[str(planned_order_id)], resumed=True)
+                elif not planned_order_id or not new_due_date:
+                    results[i] = self._reschedule_failure(
+                        planned_order_id, PlanningError("Action is missing 'planned_order_id' or 'new_due_date'."))
+                else:
+                    valid.append((i, planned_order_id, new_due_date))
+
+            # The execution step performs its own check, which is more robust.
+            try:
+                existing_orders = self._find_existing_orders_in_odoo([planned_order_id for _, planned_order_id, _ in valid])
+            except OdooOperationError as e:
+                # Without the lookup we cannot tell which orders exist: fail them all and change nothing
+                for i, planned_order_id, _ in valid:
+                    results[i] = self._reschedule_failure(planned_order_id, e)
+                return results
+
+            groups: Dict[tuple, List[tuple]] = {}
+            for i, planned_order_id, new_due_date in valid:
+                existing_order = existing_orders.get(planned_order_id)
+                if existing_order:
+                    groups.setdefault((existing_order['item_type'], new_due_date), []).append((i, planned_order_id))
+                else:
+                    # If it does NOT exist, report it and do nothing in Odoo
+                    results[i] = {
+                        'planned_order_id': planned_order_id,
+                        'status': 'success',
+                        'message': f"Updated planned order due date to {new_due_date}",
+                        'note': 'Order not yet created in Odoo'
+                    }
+
+            for (item_type, new_due_date), members in groups.items():
+                # If it exists, UPDATE it (one write for the whole group)
+                order_ids = list(dict.fromkeys(existing_orders[planned_order_id]['id'] for _, planned_order_id in members))
                 try:
-                    if not planned_order_id or not new_due_date:
-                        raise PlanningError("Action is missing 'planned_order_id' or 'new_due_date'.")
-
-                    # The execution step performs its own check, which is more robust.
-                    existing_order = self._check_existing_order_in_odoo(planned_order_id)
-
-                    if existing_order:
-                        # If it exists, UPDATE it
-                        odoo_result = self._update_existing_order_date(
-                            order_id=existing_order['id'],
-                            new_date=new_due_date,
-                            item_type=existing_order['item_type']
-                        )
-                        results.append({
-                            'planned_order_id': planned_order_id,
-                            'status': 'success',
-                            'message': f"Updated existing Odoo order {existing_order.get('name', '')} to new date {new_due_date}",
-                            'odoo_result': odoo_result
-                        })
-                    else:
-                        # If it does NOT exist, report it and do nothing in Odoo
-                        results.append({
-                            'planned_order_id': planned_order_id,
-                            'status': 'success',
-                            'message': f"Updated planned order due date to {new_due_date}",
-                            'note': 'Order not yet created in Odoo'
-                        })
-
-                    # Always update the local data file to maintain consistency
-                    self._update_local_order_date(planned_order_id, new_due_date)
-
+                    odoo_result = self._update_existing_orders_date(order_ids, new_due_date, item_type)
                 except Exception as e:
-                    logger.error(f"Failed to execute reschedule for {planned_order_id}: {e}", exc_info=True)
-                    results.append({
+                    for i, planned_order_id in members:
+                        results[i] = self._reschedule_failure(planned_order_id, e)
+                    continue
+                for i, planned_order_id in members:
+                    results[i] = {
                         'planned_order_id': planned_order_id,
-                        'status': 'failed',
-                        'message': f"Failed to execute reschedule: {str(e)}"
-                    })
+                        'status': 'success',
+                        'message': f"Updated existing Odoo order {existing_orders[planned_order_id].get('name', '')} to new date {new_due_date}",
+                        'odoo_result': odoo_result
+                    }
+
+            # Always update the local data to maintain consistency, in one batch
+            local_updates = [
+                {'planned_order_id': planned_order_id, 'new_due_date': new_due_date}
+                for i, planned_order_id, new_due_date in valid
+                if results[i]['status'] == 'success'
+            ]
+            if local_updates:
+                local_result = self.data_service.bulk_update_due_dates(local_updates)
+                if local_result.get('failed'):
+                    logger.warning(f"{local_result['failed']} local due date update(s) failed: {local_result.get('failed_updates', local_result.get('error'))}")
+            self._record_completed(plan_id, 'reschedule', [(planned_order_id, results[i]) for i, planned_order_id, _ in valid])
             return results
 
             
         except Exception as e:
             raise PlanningError(f"Failed to execute reschedule actions: {str(e)}")
 
+    def _reschedule_failure(self, planned_order_id: Optional[str], error: Exception) -> dict:
+        logger.error(f"Failed to execute reschedule for {planned_order_id}: {error}", exc_info=error)
+        return {
+            'planned_order_id': planned_order_id,
+            'status': 'failed',
+            'message': f"Failed to execute reschedule: {str(error)}"
+        }
+
     def _update_existing_order_date(self, order_id: int, new_date: str, item_type: str) -> dict:
         """
         Update the due date of an existing order in Odoo
         """
+        return self._update_existing_orders_date([order_id], new_date, item_type)
+
+    def _update_existing_orders_date(self, order_ids: List[int], new_date: str, item_type: str) -> dict:
+        """
+        Update the due date of existing orders of one type in Odoo with a single write
+        """
         try:
             item_type_lower = item_type.lower()
             
-            print(f"DEBUG: Attempting to update Odoo order ID: {order_id}, Type: '{item_type_lower}', New Date: {new_date}")
+            logger.debug(f"Updating Odoo order IDs {order_ids}, Type: '{item_type_lower}', New Date: {new_date}")
 
             if item_type_lower == 'manufacture':
                 # The date field for manufacturing orders is 'date_planned_start'
                 values_to_update = {'date_start': new_date}
-                print(f"DEBUG: Calling update_production_order with values: {values_to_update}")
                 result = self.odoo_service.update_production_order(
-                    order_id=order_id,
+                    order_id=order_ids,
                     values=values_to_update
                 )
             elif item_type_lower == 'purchase':
                 # The date field for purchase orders is 'date_planned'
                 values_to_update = {'date_planned': new_date}
-                print(f"DEBUG: Calling update_purchase_order with values: {values_to_update}")
                 result = self.odoo_service.update_purchase_order(
-                    order_id=order_id,
+                    order_id=order_ids,
                     values=values_to_update
                 )
             else:
                 # This case should not be reached if the check is working
                 raise PlanningError(f"Unknown item_type '{item_type}' for Odoo update.")
             
-            print(f"DEBUG: Odoo API response for update: {result}")
+            logger.debug(f"Odoo API response for update: {result}")
             return result
             
         except Exception as e:
@@ -382,20 +546,8 @@ class PlanningService:
         Update the due date in local data storage
         """
         try:
-            # This is where you'd update your CSV file or database
-            # Implementation depends on your data storage mechanism
-            
-            df = self.data_service.load_data()
-            mask = df['planned_order_id'] == planned_order_id
-            
-            if mask.any():
-                df.loc[mask, 'suggested_due_date'] = new_due_date
-                # Save back to storage
-                self.data_service.save_data(df)
-                logger.info(f"Updated local data for order {planned_order_id} to {new_due_date}")
-            else:
-                logger.warning(f"Order {planned_order_id} not found in local data for update")
-                
+            if not self.data_service.update_order_due_date(planned_order_id, new_due_date):
+                logger.warning(f"Order {planned_order_id} not updated in local data")
         except Exception as e:
             logger.error(f"Failed to update local data: {str(e)}")
             # Don't raise exception here as this might be non-critical
@@ -0,0 +1,20 @@
+# test/conftest.py
+import os
+import sys
+
+# Settings are read at import time, so give the required ones harmless values
+for name, value in {
+    'GEMINI_API_KEY': 'test-key',
+    'ODOO_URL': 'http://127.0.0.1:8069',
+    'ODOO_DB': 'test',
+    'ODOO_USERNAME': 'test',
+    'ODOO_PASSWORD': 'test',
+    'MONGODB_URI': 'mongodb://127.0.0.1:27017',
+    'MONGODB_DB': 'test',
+}.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A manual check against a live MongoDB that runs on import, not a pytest test
+collect_ignore = ['test_db.py']
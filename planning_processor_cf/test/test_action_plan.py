@@ -0,0 +1,54 @@
+# test/test_action_plan.py
+import json
+
+import numpy as np
+import pandas as pd
+
+from models.session_models import ActionPlan
+
+
+def planned_orders():
+    return pd.DataFrame({
+        'planned_order_id': [101, 102, 103],
+        'item': ['[A1] Bolt', '[B2] Frame', '[C3] Nut'],
+        'item_id': ['A1', 'B2', 'C3'],
+        'item_type': ['Purchase', 'Manufacture', 'Purchase'],
+        'quantity': np.array([5, 10, 2], dtype='int64'),
+        'supplier_name_for_odoo': ['Acme', np.nan, None],
+        'suggested_due_date': ['2030-01-01', '2030-01-02', '2030-01-03'],
+        'reschedule_out_days': [1.5, 2.0, np.nan],
+    })
+
+
+def test_from_frame_keeps_execution_fields_only():
+    plan = ActionPlan.from_frame('create', planned_orders(), snapshot_etag='etag-1')
+
+    assert plan.planned_order_ids == ['101', '102', '103']
+    assert 'reschedule_out_days' not in plan.columns
+    assert plan.columns['supplier_name_for_odoo'] == ['Acme', None, None]
+    assert type(plan.columns['quantity'][0]) is int
+    assert plan.actions[1] == {
+        'action_type': 'create',
+        'order_data': {'item': '[B2] Frame', 'item_id': 'B2', 'item_type': 'Manufacture', 'quantity': 10,
+                       'supplier_name_for_odoo': None, 'suggested_due_date': '2030-01-02',
+                       'planned_order_id': '102'},
+    }
+
+
+def test_serialized_plan_validates_back():
+    plan = ActionPlan.from_frame('create', planned_orders(), snapshot_etag='etag-1')
+
+    # Job payloads and session storage go through strict JSON
+    payload = json.loads(json.dumps(plan.model_dump(mode='json'), allow_nan=False))
+    restored = ActionPlan.model_validate(payload)
+
+    assert restored.actions == plan.actions
+    assert restored.plan_id == plan.plan_id
+    assert restored.snapshot_etag == 'etag-1'
+
+
+def test_legacy_actions_argument():
+    plan = ActionPlan.from_frame('create', planned_orders())
+
+    assert ActionPlan(actions=plan.actions).actions == plan.actions
+    assert ActionPlan(actions=[]).action_count == 0
@@ -0,0 +1,59 @@
+# test/test_file_watcher.py
+import os
+
+from config.settings import settings
+from services.data_service import DataService
+from services.file_watcher import FileWatcher
+
+
+def touch(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_change_is_reported_once_after_it_settles(tmp_path):
+    path = tmp_path / 'orders.csv'
+    touch(path, 'a', 1000)
+    calls = []
+    watcher = FileWatcher(interval=0)
+    watcher.watch(str(path), calls.append)
+
+    assert watcher.poll_once() == []
+    touch(path, 'ab', 1001)
+    assert watcher.poll_once() == []  # changed, waiting for it to hold still
+    touch(path, 'abc', 1002)
+    assert watcher.poll_once() == []  # still changing
+    assert watcher.poll_once() == [str(path)]
+    assert [watcher.poll_once() for _ in range(5)] == [[]] * 5
+    assert calls == [str(path)]
+
+
+def test_reload_does_not_refire_the_watcher(tmp_path, monkeypatch):
+    csv = ("Order Type,Planned ID,Item,Item Type,Quantity,Supplier,Lead Time,Planned Date,suggested_due_date\n"
+           "PO,PLN-PO-0001,[COMP0001] Tires ,Purchase,80,AutoSteel Ltd.,18,29-08-2030,20-09-2030\n")
+    touch(tmp_path / 'planned_orders.csv', csv, 1000)
+    monkeypatch.setattr(settings, 'data_dir', str(tmp_path))
+    monkeypatch.setattr(settings, 'orders_file', 'planned_orders.csv')
+    monkeypatch.setattr(settings, 'supplier_rankings_path', str(tmp_path / 'rankings.csv'))
+    monkeypatch.setattr(settings, 'orders_snapshot_dir', str(tmp_path / 'snapshot'))
+
+    for backend in ('csv', 'columnar'):
+        monkeypatch.setattr(settings, 'orders_store_backend', backend)
+        service = DataService()
+        service.load_data()
+        reloads = []
+        reload_orders = service.reload_orders
+        monkeypatch.setattr(service, 'reload_orders', lambda path=None: reloads.append(path) or reload_orders(path))
+        watcher = FileWatcher(interval=0)
+        service.register_watches(watcher)
+
+        for _ in range(20):
+            watcher.poll_once()
+        assert reloads == []
+
+        touch(tmp_path / 'planned_orders.csv', csv + csv.splitlines()[1].replace('0001', '0002') + "\n", 2000)
+        for _ in range(20):
+            watcher.poll_once()
+        assert reloads == [str(tmp_path / 'planned_orders.csv')]
+        assert len(service.load_data()) == 2
+        touch(tmp_path / 'planned_orders.csv', csv, 1000)
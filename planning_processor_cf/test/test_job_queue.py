@@ -0,0 +1,98 @@
+# test/test_job_queue.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from services.job_queue import JobQueue
+
+
+def wait_for(queue, job_id, statuses=('completed', 'failed'), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id, include_results=True)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), workers=2, poll_interval=0.05)
+    yield queue
+    queue.stop()
+
+
+def test_submit_run_and_retry(queue):
+    attempts = []
+
+    def handler(payload, progress):
+        attempts.append(payload)
+        progress(1, 1, 0)
+        status = 'success' if len(attempts) > 1 else 'error'
+        return [{'status': 'success', 'odoo_id': np.int64(7)}, {'status': status}]
+    queue.register_handler('execute_plan', handler)
+    queue.start()
+
+    job_id = queue.submit('execute_plan', {'plan_id': 'p1', 'count': np.int64(2)}, total=2, session_id='s1')
+    job = wait_for(queue, job_id)
+    assert (job['status'], job['done'], job['succeeded'], job['failed']) == ('completed', 2, 1, 1)
+    assert job['results'][0] == {'status': 'success', 'odoo_id': 7}
+    assert attempts == [{'plan_id': 'p1', 'count': 2}]
+
+    assert queue.retry(job_id)
+    job = wait_for(queue, job_id)
+    assert (job['succeeded'], job['failed']) == (2, 0)
+    assert [job['id'] for job in queue.list_jobs(session_id='s1')] == [job_id]
+    assert queue.list_jobs(session_id='other') == []
+
+
+def test_handler_errors_fail_the_job(queue):
+    def handler(payload, progress):
+        raise RuntimeError("Odoo unreachable")
+    queue.register_handler('execute_plan', handler)
+    queue.start()
+
+    job = wait_for(queue, queue.submit('execute_plan', {}, total=1))
+    assert (job['status'], job['error']) == ('failed', 'Odoo unreachable')
+
+    with pytest.raises(ValueError):
+        queue.submit('unknown', {}, total=1)
+    assert not queue.retry('no-such-job')
+
+
+def test_each_job_is_claimed_once(queue):
+    runs = []
+    lock = threading.Lock()
+
+    def handler(payload, progress):
+        with lock:
+            runs.append(payload['n'])
+        return []
+    queue.register_handler('execute_plan', handler)
+    job_ids = [queue.submit('execute_plan', {'n': n}, total=0) for n in range(20)]
+    queue.start()
+
+    for job_id in job_ids:
+        wait_for(queue, job_id)
+    assert sorted(runs) == list(range(20))
+
+
+def test_interrupted_jobs_are_requeued_on_start(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    first = JobQueue(db_path)
+    first.register_handler('execute_plan', lambda payload, progress: [])
+    job_id = first.submit('execute_plan', {}, total=0)
+    # Simulate a process that died while running the job
+    assert first._claim()['id'] == job_id
+    assert first.get(job_id)['status'] == 'running'
+
+    restarted = JobQueue(db_path, poll_interval=0.05)
+    restarted.register_handler('execute_plan', lambda payload, progress: [{'status': 'success'}])
+    restarted.start()
+    try:
+        assert wait_for(restarted, job_id)['succeeded'] == 1
+    finally:
+        restarted.stop()
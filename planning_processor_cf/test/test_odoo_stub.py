@@ -0,0 +1,165 @@
+# test/test_odoo_stub.py
+import time
+import xmlrpc.client
+
+import pytest
+
+from config.settings import settings
+from devtools.odoo_stub_server import OdooStubStore, start_stub_server
+from services.odoo_service import OdooService
+
+
+@pytest.fixture
+def store():
+    store = OdooStubStore()
+    store.seed(products=20, partners=5, sale_orders=0)
+    return store
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Starts a stub server for a store and returns an OdooService pointed at it."""
+    servers, services = [], []
+
+    def serve(store, latency=0.0):
+        server, url = start_stub_server(store, latency=latency)
+        monkeypatch.setattr(settings, 'odoo_url', url)
+        monkeypatch.setattr(settings, 'odoo_batch_size', 3)
+        servers.append(server)
+        services.append(OdooService())
+        return services[-1]
+    yield serve
+    for service in services:
+        service.close()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def odoo(store, serve):
+    return serve(store)
+
+
+def test_search_sorts_mixed_and_empty_values(store):
+    for name in ('b', None, 'a', False, ''):
+        store.insert('mrp.production', {'x_studio_planned_order_id': name})
+    ids = [record['x_studio_planned_order_id'] for record in
+           store.execute_kw('db', 2, 'pw', 'mrp.production', 'search_read', [[]],
+                            {'fields': ['x_studio_planned_order_id'], 'order': 'x_studio_planned_order_id'})]
+    assert ids == ['', 'a', 'b', False, False]
+
+
+def test_create_orders_in_batches(odoo, store):
+    components = [record['default_code'] for record in store.models['product.product'].values()
+                  if record['default_code'].startswith('COMP')]
+    orders = [{'planned_order_id': f"PLN-PO-{i}", 'item_id': code, 'quantity': 5,
+               'supplier_name_for_odoo': 'Supplier 0001', 'suggested_due_date': '2030-01-01'}
+              for i, code in enumerate(components[:5])]
+    orders.append({'planned_order_id': 'PLN-PO-missing', 'item_id': None, 'quantity': 1,
+                   'supplier_name_for_odoo': 'Supplier 0001', 'suggested_due_date': '2030-01-01'})
+
+    results = odoo.create_purchase_orders(orders)
+
+    assert [result['status'] for result in results] == ['success'] * 5 + ['failed']
+    created = store.models['purchase.order']
+    assert {created[result['odoo_id']]['state'] for result in results[:5]} == {'purchase'}
+    assert store.calls[('purchase.order', 'create')] == 2
+
+
+class RejectingConfirmStore(OdooStubStore):
+    def execute_kw(self, db, uid, password, model, method, args=None, kwargs=None):
+        if method == 'action_confirm':
+            raise xmlrpc.client.Fault(1, 'Components are missing')
+        return super().execute_kw(db, uid, password, model, method, args, kwargs)
+
+
+def test_failed_confirm_removes_draft(serve):
+    store = RejectingConfirmStore()
+    store.seed(products=20, partners=5, sale_orders=0)
+    odoo = serve(store)
+    finished = next(record['default_code'] for record in store.models['product.product'].values()
+                    if record['default_code'].startswith('FG'))
+
+    results = odoo.create_manufacturing_orders([{'planned_order_id': 'PLN-MO-1', 'item_id': finished,
+                                                 'quantity': 2, 'suggested_due_date': '2030-01-01'}])
+
+    assert 'removed' in str(results[0])
+    assert not store.models['mrp.production']
+
+
+def test_iter_orders_respects_limit(odoo, store):
+    for i in range(7):
+        store.insert('mrp.production', {'x_studio_planned_order_id': f"PLN-MO-{i}", 'date_start': '2030-01-01 00:00:00'})
+
+    assert len(list(odoo.iter_orders('mrp.production', [], limit=4))) == 4
+    assert len(list(odoo.iter_orders('mrp.production', []))) == 7
+
+
+def test_order_query_reads_only_the_pages_it_returns(odoo, store, monkeypatch):
+    from tools.odoo_query_tool import OdooQueryTool
+
+    for i in range(30):
+        store.insert('mrp.production', {'x_studio_planned_order_id': f"PLN-MO-{i}", 'date_start': '2030-01-01 00:00:00'})
+        store.insert('purchase.order', {'x_studio_planned_order_id': f"PLN-PO-{i}", 'date_planned': '2030-01-01 00:00:00'})
+    monkeypatch.setattr(settings, 'odoo_page_size', 5)
+    monkeypatch.setattr(settings, 'odoo_query_max_records', 12)
+    store.calls.clear()
+
+    result = OdooQueryTool(odoo, session_manager=None).get_odoo_order_details('session-1')
+
+    assert result.count('PLN-MO-') == 12 and 'PLN-PO-' not in result
+    # Three MO pages to fill the cap, and only the first PO page (read up front)
+    assert store.calls[('mrp.production', 'search_read')] == 3
+    assert store.calls[('purchase.order', 'search_read')] == 1
+
+
+def test_order_cache_is_invalidated_by_writes(odoo, store):
+    mo_id = store.insert('mrp.production', {'x_studio_planned_order_id': 'PLN-MO-1', 'date_start': '2030-01-01 00:00:00'})
+    store.calls.clear()
+
+    assert len(odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-1')) == 1
+    assert odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-2') == []
+    odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-1')
+    odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-2')
+    assert store.calls[('mrp.production', 'search_read')] == 2
+
+    odoo.update_production_order(mo_id, {'date_start': '2030-02-01 00:00:00'})
+    assert odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-1')[0]['schedule_date'] == '2030-02-01 00:00:00'
+
+    # Creating an order for a cached "not found" id drops that entry too
+    odoo.execute_method('mrp.production', 'create', {'x_studio_planned_order_id': 'PLN-MO-2'})
+    assert len(odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-2')) == 1
+    assert store.calls[('mrp.production', 'search_read')] == 4
+
+
+def test_lookup_overlapping_a_write_is_not_cached(odoo, store, monkeypatch):
+    store.insert('mrp.production', {'x_studio_planned_order_id': 'PLN-MO-1'})
+    iter_orders = odoo.iter_orders
+
+    def write_during_read(*args, **kwargs):
+        orders = list(iter_orders(*args, **kwargs))
+        odoo.execute_method('mrp.production', 'write', [orders[0]['id']], {'state': 'done'})
+        return iter(orders)
+    monkeypatch.setattr(odoo, 'iter_orders', write_during_read)
+    odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-1')
+    monkeypatch.setattr(odoo, 'iter_orders', iter_orders)
+
+    assert odoo.find_orders_by_planned_order_id('mrp.production', 'PLN-MO-1')[0]['state'] == 'done'
+
+
+def test_reads_run_concurrently_in_call_order(store, serve):
+    odoo = serve(store, latency=0.3)
+    odoo.connect()
+
+    started = time.monotonic()
+    rows = odoo.run_concurrently([
+        lambda: odoo.search_and_read('product.product', [['default_code', '=', 'FG0001']], ['default_code']),
+        lambda: odoo.search_and_read('res.partner', [['name', '=', 'Supplier 0002']], ['name']),
+        lambda: odoo.search_and_read('uom.uom', [['name', '=', 'Units']], ['name']),
+    ])
+    elapsed = time.monotonic() - started
+
+    assert [rows[0][0]['default_code'], rows[1][0]['name'], rows[2][0]['name']] == ['FG0001', 'Supplier 0002', 'Units']
+    # Three 0.3s reads overlap instead of taking 0.9s
+    assert elapsed < 0.75
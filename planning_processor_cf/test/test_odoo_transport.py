@@ -0,0 +1,67 @@
+# test/test_odoo_transport.py
+import xmlrpc.client
+
+import pytest
+
+from devtools.odoo_stub_server import OdooStubStore, start_stub_server
+from services.odoo_transport import OdooConnectionPool
+from utils.exceptions import OdooConnectionError
+
+
+@pytest.fixture
+def url():
+    server, url = start_stub_server(OdooStubStore())
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def call(pool, *args):
+    with pool.proxy('object') as models:
+        return models.execute_kw('db', 2, 'pw', *args)
+
+
+def test_connections_are_reused(url):
+    pool = OdooConnectionPool(url, size=2, timeout=1)
+    with pool.proxy('common') as common:
+        first = common('transport')
+    with pool.proxy('common') as common:
+        assert common('transport') is first
+        common.version()
+    assert pool.stats() == {'size': 2, 'idle': 1}
+    pool.close()
+
+
+def test_fault_keeps_the_connection_but_a_network_error_drops_it(url):
+    pool = OdooConnectionPool(url, size=2, timeout=1)
+    with pytest.raises(xmlrpc.client.Fault):
+        call(pool, 'no.such.model', 'search', [[]])
+    assert pool.stats()['idle'] == 1
+
+    broken = OdooConnectionPool('http://127.0.0.1:9', size=2, timeout=1)
+    with pytest.raises(OSError):
+        call(broken, 'res.partner', 'search', [[]])
+    assert broken.stats()['idle'] == 0
+
+
+def test_pool_size_bounds_borrowed_connections(url):
+    pool = OdooConnectionPool(url, size=1, timeout=0.2)
+    with pool.proxy('common'):
+        with pytest.raises(OdooConnectionError):
+            with pool.proxy('common'):
+                pass
+    pool.close()
+    with pytest.raises(OdooConnectionError):
+        with pool.proxy('common'):
+            pass
+
+
+def test_idle_connections_are_health_checked(url):
+    pool = OdooConnectionPool(url, size=1, timeout=1, health_check_interval=0)
+    with pool.proxy('common') as common:
+        first = common('transport')
+    first.close()
+    pool._is_healthy = lambda transport: False
+
+    with pool.proxy('common') as common:
+        assert common('transport') is not first
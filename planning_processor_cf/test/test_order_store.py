@@ -0,0 +1,119 @@
+# test/test_order_store.py
+import pandas as pd
+import pytest
+
+from config.settings import settings
+from services.data_service import DataService
+
+CSV = """Order Type,Planned ID,Item,Item Type,Quantity,Supplier,Lead Time,Planned Date,suggested_due_date
+PO,PLN-PO-0001,[COMP0001] Tires ,Purchase,80,AutoSteel Ltd.,18,29-08-2030,20-09-2030
+MO,PLN-MO-0002,[FG0001] Car ,Manufacture,5,,10,29-08-2030,06-09-2030
+PO,PLN-PO-0003,[COMP0002] Seats ,Purchase,125,AutoSteel Ltd.,24,29-08-2030,13-09-2030
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / 'planned_orders.csv').write_text(CSV)
+    monkeypatch.setattr(settings, 'data_dir', str(tmp_path))
+    monkeypatch.setattr(settings, 'orders_file', 'planned_orders.csv')
+    monkeypatch.setattr(settings, 'orders_store_backend', 'columnar')
+    monkeypatch.setattr(settings, 'orders_snapshot_dir', str(tmp_path / 'snapshot'))
+    return tmp_path
+
+
+def due_dates(service):
+    frame = service.snapshot().frame
+    return dict(zip(frame['planned_order_id'], frame['suggested_due_date'].dt.strftime('%Y-%m-%d')))
+
+
+def test_journaled_updates_survive_a_restart(data_dir):
+    service = DataService()
+    result = service.bulk_update_due_dates([{'planned_order_id': 'PLN-MO-0002', 'new_due_date': '2030-10-01'},
+                                            {'planned_order_id': 'PLN-XX-9999', 'new_due_date': '2030-10-01'}])
+    assert (result['successful'], result['failed']) == (1, 1)
+
+    # A fresh service loads the stored snapshot and replays the journal
+    restarted = DataService()
+    assert due_dates(restarted)['PLN-MO-0002'] == '2030-10-01'
+    assert due_dates(restarted) == due_dates(service)
+
+    assert restarted.compact()
+    assert len(restarted._store.journal) == 0
+    assert due_dates(DataService()) == due_dates(service)
+
+
+def test_updates_do_not_change_earlier_snapshots(data_dir):
+    service = DataService()
+    before = service.snapshot()
+    view = service.load_data()
+    view.loc[:, 'quantity'] = 0
+
+    service.bulk_update_due_dates([{'planned_order_id': 'PLN-PO-0001', 'new_due_date': '2030-10-01'}])
+
+    assert before.frame['suggested_due_date'].iloc[0] == pd.Timestamp('2030-09-20')
+    assert before.frame['quantity'].tolist() == [80, 5, 125]
+    assert service.snapshot().version == before.version + 1
+    assert service.snapshot().etag != before.etag
+    assert due_dates(service)['PLN-PO-0001'] == '2030-10-01'
+
+
+def test_reload_orders_imports_the_given_path(data_dir):
+    service = DataService()
+    other = data_dir / 'other.csv'
+    other.write_text(CSV.replace('PLN-PO-0003', 'PLN-PO-0004'))
+
+    assert service.reload_orders(str(other))
+    assert set(service.snapshot().frame['planned_order_id']) == {'PLN-PO-0001', 'PLN-MO-0002', 'PLN-PO-0004'}
+
+
+def test_date_range_and_id_lookups_keep_file_order(data_dir):
+    service = DataService()
+
+    in_range = service.get_orders_by_date_range('2030-09-01', '2030-09-30')
+    assert in_range['planned_order_id'].tolist() == ['PLN-PO-0001', 'PLN-MO-0002', 'PLN-PO-0003']
+    assert service.get_orders_by_date_range('2030-09-10', '2030-09-30')['planned_order_id'].tolist() == \
+        ['PLN-PO-0001', 'PLN-PO-0003']
+    assert service.get_orders_by_ids(['PLN-PO-0003', 'PLN-PO-0001'])['planned_order_id'].tolist() == \
+        ['PLN-PO-0001', 'PLN-PO-0003']
+
+
+def test_csv_backend_never_rewrites_the_source(data_dir, monkeypatch):
+    monkeypatch.setattr(settings, 'orders_store_backend', 'csv')
+    source = data_dir / 'planned_orders.csv'
+    service = DataService()
+
+    service.load_data()
+    service.bulk_update_due_dates([{'planned_order_id': 'PLN-PO-0001', 'new_due_date': '2030-10-01'}])
+    assert service.reload_orders()
+
+    assert source.read_text() == CSV
+    exported = service.export_csv(str(data_dir / 'export.csv'))
+    assert DataService().import_csv(exported)['planned_order_id'].tolist() == ['PLN-PO-0001', 'PLN-MO-0002', 'PLN-PO-0003']
+
+
+def test_forced_reload_keeps_journaled_updates(data_dir):
+    service = DataService()
+    service.bulk_update_due_dates([{'planned_order_id': 'PLN-PO-0003', 'new_due_date': '2030-10-01'}])
+
+    service.load_data(force_reload=True)
+    assert due_dates(service)['PLN-PO-0003'] == '2030-10-01'
+    assert due_dates(DataService())['PLN-PO-0003'] == '2030-10-01'
+
+    # A new CSV replaces the changes made on the old one
+    (data_dir / 'planned_orders.csv').write_text(CSV.replace('Seats', 'Seat'))
+    assert due_dates(DataService())['PLN-PO-0003'] == '2030-09-13'
+
+
+def test_duplicate_ids_keep_every_row(data_dir):
+    (data_dir / 'planned_orders.csv').write_text(CSV + "PO,PLN-PO-0001,[COMP0009] Bolts ,Purchase,7,AutoSteel Ltd.,5,29-08-2030,01-09-2030\n")
+    service = DataService()
+
+    assert service.get_orders_by_ids(['PLN-PO-0001'])['quantity'].tolist() == [80, 7]
+
+    service.bulk_update_due_dates([{'planned_order_id': 'PLN-PO-0001', 'new_due_date': '2030-10-01'},
+                                   {'planned_order_id': 'PLN-MO-0002', 'new_due_date': '2030-10-02'}])
+    frame = service.snapshot().frame
+    assert frame['suggested_due_date'].dt.strftime('%Y-%m-%d').tolist() == \
+        ['2030-10-01', '2030-10-02', '2030-09-13', '2030-10-01']
+    assert DataService().snapshot().frame['suggested_due_date'].tolist() == frame['suggested_due_date'].tolist()
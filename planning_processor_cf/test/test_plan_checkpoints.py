@@ -0,0 +1,123 @@
+# test/test_plan_checkpoints.py
+import time
+
+import pytest
+
+from config.settings import settings
+from services.planning_service import PlanningService
+from utils.exceptions import OdooOperationError
+
+
+class FakeOdooService:
+    """Records the orders it is asked to create; fails the planned ids in `failing`."""
+
+    def __init__(self):
+        self.created = []
+        self.failing = set()
+        self.lookup_error = None
+        self.delay = 0.0
+
+    def create_purchase_orders(self, orders):
+        time.sleep(self.delay)
+        results = []
+        for order_data in orders:
+            self.created.append(order_data['planned_order_id'])
+            if order_data['planned_order_id'] in self.failing:
+                results.append(OdooOperationError("Failed to create PO: rejected"))
+            else:
+                results.append({"status": "success", "odoo_id": len(self.created), "message": "PO created"})
+        return results
+
+    create_manufacturing_orders = create_purchase_orders
+
+    def run_concurrently(self, calls):
+        if self.lookup_error:
+            raise self.lookup_error
+        return [call() for call in calls]
+
+    def get_production_orders(self, domain):
+        return []
+
+    def get_purchase_orders(self, domain):
+        return []
+
+
+class FakeDataService:
+    def __init__(self):
+        self.updates = []
+
+    def bulk_update_due_dates(self, updates):
+        self.updates.extend(updates)
+        return {'updated': len(updates), 'failed': 0}
+
+
+@pytest.fixture
+def planning(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'plan_checkpoints_db_path', str(tmp_path / 'checkpoints.sqlite3'))
+    service = PlanningService(FakeDataService(), FakeOdooService())
+    yield service
+    service.executor.close()
+
+
+def purchase_actions(*planned_order_ids):
+    return [{"action_type": "create", "order_data": {"planned_order_id": planned_order_id, "item_type": "Purchase"}}
+            for planned_order_id in planned_order_ids]
+
+
+def test_rerun_skips_completed_actions(planning):
+    planning.odoo_service.failing = {'PO-2'}
+    first = planning.execute_plan(purchase_actions('PO-1', 'PO-2', 'PO-3'), plan_id='plan-1')
+    assert [result['status'] for result in first] == ['success', 'error', 'success']
+
+    planning.odoo_service.failing = set()
+    second = planning.execute_plan(purchase_actions('PO-1', 'PO-2', 'PO-3'), plan_id='plan-1')
+
+    assert [result['status'] for result in second] == ['success'] * 3
+    assert [result.get('resumed', False) for result in second] == [True, False, True]
+    created = planning.odoo_service.created
+    assert sorted(created[:3]) == ['PO-1', 'PO-2', 'PO-3'] and created[3:] == ['PO-2']
+
+
+def test_checkpoints_are_per_plan(planning):
+    planning.execute_plan(purchase_actions('PO-1'), plan_id='plan-1')
+    planning.execute_plan(purchase_actions('PO-1'), plan_id='plan-2')
+    planning.execute_plan(purchase_actions('PO-1'))
+
+    assert planning.odoo_service.created == ['PO-1'] * 3
+
+
+def test_reschedule_resumes_and_fails_when_lookup_fails(planning):
+    actions = [{'planned_order_id': 'PO-1', 'new_due_date': '2030-01-01'},
+               {'planned_order_id': 'PO-2', 'new_due_date': '2030-01-02'}]
+    planning.odoo_service.lookup_error = ConnectionError("Odoo unreachable")
+
+    failed = planning.execute_reschedule_actions(actions, plan_id='plan-1')
+
+    assert [result['status'] for result in failed] == ['failed', 'failed']
+    assert planning.data_service.updates == []
+    assert planning.checkpoints.completed('plan-1', 'reschedule', ['PO-1', 'PO-2']) == {}
+
+    planning.odoo_service.lookup_error = None
+    done = planning.execute_reschedule_actions(actions, plan_id='plan-1')
+    assert [result['status'] for result in done] == ['success', 'success']
+    assert len(planning.data_service.updates) == 2
+
+    resumed = planning.execute_reschedule_actions(actions, plan_id='plan-1')
+    assert [result.get('resumed') for result in resumed] == [True, True]
+    assert len(planning.data_service.updates) == 2
+
+
+def test_timed_out_batch_is_checkpointed_when_it_completes(planning):
+    planning.executor.timeout = 0.1
+    planning.odoo_service.delay = 0.5
+
+    first = planning.execute_plan(purchase_actions('PO-1', 'PO-2'), plan_id='plan-1')
+    assert [result['status'] for result in first] == ['error', 'error']
+    assert 'may have been created' in first[0]['message']
+
+    time.sleep(0.6)
+    planning.odoo_service.delay = 0.0
+    second = planning.execute_plan(purchase_actions('PO-1', 'PO-2'), plan_id='plan-1')
+
+    assert [result.get('resumed') for result in second] == [True, True]
+    assert sorted(planning.odoo_service.created) == ['PO-1', 'PO-2']
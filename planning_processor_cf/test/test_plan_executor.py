@@ -0,0 +1,61 @@
+# test/test_plan_executor.py
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from services.plan_executor import PlanExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = PlanExecutor(max_workers=3, timeout=0.5)
+    yield executor
+    executor.close()
+
+
+def sleeper(seconds, value):
+    def unit():
+        time.sleep(seconds)
+        return value
+    return unit
+
+
+def test_results_keep_submission_order(executor):
+    def failing():
+        raise ValueError("bad batch")
+
+    results = executor.run([sleeper(0.2, 'a'), sleeper(0.0, 'b'), failing, sleeper(0.1, 'd')])
+
+    assert results[:2] == ['a', 'b'] and results[3] == 'd'
+    assert isinstance(results[2], ValueError)
+
+
+def test_concurrency_is_bounded(executor):
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def unit():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return True
+
+    assert executor.run([unit] * 10) == [True] * 10
+    assert peak[0] == 3
+
+
+def test_timeout_is_per_action(executor):
+    results = executor.run([sleeper(1.0, 'slow'), sleeper(1.0, 'big batch'), sleeper(0.0, 'fast')], sizes=[1, 4, 1])
+
+    assert isinstance(results[0], TimeoutError)
+    assert results[1:] == ['big batch', 'fast']
+
+
+def test_zero_timeout_waits(executor):
+    executor.timeout = 0
+    assert executor.run([sleeper(0.6, 'done')]) == ['done']
@@ -0,0 +1,59 @@
+# test/test_reference_cache.py
+import pytest
+
+from services import reference_cache
+from services.reference_cache import MISSING, ReferenceCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(reference_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ReferenceCache(ttl=10, negative_ttl=2)
+    cache.set('product', 7)
+    cache.set('unknown', None)
+
+    clock[0] += 1
+    assert cache.get('product') == 7
+    assert cache.get('unknown') is None  # a cached "not found"
+
+    clock[0] += 2
+    assert cache.get('unknown') is MISSING
+    assert cache.get('product') == 7
+
+    clock[0] += 8
+    assert cache.get('product') is MISSING
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ReferenceCache(max_entries=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is MISSING
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+
+def test_disabled_cache_and_invalidation(clock):
+    disabled = ReferenceCache(ttl=0)
+    disabled.set('a', 1)
+    assert disabled.get('a') is MISSING
+
+    no_negatives = ReferenceCache(ttl=10, negative_ttl=0)
+    no_negatives.set('a', None)
+    assert no_negatives.get('a') is MISSING
+
+    cache = ReferenceCache(ttl=10)
+    cache.set_many([(('product.product', 'A1'), 1), (('product.product', 'A2'), 2), (('res.partner', 'X'), 3)])
+    cache.invalidate(('res.partner', 'X'))
+    assert cache.invalidate_where(lambda key, value: value == 2) == 1
+    assert [cache.get(key) for key in (('product.product', 'A1'), ('product.product', 'A2'), ('res.partner', 'X'))] == \
+        [1, MISSING, MISSING]
+    assert cache.stats()['hits'] == 1
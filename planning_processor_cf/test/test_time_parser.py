@@ -0,0 +1,56 @@
+# test/test_time_parser.py
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.order_snapshot import OrderSnapshot
+from utils.time_parser import TimeParser
+
+
+@pytest.fixture
+def clock():
+    return [datetime(2030, 1, 1, 23, 59)]
+
+
+@pytest.fixture
+def parser(clock):
+    return TimeParser(clock=lambda: clock[0])
+
+
+def test_cached_windows_roll_over_at_midnight(parser, clock):
+    assert parser.parse_time_window('today') == (date(2030, 1, 1), date(2030, 1, 1), 'exact')
+    assert parser.parse_time_window('Today ') == (date(2030, 1, 1), date(2030, 1, 1), 'exact')
+
+    clock[0] = datetime(2030, 1, 2, 0, 1)
+    assert parser.parse_time_window('today') == (date(2030, 1, 2), date(2030, 1, 2), 'exact')
+    assert parser.parse_time_window('overdue') == (None, date(2030, 1, 1), 'overdue')
+
+
+def test_set_clock_drops_cached_windows(parser):
+    parser.parse_time_window('tomorrow')
+    parser.set_clock(lambda: datetime(2030, 6, 15, 12, 0))
+
+    assert parser.today == date(2030, 6, 15)
+    assert parser.parse_time_window('tomorrow') == (date(2030, 6, 16), date(2030, 6, 16), 'exact')
+
+
+@pytest.mark.parametrize('description', ['today', 'tomorrow', 'next week', 'this month', 'overdue',
+                                         'between jan 3 and jan 9', 'in 2 weeks'])
+def test_date_index_gives_the_same_rows_as_the_mask(parser, description):
+    rng = np.random.default_rng(0)
+    days = rng.integers(-40, 40, size=500)
+    frame = pd.DataFrame({
+        'planned_order_id': [f"PLN-{i}" for i in range(500)],
+        'suggested_due_date': pd.Timestamp('2030-01-01') + pd.to_timedelta(days, unit='D')
+                              + pd.to_timedelta(rng.integers(0, 24, size=500), unit='h'),
+    })
+    frame.loc[::50, 'suggested_due_date'] = pd.NaT
+    snapshot = OrderSnapshot(frame, version=1, generation=1)
+
+    masked = parser.filter_dataframe_by_time(frame, description, 'suggested_due_date')
+    indexed = parser.filter_dataframe_by_time(frame, description, 'suggested_due_date', date_index=snapshot.date_index)
+
+    assert len(masked) > 0
+    pd.testing.assert_frame_equal(indexed, masked)
@@ -1,15 +1,19 @@
 # tools/execution_tool.py
 import json
+from typing import Optional
 from .base_tool import BaseTool
 from services.planning_service import PlanningService
+from services.job_queue import JobQueue
+from config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ExecutionTool(BaseTool):
-    def __init__(self, planning_service: PlanningService, session_manager):
+    def __init__(self, planning_service: PlanningService, session_manager, job_queue: Optional[JobQueue] = None):
         super().__init__(session_manager)
         self.planning_service = planning_service
+        self.job_queue = job_queue
 
     def execute_plan(self, session_id: str) -> str:
         self.log_tool_execution("execute_plan", session_id)
@@ -27,11 +31,17 @@ class ExecutionTool(BaseTool):
             
             # Case 1: It's a standard execution plan (an object with .actions)
             if hasattr(plan_to_execute, 'actions'):
-                if not plan_to_execute.actions:
+                if not plan_to_execute.action_count:
                     return self.format_error_response("The action plan is empty.")
                 
+                if self._should_queue(plan_to_execute.action_count):
+                    # The job stores the plan in its compact form
+                    return self._queue_plan(session_id, 'execute_plan',
+                                            {'plan_id': plan_to_execute.plan_id, 'plan': plan_to_execute.model_dump()},
+                                            plan_to_execute.action_count)
+
                 logger.info("Detected a standard execution plan. Executing...")
-                results = self.planning_service.execute_plan(plan_to_execute.actions)
+                results = self.planning_service.execute_plan(plan_to_execute.actions, plan_id=plan_to_execute.plan_id)
                 success_count = len([r for r in results if r.get('status') == 'success'])
                 summary = f"Execution complete. Successfully processed {success_count}/{len(results)} action(s)."
 
@@ -41,8 +51,12 @@ class ExecutionTool(BaseTool):
                 valid_orders = plan_to_execute.get('valid_orders', [])
                 if not valid_orders:
                     return self.format_error_response("No valid orders to reschedule in the current plan.")
+                if self._should_queue(len(valid_orders)):
+                    return self._queue_plan(session_id, 'execute_reschedule',
+                                            {'plan_id': plan_to_execute.get('plan_id'), 'valid_orders': valid_orders},
+                                            len(valid_orders))
                 
-                results = self.planning_service.execute_reschedule_actions(valid_orders)
+                results = self.planning_service.execute_reschedule_actions(valid_orders, plan_id=plan_to_execute.get('plan_id'))
                 success_count = len([r for r in results if r.get('status') == 'success'])
                 summary = f"Rescheduling complete. Successfully rescheduled {success_count}/{len(results)} order(s)."
 
@@ -54,14 +68,56 @@ class ExecutionTool(BaseTool):
             # END OF THE CORRECTED LOGIC
             # ============================================================
 
-            self.session_manager.update_session(session_id, last_action_plan=None)
-
             failed_count = len(results) - success_count
             if failed_count > 0:
-                summary += f" {failed_count} action(s) failed. Please review the errors."
+                # Keep the plan; executing it again skips the actions that completed
+                summary += (f" {failed_count} action(s) failed. Please review the errors."
+                            f" Executing the plan again retries only the failed action(s).")
+            else:
+                self.session_manager.update_session(session_id, last_action_plan=None)
             
             return json.dumps({"summary": summary, "results": results})
 
         except Exception as e:
             logger.error(f"Failed to execute plan for session {session_id}: {e}", exc_info=True)
-            return self.format_error_response(f"Failed to execute plan: {str(e)}")
\ No newline at end of file
+            return self.format_error_response(f"Failed to execute plan: {str(e)}")
+
+    def get_execution_job_status(self, session_id: str, job_id: Optional[str] = None) -> str:
+        """
+        Reports the progress of a plan that is executing as a background job.
+        Without a job_id, the session's most recent job is reported.
+        """
+        self.log_tool_execution("get_execution_job_status", session_id, job_id=job_id)
+        try:
+            if not self.job_queue:
+                return self.format_error_response("Background execution is not enabled.")
+            if not job_id:
+                jobs = self.job_queue.list_jobs(session_id=session_id, limit=1)
+                if not jobs:
+                    return self.format_empty_response("No background executions were started in this session.")
+                job = jobs[0]
+            else:
+                job = self.job_queue.get(job_id)
+                if not job:
+                    return self.format_error_response(f"No background execution with ID {job_id} was found.")
+
+            summary = f"Job {job['id']} is {job['status']}: {job['done']}/{job['total']} done"
+            if job['done']:
+                summary += f" ({job['succeeded']} succeeded, {job['failed']} failed)"
+            if job['error']:
+                summary += f". Error: {job['error']}"
+            return json.dumps({"summary": summary + ".", "job": job})
+        except Exception as e:
+            logger.error(f"Failed to get job status for session {session_id}: {e}", exc_info=True)
+            return self.format_error_response(f"Failed to get job status: {str(e)}")
+
+    def _should_queue(self, action_count: int) -> bool:
+        return self.job_queue is not None and action_count > settings.job_async_threshold
+
+    def _queue_plan(self, session_id: str, kind: str, payload: dict, total: int) -> str:
+        """Hands a large plan to the background job queue instead of executing it in this turn."""
+        job_id = self.job_queue.submit(kind, payload, total=total, session_id=session_id)
+        self.session_manager.update_session(session_id, last_action_plan=None)
+        summary = (f"The plan has {total} action(s), so it was queued as background job {job_id}. "
+                   f"Ask for its status to see progress.")
+        return json.dumps({"summary": summary, "job_id": job_id, "status": "queued", "total": total})
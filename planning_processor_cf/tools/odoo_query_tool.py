@@ -1,46 +1,82 @@
 # tools/odoo_query_tool.py
+import itertools
 from typing import Optional
 import pandas as pd
 from .base_tool import BaseTool
+from config.settings import settings
 from services.odoo_service import OdooService
-from utils.time_parser import TimeParser
+from utils.exceptions import TimeParsingError
+from utils.time_parser import get_time_parser
 from utils.data_formatter import DataFormatter
 
 class OdooQueryTool(BaseTool):
     def __init__(self, odoo_service: OdooService, session_manager):
         super().__init__(session_manager)
         self.odoo_service = odoo_service
-        self.time_parser = TimeParser()
+        self.time_parser = get_time_parser()
         self.data_formatter = DataFormatter()
 
     def get_odoo_order_details(self, session_id: str, planned_order_id: Optional[str] = None, item_type: Optional[str] = None, time_description: Optional[str] = None) -> str:
         self.log_tool_execution("get_odoo_order_details", session_id, planned_order_id=planned_order_id, item_type=item_type, time_description=time_description)
         try:
-            results = []
-            
             domain = []
             if planned_order_id:
                 domain.append(['x_studio_planned_order_id', '=', planned_order_id])
-            else:
-                domain.append(['id', '!=', 0])
 
+            # Let Odoo apply the date window instead of reading every order
+            first_day = last_day = None
+            filter_locally = False
+            if time_description:
+                try:
+                    bounds = self.time_parser.parse_date_bounds(time_description)
+                    if bounds:
+                        first_day, last_day = bounds
+                except TimeParsingError:
+                    # Only the legacy client-side filter may understand it
+                    filter_locally = True
+
+            models = []
             if not item_type or item_type.lower() == 'manufacture':
-                results.extend(self.odoo_service.get_production_orders(domain=domain))
+                models.append('mrp.production')
             if not item_type or item_type.lower() == 'buy' or item_type.lower() == 'purchase':
-                results.extend(self.odoo_service.get_purchase_orders(domain=domain))
+                models.append('purchase.order')
+
+            # Read the models concurrently; results stay in model order
+            if planned_order_id and not time_description:
+                # Status checks for one order repeat a lot, so they go through the order cache
+                pages = self.odoo_service.run_concurrently([
+                    lambda model_name=model_name: self.odoo_service.find_orders_by_planned_order_id(
+                        model_name, planned_order_id, scope=session_id)
+                    for model_name in models
+                ])
+            else:
+                # Each model can fill the cap on its own, so none needs to read past it
+                limit = settings.odoo_query_max_records or None
+                streams = [self.odoo_service.iter_orders(model_name, domain, first_day, last_day, limit=limit)
+                           for model_name in models]
+                # Only the first page of each model is read up front; later pages
+                # are requested lazily, while the cap has not been reached
+                first_pages = self.odoo_service.run_concurrently([
+                    lambda stream=stream: list(itertools.islice(stream, settings.odoo_page_size))
+                    for stream in streams
+                ])
+                pages = [itertools.chain(first_page, stream) for first_page, stream in zip(first_pages, streams)]
+            records = itertools.chain.from_iterable(pages)
+            if settings.odoo_query_max_records > 0:
+                records = itertools.islice(records, settings.odoo_query_max_records)
+            df = pd.DataFrame(list(records))
 
             # --- THIS IS THE FIX ---
             # Make the response clearer for the AI when no records are found.
-            if not results:
+            if df.empty and not time_description:
                 return self.format_empty_response("The query ran successfully, but no Purchase or Manufacturing orders were found in Odoo.")
             # --- END OF FIX ---
 
-            df = pd.DataFrame(results)
-            if time_description:
+            if filter_locally and not df.empty:
                 df = self.time_parser.filter_dataframe_by_time(df, time_description, date_column='schedule_date')
             
             if df.empty:
-                return self.format_empty_response("I found orders in Odoo, but none that match your time criteria")
+                return self.format_empty_response("I found no orders in Odoo that match your time criteria")
 
             formatted_result = self.data_formatter.format_odoo_orders(df)
             return self.format_success_response(formatted_result)
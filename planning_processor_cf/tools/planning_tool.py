@@ -29,10 +29,10 @@ class PlanningTool(BaseTool):
                 use_last_query=use_last_query
             )
 
-            if not action_plan.actions:
+            if not action_plan.action_count:
                 return self.format_empty_response("No orders match your criteria to create a plan")
 
             self.session_manager.update_session(session_id, last_action_plan=action_plan)
-            return self.format_success_response(f"I have created a plan with {len(action_plan.actions)} action(s).")
+            return self.format_success_response(f"I have created a plan with {action_plan.action_count} action(s).")
         except Exception as e:
             return self.format_error_response(f"Failed to create plan: {str(e)}")
\ No newline at end of file
@@ -6,29 +6,31 @@ import pandas as pd
 from utils.exceptions import TimeParsingError
 from .base_tool import BaseTool
 from services.data_service import DataService
-from utils.time_parser import TimeParser
+from utils.time_parser import get_time_parser
 from utils.data_formatter import DataFormatter
 
 class QueryTool(BaseTool):
     def __init__(self, data_service: DataService, session_manager):
         super().__init__(session_manager)
         self.data_service = data_service
-        self.time_parser = TimeParser()
+        self.time_parser = get_time_parser()
         self.data_formatter = DataFormatter()
 
  
     def query_planned_orders(self, session_id: str, time_description: Optional[str] = None, item_type: Optional[str] = None, query_type: str = "list", reschedule_needed: Optional[bool] = None) -> str:
         self.log_tool_execution("query_planned_orders", session_id, time_description=time_description, item_type=item_type, query_type=query_type, reschedule_needed=reschedule_needed)
         try:
-            df = self.data_service.load_data()
+            snapshot = self.data_service.snapshot()
+            df = snapshot.view()
             
             if time_description:
-                df = self.time_parser.filter_dataframe_by_time(df, time_description, date_column='suggested_due_date')
+                df = self.time_parser.filter_dataframe_by_time(df, time_description, date_column='suggested_due_date',
+                                                               date_index=snapshot.date_index)
             
             # --- THIS IS THE FIX ---
             # Standardize the filter to use "Purchase" and "Manufacture" to match your CSV data.
             if item_type and item_type.lower() in ['purchase', 'manufacture']:
-                df = df[df['item_type'].str.lower() == item_type.lower()]
+                df = snapshot.filter_item_type(df, item_type)
             # --- END OF FIX ---
 
             if reschedule_needed is True:
@@ -1,12 +1,14 @@
 # tools/rescheduling_tool.py
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime, date, timedelta
 from .base_tool import BaseTool
 from services.data_service import DataService
 from services.planning_service import PlanningService
-from utils.time_parser import TimeParser
+from utils.time_parser import get_time_parser
 import json
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +18,7 @@ class ReschedulingTool(BaseTool):
         super().__init__(session_manager)
         self.data_service = data_service
         self.planning_service = planning_service
-        self.time_parser = TimeParser()
+        self.time_parser = get_time_parser()
 
     def analyze_rescheduling_eligibility(self, session_id: str, planned_order_ids: Optional[List[str]] = None) -> str:
         """
@@ -25,91 +27,62 @@ class ReschedulingTool(BaseTool):
         self.log_tool_execution("analyze_rescheduling_eligibility", session_id, planned_order_ids=planned_order_ids)
         
         try:
-            df = self.data_service.load_data()
-            
-            # Filter by specific IDs if provided
+            # Filter by specific IDs if provided, through the id index
             if planned_order_ids:
-                df = df[df['planned_order_id'].isin(planned_order_ids)]
+                df = self.data_service.get_orders_by_ids(planned_order_ids)
+            else:
+                df = self.data_service.load_data()
                 
             if df.empty:
                 return self.format_error_response("No orders found matching the criteria")
             
-            current_date = date.today()
-            
-            # Prepare table data
-            table_data = []
-            detailed_analysis = []
-            
-            current_date = date.today()
-            for _, row in df.iterrows():
-                order_id = row['planned_order_id']
-                try:
-                    # Ensure both are date objects for proper comparison
-                    suggested_date = pd.to_datetime(row['suggested_due_date']).date()
-                    days_difference = (suggested_date - current_date).days
-                    
-                    # Debug logging - remove after fixing
-                    print(f"DEBUG: Order {order_id}, Suggested: {suggested_date}, Current: {current_date}, Diff: {days_difference}")
-                    
-                except Exception as e:
-                    print(f"ERROR in date calculation for {order_id}: {e}")
-                    days_difference = 0  # Fallback
-                
-                # Determine eligibility status for table
-                if days_difference <= 0:
-                    eligibility_status = "Postpone Only (Overdue)"
-                elif days_difference == 1:
-                    eligibility_status = "Postpone Only (Due Tomorrow)"
-                else:
-                    eligibility_status = "Prepone/Postpone"
-                
-                # Add to table data
-                table_data.append([
-                    order_id,
-                    row['item'],
-                    str(suggested_date),
-                    days_difference,
-                    eligibility_status
-                ])
-                
-                # Keep detailed analysis for summary
-                analysis = {
-                    'planned_order_id': order_id,
-                    'item': row['item'],
-                    'current_date': str(current_date),
-                    'suggested_due_date': str(suggested_date),
-                    'days_from_today': days_difference,
-                    'can_prepone': days_difference > 1,
-                    'can_postpone': True,
-                    'max_prepone_days': max(0, days_difference - 1) if days_difference > 1 else 0
-                }
-                
-                if days_difference <= 0:
-                    analysis['status'] = 'overdue_or_today'
-                    analysis['recommendation'] = 'Can only postpone - order is due today or overdue'
-                elif days_difference == 1:
-                    analysis['status'] = 'tomorrow'
-                    analysis['recommendation'] = 'Can only postpone - order is due tomorrow'
-                else:
-                    analysis['status'] = 'future'
-                    analysis['recommendation'] = f'Can prepone up to {analysis["max_prepone_days"]} days or postpone any number of days'
-                
-                detailed_analysis.append(analysis)
-            
-            # Convert table_data to the expected format with headers and rows
+            eligibility = self.data_service.add_rescheduling_eligibility(df)
+            current_date = str(date.today())
+            due_dates = eligibility['suggested_due_date'].dt.strftime('%Y-%m-%d')
+            days = eligibility['days_from_today'].to_numpy()
+            max_prepone = eligibility['max_prepone_days'].to_numpy()
+            status = eligibility['reschedule_status'].to_numpy()
+
+            options = np.select(
+                [days <= 0, days == 1],
+                ["Postpone Only (Overdue)", "Postpone Only (Due Tomorrow)"],
+                default="Prepone/Postpone"
+            )
+            recommendations = np.select(
+                [days <= 0, days == 1],
+                ['Can only postpone - order is due today or overdue', 'Can only postpone - order is due tomorrow'],
+                default=''
+            ).astype(object)
+            future = status == 'future'
+            recommendations[future] = [
+                f'Can prepone up to {n} days or postpone any number of days' for n in max_prepone[future]
+            ]
+
+            # Convert to the expected format with headers and rows
             headers = ["Order ID", "Item Name", "Due Date", "Days From Today", "Rescheduling Options"]
-            rows = []
+            rows = pd.DataFrame({
+                "Order ID": eligibility['planned_order_id'].to_numpy(),
+                "Item Name": eligibility['item'].to_numpy(),
+                "Due Date": due_dates.to_numpy(),
+                "Days From Today": days.astype(str),
+                "Rescheduling Options": options
+            }).to_dict('records')
 
-            for row_data in table_data:
-                row_dict = {
-                    "Order ID": row_data[0],
-                    "Item Name": row_data[1], 
-                    "Due Date": row_data[2],
-                    "Days From Today": str(row_data[3]),
-                    "Rescheduling Options": row_data[4]
-                }
-                rows.append(row_dict)
+            # Keep detailed analysis for summary
+            detailed_analysis = pd.DataFrame({
+                'planned_order_id': eligibility['planned_order_id'].to_numpy(),
+                'item': eligibility['item'].to_numpy(),
+                'current_date': current_date,
+                'suggested_due_date': due_dates.to_numpy(),
+                'days_from_today': days,
+                'can_prepone': eligibility['can_prepone'].to_numpy(),
+                'can_postpone': True,
+                'max_prepone_days': max_prepone,
+                'status': status,
+                'recommendation': recommendations
+            }).to_dict('records')
 
+            prepone_count = int(eligibility['can_prepone'].sum())
             table_response = {
                 "display_type": "table",
                 "headers": headers,
@@ -117,8 +90,8 @@ class ReschedulingTool(BaseTool):
                 "analysis": detailed_analysis,  # Add this!
                 "summary": {
                     "total_orders": len(detailed_analysis),
-                    "can_prepone": len([a for a in detailed_analysis if a['can_prepone']]),
-                    "postpone_only": len([a for a in detailed_analysis if not a['can_prepone']])
+                    "can_prepone": prepone_count,
+                    "postpone_only": len(detailed_analysis) - prepone_count
                 }
             }
             
@@ -150,70 +123,19 @@ class ReschedulingTool(BaseTool):
                                individual_dates=individual_dates)
         
         try:
-            # First analyze eligibility
-            eligibility_result = json.loads(self.analyze_rescheduling_eligibility(session_id, planned_order_ids))
-            
-            if "error" in eligibility_result:
-                return self.format_error_response(eligibility_result["error"])
-            
-            analysis = eligibility_result["analysis"]
-            current_date = date.today()
-            
-            # Validate rescheduling requests against eligibility
-            invalid_orders = []
-            valid_orders = []
-            
-            for order_analysis in analysis:
-                order_id = order_analysis['planned_order_id']
-                
-                if reschedule_type.lower() == 'prepone' and not order_analysis['can_prepone']:
-                    invalid_orders.append({
-                        'order_id': order_id,
-                        'reason': f"Cannot prepone - order is due in {order_analysis['days_from_today']} day(s)"
-                    })
-                else:
-                    # Calculate new date
-                    current_suggested_date = datetime.strptime(order_analysis['suggested_due_date'], '%Y-%m-%d').date()
-                    
-                    if target_date:
-                        new_date = datetime.strptime(target_date, '%Y-%m-%d').date()
-                        # Validate target date is not in the past
-                        if new_date < current_date:
-                            invalid_orders.append({
-                                'order_id': order_id,
-                                'reason': f"Target date {target_date} is in the past"
-                            })
-                            continue
-                    elif days_offset:
-                        if reschedule_type.lower() == 'prepone':
-                            new_date = current_suggested_date - timedelta(days=abs(days_offset))
-                            # Validate prepone doesn't go to past
-                            if new_date < current_date:
-                                invalid_orders.append({
-                                    'order_id': order_id,
-                                    'reason': f"Cannot prepone by {days_offset} days - would result in past date"
-                                })
-                                continue
-                        else:  # postpone
-                            new_date = current_suggested_date + timedelta(days=abs(days_offset))
-                    else:
-                        invalid_orders.append({
-                            'order_id': order_id,
-                            'reason': "No target date or days offset specified"
-                        })
-                        continue
-                    
-                    valid_orders.append({
-                        'planned_order_id': order_id,
-                        'item': order_analysis['item'],
-                        'current_suggested_date': order_analysis['suggested_due_date'],
-                        'new_due_date': str(new_date),
-                        'reschedule_type': reschedule_type,
-                        'days_changed': (new_date - current_suggested_date).days
-                    })
+            if planned_order_ids:
+                df = self.data_service.get_orders_by_ids(planned_order_ids)
+            else:
+                df = self.data_service.load_data()
+
+            if df.empty:
+                return self.format_error_response("No orders found matching the criteria")
+
+            valid_orders, invalid_orders = self._build_rescheduling_plan(df, reschedule_type, target_date, days_offset)
             
             # Store the rescheduling plan in session
             rescheduling_plan = {
+                'plan_id': uuid.uuid4().hex,
                 'valid_orders': valid_orders,
                 'invalid_orders': invalid_orders,
                 'reschedule_type': reschedule_type,
@@ -234,6 +156,56 @@ class ReschedulingTool(BaseTool):
         except Exception as e:
             return self.format_error_response(f"Failed to create rescheduling plan: {str(e)}")
 
+    def _build_rescheduling_plan(self, df: pd.DataFrame, reschedule_type: str,
+                                 target_date: Optional[str] = None,
+                                 days_offset: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Computes new dates and validity for every order as array operations.
+        Returns (valid_orders, invalid_orders) with each list in order of the frame.
+        """
+        eligibility = self.data_service.add_rescheduling_eligibility(df)
+        today = np.datetime64(date.today(), 'D')
+        current = eligibility['suggested_due_date'].to_numpy(dtype='datetime64[D]')
+        days = eligibility['days_from_today'].to_numpy()
+        is_prepone = reschedule_type.lower() == 'prepone'
+
+        reasons = np.full(len(eligibility), None, dtype=object)
+        if is_prepone:
+            blocked = ~eligibility['can_prepone'].to_numpy()
+            reasons[blocked] = [f"Cannot prepone - order is due in {d} day(s)" for d in days[blocked]]
+        open_rows = pd.isna(reasons)
+
+        if target_date:
+            new_dates = np.full(len(eligibility), np.datetime64(datetime.strptime(target_date, '%Y-%m-%d').date(), 'D'))
+            # Validate target date is not in the past
+            reasons[open_rows & (new_dates < today)] = f"Target date {target_date} is in the past"
+        elif days_offset:
+            offset = np.timedelta64(int(abs(days_offset)), 'D')
+            if is_prepone:
+                new_dates = current - offset
+                # Validate prepone doesn't go to past
+                reasons[open_rows & (new_dates < today)] = f"Cannot prepone by {days_offset} days - would result in past date"
+            else:  # postpone
+                new_dates = current + offset
+        else:
+            new_dates = current
+            reasons[open_rows] = "No target date or days offset specified"
+
+        valid = pd.isna(reasons)
+        invalid_orders = pd.DataFrame({
+            'order_id': eligibility['planned_order_id'].to_numpy()[~valid],
+            'reason': reasons[~valid]
+        }).to_dict('records')
+        valid_orders = pd.DataFrame({
+            'planned_order_id': eligibility['planned_order_id'].to_numpy()[valid],
+            'item': eligibility['item'].to_numpy()[valid],
+            'current_suggested_date': np.datetime_as_string(current[valid], unit='D'),
+            'new_due_date': np.datetime_as_string(new_dates[valid], unit='D'),
+            'reschedule_type': reschedule_type,
+            'days_changed': (new_dates[valid] - current[valid]).astype(np.int64)
+        }).to_dict('records')
+        return valid_orders, invalid_orders
+
     # def execute_rescheduling_plan(self, session_id: str) -> str:
     #     """
     #     Execute the rescheduling plan stored in session
@@ -0,0 +1,12 @@
+# utils/json_utils.py
+from datetime import date, datetime
+from typing import Any
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default for the numpy scalars and timestamps found in plan rows."""
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
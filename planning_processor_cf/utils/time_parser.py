@@ -1,19 +1,76 @@
 # utils/time_parser.py
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime, timedelta, date
 from dateutil.parser import parse as parse_date
 from dateutil.relativedelta import relativedelta
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Callable
+from functools import lru_cache
 from .exceptions import TimeParsingError
 import calendar
+import threading
+
+# Parsed windows kept per parser, keyed by (normalized description, today)
+WINDOW_CACHE_SIZE = 1024
+
+# All regexes are compiled once at import time and shared by every parser
+_YEAR_PATTERN = re.compile(r'\d{4}')
+_MONTH_DAY_PATTERN = re.compile(r'\b([A-Za-z]{3,9})\s+(\d{1,2})(?:\s+to\s+([A-Za-z]{3,9})\s+(\d{1,2}))?\b')
+_RANGE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'between\s+(.+?)\s+and\s+(.+)',
+    r'from\s+(.+?)\s+to\s+(.+)',
+    r'(.+?)\s+to\s+(.+)',
+    r'(.+?)\s+through\s+(.+)',
+    r'(.+?)\s+-\s+(.+)'
+)]
+_IN_PERIOD_PATTERN = re.compile(r'in\s+(\d+)\s+(day|week|month)s?', re.IGNORECASE)
+_FROM_NOW_PATTERN = re.compile(r'(\d+)\s+(day|week|month)s?\s+from\s+now', re.IGNORECASE)
+_NEXT_PERIOD_PATTERN = re.compile(r'next\s+(\d+)\s+(day|week|month)s?', re.IGNORECASE)
+_SPECIFIC_DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d{4}-\d{1,2}-\d{1,2})',
+    r'(\d{1,2}-\d{1,2}-\d{4})',
+    r'(\d{1,2}/\d{1,2}/\d{4})',
+    r'([a-zA-Z]+\s+\d{1,2},?\s+\d{4})',
+    r'(\d{1,2}\s+[a-zA-Z]+\s+\d{4})',
+    r'([a-zA-Z]+\s+\d{1,2}(?:st|nd|rd|th)?)',
+    r'(\d{1,2}(?:st|nd|rd|th)?\s+[a-zA-Z]+)'
+)]
+_RELATIVE_REFERENCE_PATTERN = re.compile(r'(\d+)\s+(day|week|month)s?\s+(ago|from\s+now)')
+_LEGACY_DATE_PATTERN = re.compile(r'(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}-\d{1,2}-\d{4}|\d{1,2}/\d{1,2}/\d{4})')
+_DURATION_PATTERN = re.compile(r'(\d+)\s*(day|week|month)', re.IGNORECASE)
+_QUERY_NOISE_PATTERNS = [re.compile(phrase, re.IGNORECASE) for phrase in (
+    'make orders', 'make items', 'buy orders', 'buy items', 'purchase orders',
+    'that need rescheduling', 'need reschedule', 'to reschedule',
+    r'how many|count'
+)]
 
 class TimeParser:
-    def __init__(self):
-        self.today = date.today()
-        self.now = datetime.now()
+    def __init__(self, clock: Optional[Callable[[], datetime]] = None):
+        """
+        `clock` returns the current datetime and defaults to datetime.now.
+        Pass a fixed clock to freeze time in tests and benchmarks.
+        """
+        self._clock = clock or datetime.now
         self._init_patterns()
         self._init_business_dates()
+        self._window_cache = lru_cache(maxsize=WINDOW_CACHE_SIZE)(self._parse_time_window)
+        self._cache_day: Optional[date] = None
+
+    @property
+    def now(self) -> datetime:
+        return self._clock()
+
+    @property
+    def today(self) -> date:
+        """Read from the clock on every access, so long-lived parsers roll over at midnight."""
+        return self._clock().date()
+
+    def set_clock(self, clock: Optional[Callable[[], datetime]]) -> None:
+        """Swaps the clock (None restores datetime.now) and drops cached windows."""
+        self._clock = clock or datetime.now
+        self._window_cache.cache_clear()
+        self._cache_day = None
 
     def _init_patterns(self):
         """Initialize pattern dictionaries for natural language processing"""
@@ -54,15 +111,13 @@ class TimeParser:
             'no later than': 'on_or_before',
             'no earlier than': 'on_or_after'
         }
+        self.comparison_regexes = {
+            phrase: re.compile(rf'{re.escape(phrase)}\s+(.+?)(?:\s+that|\s+which|$)', re.IGNORECASE)
+            for phrase in self.comparison_patterns
+        }
         
         # Range patterns
-        self.range_patterns = [
-            r'between\s+(.+?)\s+and\s+(.+)',
-            r'from\s+(.+?)\s+to\s+(.+)',
-            r'(.+?)\s+to\s+(.+)',
-            r'(.+?)\s+through\s+(.+)',
-            r'(.+?)\s+-\s+(.+)'
-        ]
+        self.range_patterns = _RANGE_PATTERNS
         
         # Business time patterns
         self.business_periods = {
@@ -122,9 +177,6 @@ class TimeParser:
         # Only handle clear patterns to avoid breaking existing logic
         
         # Handle "Aug 25 to Aug 30" style ranges without years
-        import re
-        month_day_pattern = r'\b([A-Za-z]{3,9})\s+(\d{1,2})(?:\s+to\s+([A-Za-z]{3,9})\s+(\d{1,2}))?\b'
-        
         def add_current_year(match):
             month1, day1 = match.group(1), match.group(2)
             result = f"{month1} {day1} {self.today.year}"
@@ -136,34 +188,74 @@ class TimeParser:
             return result
         
         # Apply the pattern only if no year is already present
-        if not re.search(r'\d{4}', desc):
-            desc = re.sub(month_day_pattern, add_current_year, desc)
+        if not _YEAR_PATTERN.search(desc):
+            desc = _MONTH_DAY_PATTERN.sub(add_current_year, desc)
         
         return desc
 
-    def filter_dataframe_by_time(self, df: pd.DataFrame, time_description: str, date_column: str) -> pd.DataFrame:
-        """Enhanced filter method with comprehensive natural language support"""
-        time_description = self.preprocess_time_description(time_description)
+    def filter_dataframe_by_time(self, df: pd.DataFrame, time_description: str, date_column: str,
+                                 date_index: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Enhanced filter method with comprehensive natural language support.
+        A column that is already datetime64 is used as is. `date_index` may be
+        a sorted index over `date_column` for exactly the rows of `df` (such as
+        OrderSnapshot.date_index); the window is then found by binary search.
+        Rows always come back in their original order.
+        """
         if date_column not in df.columns:
             raise TimeParsingError(f"Date column '{date_column}' not found in DataFrame")
         
-        df = df.copy()
-        df[date_column] = pd.to_datetime(df[date_column])
-        
-        # First, check for overdue/late orders
-        if self._is_overdue_query(time_description):
-            return df[df[date_column].dt.date < self.today]
+        if not pd.api.types.is_datetime64_any_dtype(df[date_column].dtype):
+            df = df.copy()
+            df[date_column] = pd.to_datetime(df[date_column])
         
         try:
             # Parse the time description to get date range
-            start_date, end_date, comparison_type = self._parse_natural_language_time(time_description)
+            start_date, end_date, comparison_type = self.parse_time_window(time_description)
             
             # Apply the filter based on comparison type
-            return self._apply_date_filter(df, date_column, start_date, end_date, comparison_type)
+            bounds = self._window_bounds(start_date, end_date, comparison_type)
+            if bounds is None:
+                return df
+            if date_index is not None and len(date_index.order) == len(df):
+                return df.iloc[np.sort(date_index.positions_between(*bounds))]
+            return df[self._window_mask(df[date_column], *bounds)]
             
         except TimeParsingError:
             # Fall back to original simple parsing for backwards compatibility
-            return self._legacy_filter(df, time_description, date_column)
+            return self._legacy_filter(df, self.preprocess_time_description(time_description), date_column)
+
+    def parse_time_window(self, time_description: str) -> Tuple[Optional[date], Optional[date], str]:
+        """
+        Parse a time description into (start_date, end_date, comparison_type).
+        Results are memoized per normalized description and day, so repeated
+        phrasings like "next week" cost a dict lookup.
+        """
+        normalized = ' '.join(time_description.split()).lower()
+        today = self.today
+        if today != self._cache_day:
+            # Windows parsed on earlier days can never be hit again
+            self._window_cache.cache_clear()
+            self._cache_day = today
+        return self._window_cache(normalized, today)
+
+    def parse_date_bounds(self, time_description: str) -> Optional[Tuple[Optional[date], Optional[date]]]:
+        """
+        Inclusive (first_day, last_day) bounds for a time description, either
+        of which may be open, or None when it does not restrict dates. Meant
+        for pushing the window down into a query, e.g. an Odoo domain.
+        """
+        return self._window_bounds(*self.parse_time_window(time_description))
+
+    def _parse_time_window(self, normalized_description: str, today: date) -> Tuple[Optional[date], Optional[date], str]:
+        """Uncached parse behind parse_time_window; `today` is part of the cache key."""
+        time_description = self.preprocess_time_description(normalized_description)
+        
+        # First, check for overdue/late orders
+        if self._is_overdue_query(time_description):
+            return None, today - timedelta(days=1), 'overdue'
+        
+        return self._parse_natural_language_time(time_description)
 
     def _parse_natural_language_time(self, time_description: str) -> Tuple[Optional[date], Optional[date], str]:
         """Parse natural language time descriptions into date ranges"""
@@ -209,7 +301,7 @@ class TimeParser:
     def _parse_range_query(self, time_desc: str) -> Optional[Tuple[Optional[date], Optional[date], str]]:
         """Parse range queries like 'between X and Y', 'from X to Y'"""
         for pattern in self.range_patterns:
-            match = re.search(pattern, time_desc, re.IGNORECASE)
+            match = pattern.search(time_desc)
             if match:
                 start_str, end_str = match.groups()
                 try:
@@ -227,8 +319,7 @@ class TimeParser:
         for phrase, comp_type in self.comparison_patterns.items():
             if phrase in time_desc:
                 # Extract the date part after the comparison phrase
-                pattern = rf'{re.escape(phrase)}\s+(.+?)(?:\s+that|\s+which|$)'
-                match = re.search(pattern, time_desc, re.IGNORECASE)
+                match = self.comparison_regexes[phrase].search(time_desc)
                 if match:
                     date_str = match.group(1).strip()
                     try:
@@ -284,8 +375,7 @@ class TimeParser:
     def _parse_relative_dates(self, time_desc: str) -> Optional[Tuple[Optional[date], Optional[date], str]]:
         """Parse relative dates like 'in 30 days', '2 weeks from now'"""
         # Pattern for "in X days/weeks/months"
-        pattern1 = r'in\s+(\d+)\s+(day|week|month)s?'
-        match1 = re.search(pattern1, time_desc, re.IGNORECASE)
+        match1 = _IN_PERIOD_PATTERN.search(time_desc)
         if match1:
             value, unit = int(match1.group(1)), match1.group(2).lower()
             if 'day' in unit:
@@ -297,8 +387,7 @@ class TimeParser:
             return target_date, target_date, 'exact'
         
         # Pattern for "X days/weeks/months from now"
-        pattern2 = r'(\d+)\s+(day|week|month)s?\s+from\s+now'
-        match2 = re.search(pattern2, time_desc, re.IGNORECASE)
+        match2 = _FROM_NOW_PATTERN.search(time_desc)
         if match2:
             value, unit = int(match2.group(1)), match2.group(2).lower()
             if 'day' in unit:
@@ -310,8 +399,7 @@ class TimeParser:
             return target_date, target_date, 'exact'
         
         # Pattern for "next X days/weeks/months"
-        pattern3 = r'next\s+(\d+)\s+(day|week|month)s?'
-        match3 = re.search(pattern3, time_desc, re.IGNORECASE)
+        match3 = _NEXT_PERIOD_PATTERN.search(time_desc)
         if match3:
             value, unit = int(match3.group(1)), match3.group(2).lower()
             if 'day' in unit:
@@ -327,18 +415,8 @@ class TimeParser:
     def _parse_specific_dates(self, time_desc: str) -> Optional[Tuple[Optional[date], Optional[date], str]]:
         """Parse specific dates like 'December 25, 2024', 'Jan 1st'"""
         # Multiple date formats
-        date_patterns = [
-            r'(\d{4}-\d{1,2}-\d{1,2})',
-            r'(\d{1,2}-\d{1,2}-\d{4})',
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-            r'([a-zA-Z]+\s+\d{1,2},?\s+\d{4})',
-            r'(\d{1,2}\s+[a-zA-Z]+\s+\d{4})',
-            r'([a-zA-Z]+\s+\d{1,2}(?:st|nd|rd|th)?)',
-            r'(\d{1,2}(?:st|nd|rd|th)?\s+[a-zA-Z]+)'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, time_desc, re.IGNORECASE)
+        for pattern in _SPECIFIC_DATE_PATTERNS:
+            match = pattern.search(time_desc)
             if match:
                 try:
                     date_str = match.group(1)
@@ -415,7 +493,7 @@ class TimeParser:
             return self.today.replace(day=1)  # Start of this month
         
         # Handle simple relative dates
-        match = re.search(r'(\d+)\s+(day|week|month)s?\s+(ago|from\s+now)', date_str)
+        match = _RELATIVE_REFERENCE_PATTERN.search(date_str)
         if match:
             value, unit, direction = int(match.group(1)), match.group(2).lower(), match.group(3)
             if 'day' in unit:
@@ -450,63 +528,79 @@ class TimeParser:
     def _apply_date_filter(self, df: pd.DataFrame, date_column: str, start_date: Optional[date], 
                           end_date: Optional[date], comparison_type: str) -> pd.DataFrame:
         """Apply the parsed date filter to the DataFrame"""
+        bounds = self._window_bounds(start_date, end_date, comparison_type)
+        if bounds is None:
+            return df
+        return df[self._window_mask(df[date_column], *bounds)]
+
+    @staticmethod
+    def _window_bounds(start_date: Optional[date], end_date: Optional[date],
+                       comparison_type: str) -> Optional[Tuple[Optional[date], Optional[date]]]:
+        """
+        Turns a parsed window into inclusive (first_day, last_day) bounds,
+        either of which may be open. Returns None when nothing is filtered.
+        """
         if comparison_type == 'exact' and start_date:
-            return df[df[date_column].dt.date == start_date]
-        elif comparison_type == 'range':
-            conditions = []
-            if start_date:
-                conditions.append(df[date_column].dt.date >= start_date)
-            if end_date:
-                conditions.append(df[date_column].dt.date <= end_date)
-            if conditions:
-                combined_condition = conditions[0]
-                for condition in conditions[1:]:
-                    combined_condition &= condition
-                return df[combined_condition]
-        elif comparison_type == 'before' and end_date:
-            return df[df[date_column].dt.date <= end_date]
-        elif comparison_type == 'after' and start_date:
-            return df[df[date_column].dt.date >= start_date]
-        elif comparison_type == 'on_or_before' and end_date:
-            return df[df[date_column].dt.date <= end_date]
-        elif comparison_type == 'on_or_after' and start_date:
-            return df[df[date_column].dt.date >= start_date]
-        
-        return df
+            return start_date, start_date
+        elif comparison_type == 'range' and (start_date or end_date):
+            return start_date, end_date
+        elif comparison_type in ('before', 'overdue', 'on_or_before') and end_date:
+            return None, end_date
+        elif comparison_type in ('after', 'on_or_after') and start_date:
+            return start_date, None
+        return None
+
+    @staticmethod
+    def _window_mask(dates: pd.Series, first_day: Optional[date], last_day: Optional[date]) -> np.ndarray:
+        """Boolean mask of a datetime64 column falling on first_day..last_day, compared without .dt.date."""
+        if dates.dt.tz is not None:
+            # .dt.date would give the local wall-clock date
+            dates = dates.dt.tz_localize(None)
+        values = dates.to_numpy(dtype='datetime64[ns]')
+        mask = ~np.isnat(values)
+        if first_day is not None:
+            mask &= values >= np.datetime64(first_day, 'ns')
+        if last_day is not None:
+            mask &= values < np.datetime64(last_day + timedelta(days=1), 'ns')
+        return mask
 
     def _legacy_filter(self, df: pd.DataFrame, time_description: str, date_column: str) -> pd.DataFrame:
         """Legacy filter method for backwards compatibility"""
         time_desc_lower = time_description.lower()
-        today = date.today()
+        today = self.today
+
+        dates = df[date_column]
 
         if "today" in time_desc_lower: 
-            return df[df[date_column].dt.date == today]
+            return df[self._window_mask(dates, today, today)]
         if "tomorrow" in time_desc_lower: 
-            return df[df[date_column].dt.date == today + timedelta(days=1)]
+            tomorrow = today + timedelta(days=1)
+            return df[self._window_mask(dates, tomorrow, tomorrow)]
         if "day after tomorrow" in time_desc_lower: 
-            return df[df[date_column].dt.date == today + timedelta(days=2)]
+            target_date = today + timedelta(days=2)
+            return df[self._window_mask(dates, target_date, target_date)]
         
         if "this week" in time_desc_lower:
             start = today - timedelta(days=today.weekday())
             end = start + timedelta(days=6)
-            return df[(df[date_column].dt.date >= start) & (df[date_column].dt.date <= end)]
+            return df[self._window_mask(dates, start, end)]
         
         if "next week" in time_desc_lower:
             start = today + timedelta(days=(7 - today.weekday()))
             end = start + timedelta(days=6)
-            return df[(df[date_column].dt.date >= start) & (df[date_column].dt.date <= end)]
+            return df[self._window_mask(dates, start, end)]
         
-        date_match = re.search(r'(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}-\d{1,2}-\d{4}|\d{1,2}/\d{1,2}/\d{4})', time_desc_lower)
+        date_match = _LEGACY_DATE_PATTERN.search(time_desc_lower)
         if date_match:
             target_date = parse_date(date_match.group(1), dayfirst=True).date()
-            return df[df[date_column].dt.date == target_date]
+            return df[self._window_mask(dates, target_date, target_date)]
         
-        match = re.search(r'(\d+)\s*(day|week|month)', time_desc_lower, re.IGNORECASE)
+        match = _DURATION_PATTERN.search(time_desc_lower)
         if match:
             value, unit = int(match.group(1)), match.group(2).lower()
             delta = timedelta(days=value) if 'day' in unit else timedelta(weeks=value) if 'week' in unit else relativedelta(months=value)
-            end_date = datetime.now().date() + delta
-            return df[(df[date_column].dt.date >= today) & (df[date_column].dt.date <= end_date)]
+            end_date = today + delta
+            return df[self._window_mask(dates, today, end_date)]
             
         raise TimeParsingError(f"Could not understand the time description: '{time_description}'")
 
@@ -590,7 +684,7 @@ class TimeParser:
 
     def parse_duration_to_days(self, duration_str: str) -> int:
         """Parse duration strings to days (maintained for backwards compatibility)"""
-        match = re.search(r'(\d+)\s*(day|week|month)', duration_str, re.IGNORECASE)
+        match = _DURATION_PATTERN.search(duration_str)
         if not match:
             raise TimeParsingError("Invalid duration format. Use 'X days/weeks/months'")
         value, unit = int(match.group(1)), match.group(2).lower()
@@ -601,8 +695,7 @@ class TimeParser:
     # In time_parser.py, ensure accurate day calculations
     def _calculate_days_from_today(self, target_date: date) -> int:
         """Calculate days between today and target date with clear logic"""
-        today = date.today()
-        return (target_date - today).days
+        return (target_date - self.today).days
 
     def _get_time_description(self, days_difference: int) -> str:
         """Provide clear time descriptions"""
@@ -638,19 +731,28 @@ class TimeParser:
         else:
             params['query_type'] = 'list'
         
-        # Extract time_description (everything else)
+        # Extract time_description (everything else): remove item_type,
+        # reschedule and count references
         time_desc = natural_query
-        # Remove item_type references
-        for phrase in ['make orders', 'make items', 'buy orders', 'buy items', 'purchase orders']:
-            time_desc = re.sub(phrase, '', time_desc, flags=re.IGNORECASE)
-        # Remove reschedule references
-        for phrase in ['that need rescheduling', 'need reschedule', 'to reschedule']:
-            time_desc = re.sub(phrase, '', time_desc, flags=re.IGNORECASE)
-        # Remove count references
-        time_desc = re.sub(r'how many|count', '', time_desc, flags=re.IGNORECASE)
+        for pattern in _QUERY_NOISE_PATTERNS:
+            time_desc = pattern.sub('', time_desc)
         
         time_desc = time_desc.strip()
         if time_desc:
             params['time_description'] = time_desc
         
-        return params
\ No newline at end of file
+        return params
+
+
+_shared_parser: Optional[TimeParser] = None
+_shared_parser_lock = threading.Lock()
+
+
+def get_time_parser() -> TimeParser:
+    """Returns the process-wide parser, so its compiled patterns and window cache are shared."""
+    global _shared_parser
+    if _shared_parser is None:
+        with _shared_parser_lock:
+            if _shared_parser is None:
+                _shared_parser = TimeParser()
+    return _shared_parser